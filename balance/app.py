@@ -5,16 +5,23 @@ from contextlib import asynccontextmanager
 from src.infra.core.config import settings
 from src.infra.core.logger import logger
 from src.infra.data.database import db
+from src.infra.data.redis_client import redis_client
+from src.infra.services.openai_pool import openai_pool
 from src.presentation.routes.routes import router
+from src.presentation.routes import metrics
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info(f"🚀 Iniciando {settings.APP_NAME} v{settings.APP_VERSION}")
     
     await db.connect()
+    await redis_client.connect()
+    await openai_pool.connect()
     
     yield
     
+    await openai_pool.disconnect()
+    await redis_client.disconnect()
     await db.disconnect()
     logger.info("👋 Servidor desligando...")
 
@@ -35,7 +42,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.middleware("http")(metrics.track_request_latency)
+
 app.include_router(router, prefix="/api/v1")
+app.include_router(metrics.router)
 
 @app.get("/")
 async def root():
@@ -44,7 +54,8 @@ async def root():
         "version": settings.APP_VERSION,
         "status": "running",
         "docs": "/docs",
-        "health": "/api/v1/health"
+        "health": "/api/v1/health",
+        "metrics": "/metrics"
     }
 
 if __name__ == "__main__":
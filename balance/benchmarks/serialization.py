@@ -0,0 +1,89 @@
+"""
+Custo por linha da serialização de /transactions/period.
+
+Compara o caminho antigo (Record -> dict -> Transaction -> ExpenseResponse ->
+model_dump_json) com o atual (dict com as colunas da resposta -> orjson).
+
+Uso: python -m benchmarks.serialization [linhas] [repetições]
+"""
+import sys
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from src.domain.models.transaction import Transaction
+from src.presentation.viewmodels.json_body import dumps
+from src.presentation.viewmodels.schemas import ExpenseListResponse, ExpenseResponse
+
+def make_rows(n: int):
+    """Linhas como o asyncpg devolve de ledger() (SELECT *)"""
+    base = datetime(2024, 1, 1, 12, 0)
+    return [{
+        "id": i,
+        "item": f"Item {i}",
+        "valor": Decimal(f"{i % 1000}.{i % 100:02d}") + Decimal("0.01"),
+        "data": date(2024, 1, 1) + timedelta(days=i % 365),
+        "categoria": ("Alimentação", "Transporte", "Moradia", "Lazer")[i % 4],
+        "descricao": f"gastei {i} no item {i}",
+        "transaction_type": "expense" if i % 5 else "income",
+        "created_at": base + timedelta(seconds=i),
+        "updated_at": base + timedelta(seconds=i),
+        "parcela": None,
+    } for i in range(n)]
+
+def pydantic_path(rows) -> bytes:
+    transactions = [Transaction(**dict(row)) for row in rows]
+    return ExpenseListResponse(
+        total=len(rows),
+        balance=Decimal("0.00"),
+        next_cursor=None,
+        transactions=[
+            ExpenseResponse(
+                id=t.id,
+                item=t.item,
+                valor=t.valor,
+                data=t.data,
+                categoria=t.categoria,
+                descricao=t.descricao,
+                transaction_type=t.transaction_type,
+                created_at=t.created_at
+            ) for t in transactions
+        ]
+    ).model_dump_json().encode("utf-8")
+
+def orjson_path(rows) -> bytes:
+    # list_by_period_rows já projeta só as colunas da resposta
+    return dumps({
+        "total": len(rows),
+        "balance": Decimal("0.00"),
+        "transactions": [dict(row) for row in rows],
+        "next_cursor": None,
+    })
+
+def measure(fn, rows, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(rows)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    full_rows = make_rows(n)
+    projected = [{k: v for k, v in row.items() if k != "updated_at"} for row in full_rows]
+
+    assert pydantic_path(full_rows) == orjson_path(projected), "corpos diferentes"
+
+    before = measure(pydantic_path, full_rows, repeat)
+    after = measure(orjson_path, projected, repeat)
+
+    print(f"{n} linhas, melhor de {repeat}")
+    print(f"  pydantic: {before * 1000:8.1f} ms  ({before / n * 1e6:.2f} µs/linha)")
+    print(f"  orjson:   {after * 1000:8.1f} ms  ({after / n * 1e6:.2f} µs/linha)")
+    print(f"  {before / after:.1f}x mais rápido")
+
+if __name__ == "__main__":
+    main()
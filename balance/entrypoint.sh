@@ -10,6 +10,14 @@ echo "⌛ Aguardando banco de dados..."
 echo "🛠️  Rodando migrations..."
 python -m src.infra.data.cli migrate
 
+# Garante as partições mensais dos próximos meses de transactions
+echo "🧱 Criando partições futuras..."
+python -m src.infra.data.cli partitions
+
+# Atualiza os saldos de abertura mensais (rode também periodicamente, ex: cron diário)
+echo "📸 Atualizando snapshots de saldo..."
+python -m src.infra.data.cli snapshots
+
 # Inicia o comando passado pelo CMD
 echo "🚀 Iniciando processo..."
 exec "$@"
\ No newline at end of file
@@ -0,0 +1,22 @@
+from datetime import datetime
+from typing import Any, AsyncIterator, Mapping, Optional
+from ...domain.interfaces.repositories.itransaction_repository import ITransactionRepository
+from ...domain.models.transaction_filter import TransactionFilter
+
+
+class ExportTransactions:
+    def __init__(self, repo: ITransactionRepository):
+        self.repo = repo
+
+    def execute(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        filters: Optional[TransactionFilter] = None,
+    ) -> AsyncIterator[Mapping[str, Any]]:
+        """Linhas do período em ordem cronológica, lidas sob demanda do banco"""
+        return self.repo.iter_by_period(
+            start_date=start_date,
+            end_date=end_date,
+            filters=filters,
+        )
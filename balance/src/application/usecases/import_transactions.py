@@ -0,0 +1,72 @@
+from typing import AsyncIterator, List, Tuple, Dict, Any
+from pydantic import ValidationError
+from ...domain.interfaces.repositories.itransaction_repository import ITransactionRepository
+from ...domain.models.transaction import TransactionCreate
+from ...infra.core.config import settings
+from ...infra.core.logger import logger
+
+class ImportTransactions:
+    """Importa linhas já estruturadas (CSV/NDJSON de outras ferramentas) sem passar pela IA"""
+
+    def __init__(
+        self,
+        transaction_repo: ITransactionRepository,
+        chunk_size: int = settings.BATCH_IMPORT_CHUNK_SIZE,
+        max_errors: int = settings.BATCH_IMPORT_MAX_ERRORS,
+    ):
+        self.transaction_repo = transaction_repo
+        self.chunk_size = chunk_size
+        self.max_errors = max_errors
+
+    async def execute(
+        self,
+        rows: AsyncIterator[Tuple[int, Any]],
+        owner_id: int = 0,
+    ) -> Tuple[int, int, List[Dict[str, Any]]]:
+        """
+        Valida as linhas conforme chegam e grava as válidas em blocos de `chunk_size`,
+        todas no ledger de `owner_id`.
+        Retorna (importadas, rejeitadas, erros por linha — limitados a `max_errors`).
+        """
+        imported = 0
+        rejected = 0
+        errors: List[Dict[str, Any]] = []
+        chunk: List[TransactionCreate] = []
+        chunk_lines: List[int] = []
+
+        def reject(line: int, error: str):
+            nonlocal rejected
+            rejected += 1
+            if len(errors) < self.max_errors:
+                errors.append({"line": line, "error": error})
+
+        async def flush():
+            nonlocal imported, chunk, chunk_lines
+            copied = await self.transaction_repo.copy_many(chunk, owner_id)
+            if copied:
+                imported += copied
+            else:
+                for line in chunk_lines:
+                    reject(line, "falha ao gravar o bloco no banco")
+            chunk, chunk_lines = [], []
+
+        async for line, row in rows:
+            if isinstance(row, Exception):
+                reject(line, str(row))
+                continue
+
+            try:
+                chunk.append(TransactionCreate.model_validate(row))
+                chunk_lines.append(line)
+            except ValidationError as e:
+                reject(line, "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()))
+                continue
+
+            if len(chunk) >= self.chunk_size:
+                await flush()
+
+        if chunk:
+            await flush()
+
+        logger.info(f"📦 Importação em lote: {imported} importadas, {rejected} rejeitadas")
+        return imported, rejected, errors
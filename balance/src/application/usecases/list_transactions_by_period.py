@@ -1,9 +1,14 @@
-from datetime import datetime
-from decimal import Decimal
-from typing import List, Tuple
+from datetime import date, datetime
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
 from ...domain.interfaces.repositories.itransaction_repository import ITransactionRepository
+from ...domain.models.period_summary import PeriodSummary
 from ...domain.models.transaction import Transaction
+from ...domain.models.transaction_filter import TransactionFilter
 
+PageKey = Tuple[date, datetime, int]
+
+Row = TypeVar("Row")
 
 class ListTransactionsByPeriod:
     def __init__(self, repo: ITransactionRepository):
@@ -13,19 +18,65 @@ class ListTransactionsByPeriod:
         self,
         start_date: datetime,
         end_date: datetime,
-    ) -> Tuple[List[Transaction], Decimal]:
+        limit: Optional[int] = None,
+        after: Optional[PageKey] = None,
+        filters: Optional[TransactionFilter] = None,
+    ) -> Tuple[List[Transaction], Optional[PeriodSummary], Optional[PageKey]]:
+        """
+        Retorna a página de transações, os totais do período inteiro (agregados no
+        banco) e a chave da próxima página (None quando não há mais linhas).
+        Os `filters` valem tanto para a página quanto para os totais.
+        """
+        return await self._page(
+            self.repo.list_by_period,
+            lambda t: (t.data, t.created_at, t.id),
+            start_date, end_date, limit, after, filters,
+        )
+
+    async def execute_rows(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        limit: Optional[int] = None,
+        after: Optional[PageKey] = None,
+        filters: Optional[TransactionFilter] = None,
+        slim: bool = False,
+    ) -> Tuple[List[Dict[str, Any]], Optional[PeriodSummary], Optional[PageKey]]:
+        """Igual a execute, com as linhas cruas do banco no lugar dos modelos"""
+        return await self._page(
+            partial(self.repo.list_by_period_rows, slim=slim),
+            lambda r: (r["data"], r["created_at"], r["id"]),
+            start_date, end_date, limit, after, filters,
+        )
 
-        transactions = await self.repo.list_by_period(
+    async def _page(
+        self,
+        fetch: Callable[..., Any],
+        key_of: Callable[[Row], PageKey],
+        start_date: datetime,
+        end_date: datetime,
+        limit: Optional[int],
+        after: Optional[PageKey],
+        filters: Optional[TransactionFilter],
+    ) -> Tuple[List[Row], Optional[PeriodSummary], Optional[PageKey]]:
+        # Uma linha a mais indica se existe próxima página sem precisar de COUNT
+        rows = await fetch(
             start_date=start_date,
             end_date=end_date,
+            limit=limit + 1 if limit else None,
+            after=after,
+            filters=filters,
         )
 
-        total = Decimal("0.00")
+        next_key = None
+        if limit and len(rows) > limit:
+            rows = rows[:limit]
+            next_key = key_of(rows[-1])
 
-        for t in transactions:
-            if t.transaction_type == "income":
-                total += t.valor
-            else:
-                total -= t.valor
+        summary = await self.repo.summarize_period(
+            start_date=start_date,
+            end_date=end_date,
+            filters=filters,
+        )
 
-        return transactions, total
+        return rows, summary, next_key
@@ -1,7 +1,19 @@
 from ...domain.interfaces.repositories.itransaction_repository import ITransactionRepository
 from ...domain.interfaces.services.iagent_service import IAgentService
 from ...infra.core.logger import logger
-from typing import List
+from datetime import date
+from enum import Enum
+from typing import List, Optional, Tuple
+import asyncio
+
+# (message_id, texto, data de envio) de uma mensagem antiga do chat
+HistoryMessage = Tuple[int, str, date]
+
+class ProcessOutcome(str, Enum):
+    """Resultado do processamento de uma mensagem"""
+    RECORDED = "recorded"                    # lançamentos gravados
+    NOTHING_TO_RECORD = "nothing_to_record"  # conversa, pergunta...: nada a gravar
+    FAILED = "failed"                        # IA ou banco falharam: vale tentar de novo
 
 class ProcessTelegramMessage:
     def __init__(
@@ -12,31 +24,91 @@ class ProcessTelegramMessage:
         self.transaction_repo = transaction_repo
         self.agent = agent
 
-    async def execute(self, text: str) -> bool:
-        """Orquestra o processamento da mensagem: interpretar -> salvar"""
+    async def execute(
+        self,
+        text: str,
+        chat_id: Optional[int] = None,
+        message_id: Optional[int] = None,
+    ) -> ProcessOutcome:
+        """
+        Orquestra o processamento da mensagem: interpretar -> salvar.
+        O `chat_id` identifica também o dono (owner_id) dos lançamentos gravados
+        """
         logger.info(f"🧠 Iniciando orquestração para: {text}")
         
         # 1. Interpretar com IA
-        transactions = await self.agent.parse_expense(text)
+        parsed = await self.agent.parse_message(text)
         
-        if not transactions:
-            logger.warning(f"⚠️ IA não conseguiu interpretar mensagem ou nenhuma transação gerada: {text}")
-            return False
-
-        # 2. Salvar no Banco
-        success_count = 0
-        for transaction in transactions:
-            saved = await self.transaction_repo.create(transaction)
-            if saved:
-                success_count += 1
-                logger.info(f"✅ Gasto registrado com sucesso: {transaction.item} ({transaction.data})")
+        if parsed.failed:
+            logger.error(f"❌ Falha ao interpretar mensagem: {text}")
+            return ProcessOutcome.FAILED
+
+        if parsed.is_empty:
+            logger.warning(f"⚠️ Nenhuma transação na mensagem: {text}")
+            return ProcessOutcome.NOTHING_TO_RECORD
+
+        has_source = chat_id is not None and message_id is not None
+        owner_id = chat_id if chat_id is not None else 0
+
+        # 2. Salvar no Banco (compra parcelada vira um único plano; avulsas em uma escrita atômica)
+        if parsed.plan:
+            if has_source:
+                plan = await self.transaction_repo.upsert_plan_by_source(chat_id, message_id, parsed.plan)
             else:
-                logger.error(f"❌ Falha ao salvar gasto no banco: {transaction.item}")
-        
-        if success_count == len(transactions):
-            return True
-        elif success_count > 0:
-            logger.warning(f"⚠️ Salvo parcialmente: {success_count}/{len(transactions)} transações")
-            return True # Considera sucesso se salvou pelo menos um, mas loga warning
-        else:
-            return False
+                plan = await self.transaction_repo.create_plan(parsed.plan, owner_id)
+
+            if not plan:
+                logger.error(f"❌ Falha ao salvar plano de parcelas no banco: {text}")
+                return ProcessOutcome.FAILED
+
+            logger.info(f"✅ Compra parcelada registrada: {plan.item} ({plan.parcelas}x a partir de {plan.first_due_date})")
+
+        if parsed.transactions:
+            if has_source:
+                # Mensagem identificada: reentregas e edições não duplicam linhas
+                saved = await self.transaction_repo.upsert_by_source(chat_id, message_id, parsed.transactions)
+            else:
+                saved = await self.transaction_repo.create_many(parsed.transactions, owner_id)
+
+            if not saved:
+                logger.error(f"❌ Falha ao salvar transações no banco: {text}")
+                return ProcessOutcome.FAILED
+
+            for transaction in saved:
+                logger.info(f"✅ Gasto registrado com sucesso: {transaction.item} ({transaction.data})")
+
+        return ProcessOutcome.RECORDED
+
+    async def execute_many(
+        self,
+        chat_id: int,
+        messages: List[HistoryMessage],
+        concurrency: int = 8,
+    ) -> Optional[Tuple[int, List[int]]]:
+        """
+        Importa mensagens antigas de um chat: interpreta até `concurrency` ao mesmo tempo
+        (cada uma relativa à sua data de envio) e grava o lote inteiro em duas escritas.
+        Retorna quantas mensagens geraram lançamentos e os ids das que não puderam ser
+        interpretadas (falha da IA, para nova tentativa), ou None se a gravação falhou.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def parse(message_id: int, text: str, sent_on: date):
+            async with semaphore:
+                return message_id, await self.agent.parse_message(text, sent_on)
+
+        results = await asyncio.gather(*(parse(*message) for message in messages))
+        failed = [message_id for message_id, p in results if p.failed]
+
+        transactions = {message_id: p.transactions for message_id, p in results if p.transactions}
+        plans = {message_id: p.plan for message_id, p in results if p.plan}
+
+        if transactions and not await self.transaction_repo.upsert_many_by_source(chat_id, transactions):
+            logger.error(f"❌ Falha ao salvar lote de {len(transactions)} mensagens do chat {chat_id}")
+            return None
+
+        if plans and not await self.transaction_repo.upsert_plans_by_source(chat_id, plans):
+            logger.error(f"❌ Falha ao salvar {len(plans)} planos de parcelas do chat {chat_id}")
+            return None
+
+        return len(set(transactions) | set(plans)), failed
@@ -0,0 +1,31 @@
+from datetime import date
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+from ...domain.interfaces.repositories.itransaction_repository import ITransactionRepository
+
+
+class RunningBalance:
+    def __init__(self, repo: ITransactionRepository):
+        self.repo = repo
+
+    async def execute(
+        self,
+        start_date: date,
+        end_date: date,
+        owner_id: Optional[int] = None,
+    ) -> Optional[Tuple[Decimal, List[Dict[str, Any]]]]:
+        """
+        Saldo de abertura (antes de `start_date`) e a série diária do período,
+        ou None se não foi possível calcular
+        """
+        days = await self.repo.running_balance(
+            start_date=start_date,
+            end_date=end_date,
+            owner_id=owner_id,
+        )
+
+        if not days:
+            return None
+
+        first = days[0]
+        return first["balance"] - first["net"], days
@@ -0,0 +1,51 @@
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple
+from ...domain.interfaces.repositories.itransaction_repository import ITransactionRepository
+from ...domain.models.period_summary import PeriodSummary
+from ...domain.models.transaction_filter import TransactionFilter
+
+SearchKey = Tuple[float, date, datetime, int]
+
+class SearchTransactions:
+    def __init__(self, repo: ITransactionRepository):
+        self.repo = repo
+
+    async def execute(
+        self,
+        text: str,
+        start_date: datetime,
+        end_date: datetime,
+        limit: Optional[int] = None,
+        after: Optional[SearchKey] = None,
+        filters: Optional[TransactionFilter] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[PeriodSummary], Optional[SearchKey]]:
+        """
+        Retorna a página de resultados (mais relevantes primeiro), os totais de todos os
+        resultados e a chave da próxima página (None quando não há mais linhas)
+        """
+        text = text.strip()
+
+        # Uma linha a mais indica se existe próxima página sem precisar de COUNT
+        rows = await self.repo.search_rows(
+            text=text,
+            start_date=start_date,
+            end_date=end_date,
+            limit=limit + 1 if limit else None,
+            after=after,
+            filters=filters,
+        )
+
+        next_key = None
+        if limit and len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_key = (last["rank"], last["data"], last["created_at"], last["id"])
+
+        summary = await self.repo.summarize_search(
+            text=text,
+            start_date=start_date,
+            end_date=end_date,
+            filters=filters,
+        )
+
+        return rows, summary, next_key
@@ -0,0 +1,23 @@
+from datetime import datetime
+from typing import Optional
+from ...domain.interfaces.repositories.itransaction_repository import ITransactionRepository
+from ...domain.models.period_summary import PeriodSummary
+from ...domain.models.transaction_filter import TransactionFilter
+
+
+class SummarizePeriod:
+    def __init__(self, repo: ITransactionRepository):
+        self.repo = repo
+
+    async def execute(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        filters: Optional[TransactionFilter] = None,
+    ) -> Optional[PeriodSummary]:
+        """Receitas, despesas e saldo do período sem carregar as transações"""
+        return await self.repo.summarize_period(
+            start_date=start_date,
+            end_date=end_date,
+            filters=filters,
+        )
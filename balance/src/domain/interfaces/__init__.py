@@ -1,2 +1,3 @@
 from .repositories import ITransactionRepository
 from .services.iagent_service import IAgentService
+from .services.imessage_queue import IMessageQueue, QueueFullError
@@ -1,20 +1,201 @@
 from abc import ABC, abstractmethod
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple, AsyncIterator, Mapping
 from ...models.transaction import Transaction, TransactionCreate
-from datetime import datetime
+from ...models.installment_plan import InstallmentPlan, InstallmentPlanCreate
+from ...models.period_summary import PeriodSummary
+from ...models.transaction_filter import TransactionFilter
+from datetime import date, datetime
 
 class ITransactionRepository(ABC):
     @abstractmethod
-    async def create(self, transaction: TransactionCreate) -> Optional[Transaction]:
+    async def create(self, transaction: TransactionCreate, owner_id: int = 0) -> Optional[Transaction]:
+        pass
+
+    @abstractmethod
+    async def create_many(self, transactions: List[TransactionCreate], owner_id: int = 0) -> List[Transaction]:
+        """
+        Persiste todas as transações de uma mensagem de forma atômica, no ledger de `owner_id`.
+        Retorna lista vazia se nada foi salvo.
+        """
+        pass
+
+    @abstractmethod
+    async def copy_many(self, transactions: List[TransactionCreate], owner_id: int = 0) -> int:
+        """
+        Carrega transações via COPY (sem RETURNING) no ledger de `owner_id`
+        e retorna quantas foram gravadas.
+        Usado na importação em lote de dados já estruturados.
+        """
+        pass
+
+    @abstractmethod
+    async def upsert_by_source(
+        self,
+        chat_id: int,
+        message_id: int,
+        transactions: List[TransactionCreate],
+    ) -> List[Transaction]:
+        """
+        Grava as transações de uma mensagem do Telegram de forma idempotente:
+        reprocessar ou editar a mensagem atualiza as linhas já existentes.
+        """
         pass
     
+    @abstractmethod
+    async def create_plan(self, plan: InstallmentPlanCreate, owner_id: int = 0) -> Optional[InstallmentPlan]:
+        """
+        Persiste uma compra parcelada como uma única linha; as parcelas
+        são geradas na consulta.
+        """
+        pass
+
+    @abstractmethod
+    async def upsert_plan_by_source(
+        self,
+        chat_id: int,
+        message_id: int,
+        plan: InstallmentPlanCreate,
+    ) -> Optional[InstallmentPlan]:
+        """
+        Versão idempotente de create_plan para mensagens do Telegram.
+        """
+        pass
+
+    @abstractmethod
+    async def upsert_many_by_source(
+        self,
+        chat_id: int,
+        messages: Dict[int, List[TransactionCreate]],
+    ) -> List[Transaction]:
+        """
+        Grava as transações de várias mensagens do mesmo chat (message_id -> transações)
+        em uma única escrita. Usado na importação de histórico.
+        """
+        pass
+
+    @abstractmethod
+    async def upsert_plans_by_source(
+        self,
+        chat_id: int,
+        plans: Dict[int, InstallmentPlanCreate],
+    ) -> List[InstallmentPlan]:
+        """
+        Grava os planos de parcelas de várias mensagens do mesmo chat em uma única escrita.
+        """
+        pass
+
     @abstractmethod
     async def list_by_period(
         self, 
         start_date: datetime, 
-        end_date: datetime
+        end_date: datetime,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[date, datetime, int]] = None,
+        filters: Optional[TransactionFilter] = None,
     ) -> List[Transaction]:
         """
-        Retorna uma lista de transações dentro de um período específico.
+        Retorna uma lista de transações dentro de um período específico,
+        incluindo as parcelas dos planos que vencem no período.
+        Ordenada por (data, created_at, id) decrescente; com `limit`/`after`
+        retorna a página seguinte à chave `after` (paginação por keyset).
+        `filters` restringe por tipo, categorias e faixa de valor.
+        """
+        pass
+
+    @abstractmethod
+    async def list_by_period_rows(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[date, datetime, int]] = None,
+        filters: Optional[TransactionFilter] = None,
+        slim: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """
+        Mesma página de list_by_period, como dicionários com apenas os campos
+        expostos pela API (sem validação de modelo), para serialização direta.
+        `slim` omite a descricao (listagens que não mostram a mensagem original).
+        """
+        pass
+
+    @abstractmethod
+    def iter_by_period(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        filters: Optional[TransactionFilter] = None,
+    ) -> AsyncIterator[Mapping[str, Any]]:
+        """
+        Percorre todas as transações do período (com as parcelas dos planos) em
+        ordem cronológica, linha a linha, sem carregar o período em memória.
+        Mesmos campos de list_by_period_rows.
+        """
+        pass
+
+    @abstractmethod
+    async def summarize_period(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        filters: Optional[TransactionFilter] = None,
+    ) -> Optional[PeriodSummary]:
+        """
+        Retorna receitas, despesas, saldo e quantidade de transações do período,
+        agregados no banco (respeitando os mesmos `filters` da listagem).
+        """
+        pass
+
+    @abstractmethod
+    async def search_rows(
+        self,
+        text: str,
+        start_date: datetime,
+        end_date: datetime,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[float, date, datetime, int]] = None,
+        filters: Optional[TransactionFilter] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Busca textual no período: transações cujo item ou descricao casam com `text`
+        (com tolerância a erros de digitação), com os campos de list_by_period_rows
+        mais `rank`. Ordenada por (rank, data, created_at, id) decrescente, paginada
+        por keyset a partir de `after`.
+        """
+        pass
+
+    @abstractmethod
+    async def summarize_search(
+        self,
+        text: str,
+        start_date: datetime,
+        end_date: datetime,
+        filters: Optional[TransactionFilter] = None,
+    ) -> Optional[PeriodSummary]:
+        """
+        Totais de todas as transações encontradas por search_rows (ex: quanto foi
+        gasto no iFood no ano).
+        """
+        pass
+
+    @abstractmethod
+    async def running_balance(
+        self,
+        start_date: date,
+        end_date: date,
+        owner_id: Optional[int] = None,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Série diária do período com `data`, `net` (receitas - despesas do dia) e
+        `balance` (saldo acumulado ao fim do dia, desde o início do histórico).
+        O custo depende dos dias do período, não do tamanho do histórico.
+        """
+        pass
+
+    @abstractmethod
+    async def refresh_balance_snapshots(self) -> Optional[int]:
+        """
+        Atualiza os saldos de abertura mensais usados por running_balance e
+        retorna quantos foram gravados.
         """
         pass
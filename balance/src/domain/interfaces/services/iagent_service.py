@@ -1,9 +1,19 @@
 from abc import ABC, abstractmethod
+from datetime import date
 from typing import Optional, List
 from ...models.transaction import TransactionCreate
+from ...models.parsed_message import ParsedMessage
 
 class IAgentService(ABC):
     @abstractmethod
+    async def parse_message(self, text: str, today: Optional[date] = None) -> ParsedMessage:
+        """
+        Interpreta uma mensagem em transações avulsas ou em um plano de parcelas.
+        `today` é a data de referência para datas relativas (padrão: hoje).
+        """
+        pass
+
     async def parse_expense(self, text: str) -> List[TransactionCreate]:
         """Interpreta uma mensagem de texto e retorna uma lista de transações estruturadas"""
-        pass
+        parsed = await self.parse_message(text)
+        return parsed.expand()
@@ -0,0 +1,19 @@
+from abc import ABC, abstractmethod
+from typing import Dict, Any, Optional
+
+class QueueFullError(Exception):
+    """A fila atingiu o backlog máximo e não aceita novas mensagens"""
+
+class IMessageQueue(ABC):
+    @abstractmethod
+    async def enqueue(self, update: Dict[str, Any]) -> Optional[str]:
+        """
+        Publica o update bruto na fila e retorna o id da entrada.
+        Retorna None se o update (mesmo update_id) já foi recebido.
+        """
+        pass
+
+    @abstractmethod
+    async def depth(self) -> int:
+        """Quantidade de updates aguardando processamento"""
+        pass
@@ -1 +1,5 @@
 from .transaction import Transaction, TransactionCreate, TransactionBase
+from .installment_plan import InstallmentPlan, InstallmentPlanCreate, InstallmentPlanBase
+from .parsed_message import ParsedMessage
+from .period_summary import PeriodSummary
+from .transaction_filter import TransactionFilter
@@ -0,0 +1,54 @@
+import calendar
+from datetime import date, datetime
+from typing import Optional, List
+from pydantic import BaseModel, Field
+from decimal import Decimal, ROUND_HALF_UP
+from .transaction import TransactionCreate
+
+def add_months(base: date, months: int) -> date:
+    """Soma meses mantendo o dia (ou o último dia do mês, quando ele não existe)"""
+    year = base.year + ((base.month + months - 1) // 12)
+    month = ((base.month + months - 1) % 12) + 1
+    day = min(base.day, calendar.monthrange(year, month)[1])
+    return base.replace(year=year, month=month, day=day)
+
+class InstallmentPlanBase(BaseModel):
+    item: str
+    valor_total: Decimal = Field(gt=0)
+    parcelas: int = Field(gt=1)
+    data_compra: date
+    first_due_date: date
+    cutoff_day: Optional[int] = None  # Dia de fechamento do cartão usado para a 1ª parcela
+    categoria: str
+    transaction_type: str = "expense"
+    descricao: str  # Mensagem original
+
+    @property
+    def last_due_date(self) -> date:
+        return add_months(self.first_due_date, self.parcelas - 1)
+
+    def expand(self) -> List[TransactionCreate]:
+        """Gera as parcelas mês a mês (mesma regra usada pela função SQL ledger)"""
+        valor = (self.valor_total / self.parcelas).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+        return [
+            TransactionCreate(
+                item=self.item,
+                valor=valor,
+                data=add_months(self.first_due_date, i),
+                categoria=self.categoria,
+                transaction_type=self.transaction_type,
+                descricao=f"{self.descricao} (Parcela {i+1}/{self.parcelas})"
+            )
+            for i in range(self.parcelas)
+        ]
+
+class InstallmentPlanCreate(InstallmentPlanBase):
+    pass
+
+class InstallmentPlan(InstallmentPlanBase):
+    id: int
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,20 @@
+from typing import Optional, List
+from pydantic import BaseModel
+from .transaction import TransactionCreate
+from .installment_plan import InstallmentPlanCreate
+
+class ParsedMessage(BaseModel):
+    """Resultado da interpretação de uma mensagem: transações avulsas ou um plano de parcelas"""
+    transactions: List[TransactionCreate] = []
+    plan: Optional[InstallmentPlanCreate] = None
+    # A interpretação não chegou ao fim (ex: timeout ou 5xx da IA): vale tentar de novo,
+    # ao contrário de uma mensagem que simplesmente não tem lançamento
+    failed: bool = False
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.transactions and self.plan is None
+
+    def expand(self) -> List[TransactionCreate]:
+        """Todas as transações da mensagem, com as parcelas do plano já expandidas"""
+        return self.transactions + (self.plan.expand() if self.plan else [])
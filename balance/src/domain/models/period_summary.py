@@ -0,0 +1,9 @@
+from decimal import Decimal
+from pydantic import BaseModel
+
+class PeriodSummary(BaseModel):
+    """Totais de um período calculados no banco (sem carregar as transações)"""
+    income: Decimal = Decimal("0.00")
+    expense: Decimal = Decimal("0.00")
+    net: Decimal = Decimal("0.00")
+    count: int = 0
@@ -0,0 +1,11 @@
+from decimal import Decimal
+from typing import Optional, List, Literal
+from pydantic import BaseModel, Field
+
+class TransactionFilter(BaseModel):
+    """Filtros opcionais aplicados no WHERE das consultas de período"""
+    owner_id: Optional[int] = None  # Dono do ledger (id do chat do Telegram)
+    transaction_type: Optional[Literal["income", "expense"]] = None
+    categorias: Optional[List[str]] = None
+    min_valor: Optional[Decimal] = Field(default=None, ge=0)
+    max_valor: Optional[Decimal] = Field(default=None, ge=0)
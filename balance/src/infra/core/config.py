@@ -19,12 +19,80 @@ class Settings(BaseSettings):
     )
     DB_POOL_MIN: int = int(os.getenv("DB_POOL_MIN", "1"))
     DB_POOL_MAX: int = int(os.getenv("DB_POOL_MAX", "10"))
-    
+    # Réplicas de leitura (DSNs separados por vírgula); vazio = tudo no primário
+    DATABASE_REPLICA_URLS: str = os.getenv("DATABASE_REPLICA_URLS", "")
+    DB_REPLICA_POOL_MIN: int = int(os.getenv("DB_REPLICA_POOL_MIN", "1"))
+    DB_REPLICA_POOL_MAX: int = int(os.getenv("DB_REPLICA_POOL_MAX", "10"))
+    DB_REPLICA_MAX_LAG_SECONDS: float = float(os.getenv("DB_REPLICA_MAX_LAG_SECONDS", "5"))
+    DB_REPLICA_CHECK_SECONDS: float = float(os.getenv("DB_REPLICA_CHECK_SECONDS", "2"))
+    # Cache do asyncpg para as consultas montadas dinamicamente (uma por combinação de filtros)
+    DB_STATEMENT_CACHE_SIZE: int = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "256"))
+
+    # Redis
+    REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379")
+
+    # Fila de ingestão (Redis Streams)
+    INGESTION_STREAM: str = os.getenv("INGESTION_STREAM", "telegram:updates")
+    INGESTION_GROUP: str = os.getenv("INGESTION_GROUP", "ingestion")
+    INGESTION_DEAD_LETTER_STREAM: str = os.getenv("INGESTION_DEAD_LETTER_STREAM", "telegram:updates:dead")
+    INGESTION_CONCURRENCY: int = int(os.getenv("INGESTION_CONCURRENCY", "4"))
+    INGESTION_MAX_BACKLOG: int = int(os.getenv("INGESTION_MAX_BACKLOG", "10000"))
+    INGESTION_MAX_DELIVERIES: int = int(os.getenv("INGESTION_MAX_DELIVERIES", "3"))
+    INGESTION_CLAIM_IDLE_MS: int = int(os.getenv("INGESTION_CLAIM_IDLE_MS", "60000"))
+    INGESTION_BLOCK_MS: int = int(os.getenv("INGESTION_BLOCK_MS", "5000"))
+    INGESTION_DEDUPE_TTL_SECONDS: int = int(os.getenv("INGESTION_DEDUPE_TTL_SECONDS", "86400"))
+    # Porta do /metrics do worker (0 desliga)
+    WORKER_METRICS_PORT: int = int(os.getenv("WORKER_METRICS_PORT", "9101"))
+
+    # Regras de negócio
+    CREDIT_CARD_CUTOFF_DAY: int = int(os.getenv("CREDIT_CARD_CUTOFF_DAY", "26"))
+
+    # Cache de respostas das consultas de período (Redis)
+    RESPONSE_CACHE_ENABLED: bool = os.getenv("RESPONSE_CACHE_ENABLED", "True").lower() == "true"
+    RESPONSE_CACHE_TTL_SECONDS: int = int(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "3600"))
+    RESPONSE_CACHE_MAX_MONTHS: int = int(os.getenv("RESPONSE_CACHE_MAX_MONTHS", "120"))
+
+    # Importação em lote (POST /transactions/batch)
+    BATCH_IMPORT_CHUNK_SIZE: int = int(os.getenv("BATCH_IMPORT_CHUNK_SIZE", "5000"))
+    BATCH_IMPORT_MAX_ERRORS: int = int(os.getenv("BATCH_IMPORT_MAX_ERRORS", "1000"))
+
+    # Exportação em streaming (GET /transactions/export)
+    EXPORT_CURSOR_PREFETCH: int = int(os.getenv("EXPORT_CURSOR_PREFETCH", "1000"))
+    EXPORT_CHUNK_BYTES: int = int(os.getenv("EXPORT_CHUNK_BYTES", "65536"))
+    EXPORT_ARROW_BATCH_ROWS: int = int(os.getenv("EXPORT_ARROW_BATCH_ROWS", "65536"))
+
+    # Partições mensais de transactions criadas à frente (comando `partitions` da CLI)
+    TRANSACTION_PARTITIONS_AHEAD: int = int(os.getenv("TRANSACTION_PARTITIONS_AHEAD", "12"))
+
+    # Saldo acumulado (GET /transactions/running-balance): maior período aceito, em dias
+    RUNNING_BALANCE_MAX_DAYS: int = int(os.getenv("RUNNING_BALANCE_MAX_DAYS", "1830"))
+
     # Logging
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
     
     # AI 
     OPENAI_API_KEY: Optional[str] = os.getenv("OPENAI_API_KEY")
+    OPENAI_MODEL: str = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+    OPENAI_TIMEOUT_SECONDS: float = float(os.getenv("OPENAI_TIMEOUT_SECONDS", "30"))
+
+    # Limites do tier da OpenAI
+    OPENAI_MAX_CONCURRENCY: int = int(os.getenv("OPENAI_MAX_CONCURRENCY", "8"))
+    OPENAI_REQUESTS_PER_MINUTE: int = int(os.getenv("OPENAI_REQUESTS_PER_MINUTE", "500"))
+    OPENAI_MAX_RETRIES: int = int(os.getenv("OPENAI_MAX_RETRIES", "5"))
+    OPENAI_BACKOFF_BASE_SECONDS: float = float(os.getenv("OPENAI_BACKOFF_BASE_SECONDS", "1.0"))
+
+    # Micro-batching das chamadas à IA
+    LLM_BATCH_ENABLED: bool = os.getenv("LLM_BATCH_ENABLED", "False").lower() == "true"
+    LLM_BATCH_MAX_SIZE: int = int(os.getenv("LLM_BATCH_MAX_SIZE", "10"))
+    LLM_BATCH_WINDOW_MS: int = int(os.getenv("LLM_BATCH_WINDOW_MS", "200"))
+
+    # Fast-path (parser por regras antes da IA)
+    FAST_PARSER_ENABLED: bool = os.getenv("FAST_PARSER_ENABLED", "True").lower() == "true"
+    FAST_PARSER_MIN_CONFIDENCE: float = float(os.getenv("FAST_PARSER_MIN_CONFIDENCE", "0.8"))
+
+    # Cache de interpretações da IA (Redis)
+    PARSE_CACHE_ENABLED: bool = os.getenv("PARSE_CACHE_ENABLED", "True").lower() == "true"
+    PARSE_CACHE_TTL_SECONDS: int = int(os.getenv("PARSE_CACHE_TTL_SECONDS", str(45 * 24 * 3600)))
     
     class Config:
         env_file = ".env"
@@ -1,24 +1,63 @@
 import asyncpg
+import redis.asyncio as redis
+from typing import Optional
 from fastapi import Depends
-from ..data.database import get_db
+from ..data.database import get_db, get_read_db
+from ..data.redis_client import get_redis
 from ..data.repositories.transaction_repository import TransactionRepository
 from ...application.usecases.process_telegram_message import ProcessTelegramMessage
 
 from ...domain.interfaces.repositories.itransaction_repository import ITransactionRepository
 from ..services.ai_agent_service import AIAgentService
+from ..services.llm_batcher import LLMBatcher
+from ..services.openai_pool import openai_pool
+from ..services.parse_cache import ParseCache
+from ..services.response_cache import ResponseCache
+from .config import settings
 from ...domain.interfaces.services.iagent_service import IAgentService
+from ...domain.interfaces.services.imessage_queue import IMessageQueue
+from ..services.redis_stream_queue import RedisStreamQueue
 
-def get_transaction_repo(db: asyncpg.Pool = Depends(get_db)) -> ITransactionRepository:
-    """Dependency para TransactionRepository"""
-    return TransactionRepository(db)
+# Com réplicas, uma resposta pode ser montada com dados até esse tanto atrasados
+REPLICA_STALENESS_SECONDS = (
+    settings.DB_REPLICA_MAX_LAG_SECONDS + settings.DB_REPLICA_CHECK_SECONDS
+    if settings.DATABASE_REPLICA_URLS else 0
+)
 
-def get_ai_agent() -> IAgentService:
-    """Dependency para o Agente de IA"""
-    return AIAgentService()
+def get_response_cache(client: redis.Redis = Depends(get_redis)) -> Optional[ResponseCache]:
+    """Dependency para o cache de respostas das consultas de período"""
+    if not settings.RESPONSE_CACHE_ENABLED:
+        return None
+    return ResponseCache(client, reinvalidate_after=REPLICA_STALENESS_SECONDS)
+
+def get_transaction_repo(
+    db: asyncpg.Pool = Depends(get_db),
+    cache: Optional[ResponseCache] = Depends(get_response_cache),
+    read_db: asyncpg.Pool = Depends(get_read_db),
+) -> ITransactionRepository:
+    """
+    Dependency para TransactionRepository (escritas invalidam o cache de respostas;
+    leituras vão para uma réplica em dia quando houver)
+    """
+    return TransactionRepository(db, cache, read_db)
+
+def get_ai_agent(client: redis.Redis = Depends(get_redis)) -> IAgentService:
+    """Dependency para o Agente de IA (cliente OpenAI, limiter e batcher compartilhados)"""
+    cache = ParseCache(client) if settings.PARSE_CACHE_ENABLED else None
+    return AIAgentService(
+        client=openai_pool.client,
+        limiter=openai_pool.limiter,
+        cache=cache,
+        batcher=openai_pool.batcher
+    )
 
 def get_process_telegram_message(
     transaction_repo: ITransactionRepository = Depends(get_transaction_repo),
     agent: IAgentService = Depends(get_ai_agent)
 ) -> ProcessTelegramMessage:
     """Dependency para o caso de uso de processamento de mensagem"""
-    return ProcessTelegramMessage(transaction_repo, agent)
\ No newline at end of file
+    return ProcessTelegramMessage(transaction_repo, agent)
+
+def get_message_queue(client: redis.Redis = Depends(get_redis)) -> IMessageQueue:
+    """Dependency para a fila de ingestão do Telegram"""
+    return RedisStreamQueue(client)
\ No newline at end of file
@@ -0,0 +1,67 @@
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator
+from prometheus_client import Counter, Gauge, Histogram
+
+# Rotas: label pelo template (/transactions/period), nunca pelo path com valores
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "Latência das requisições HTTP", ["method", "route", "status"]
+)
+
+# Banco
+DB_QUERY_SECONDS = Histogram(
+    "db_query_duration_seconds", "Tempo de cada consulta do TransactionRepository", ["query"]
+)
+DB_QUERY_ERRORS = Counter("db_query_errors_total", "Consultas que falharam", ["query"])
+DB_POOL_ACQUIRE_SECONDS = Histogram(
+    "db_pool_acquire_seconds", "Espera por uma conexão livre do pool"
+)
+DB_POOL_SIZE = Gauge("db_pool_size", "Conexões abertas no pool", ["pool"])
+DB_POOL_IDLE = Gauge("db_pool_idle", "Conexões ociosas no pool", ["pool"])
+DB_POOL_MAX = Gauge("db_pool_max_size", "Tamanho máximo do pool", ["pool"])
+DB_REPLICA_LAG = Gauge("db_replica_lag_seconds", "Atraso de replicação medido", ["pool"])
+
+# IA (kind = single ou batch)
+LLM_REQUEST_SECONDS = Histogram(
+    "llm_request_duration_seconds", "Latência das chamadas à OpenAI", ["kind"],
+    buckets=(0.25, 0.5, 1, 2, 4, 8, 15, 30, 60),
+)
+LLM_TOKENS = Counter("llm_tokens_total", "Tokens consumidos na OpenAI", ["kind", "type"])
+LLM_ERRORS = Counter("llm_errors_total", "Chamadas à OpenAI que falharam", ["kind"])
+
+# Fila de ingestão
+INGESTION_QUEUE_DEPTH = Gauge("ingestion_queue_depth", "Updates aguardando o worker", ["stream"])
+
+@contextmanager
+def track_query(name: str) -> Iterator[None]:
+    """Cronometra uma consulta e conta a falha (a exceção segue para quem chamou)"""
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        DB_QUERY_ERRORS.labels(name).inc()
+        raise
+    finally:
+        DB_QUERY_SECONDS.labels(name).observe(time.perf_counter() - started)
+
+@contextmanager
+def track_llm(kind: str) -> Iterator[None]:
+    """Cronometra uma chamada à OpenAI e conta a falha"""
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        LLM_ERRORS.labels(kind).inc()
+        raise
+    finally:
+        LLM_REQUEST_SECONDS.labels(kind).observe(time.perf_counter() - started)
+
+def record_llm_usage(kind: str, response: Any):
+    """Soma os tokens informados em `usage` da resposta (quando presente)"""
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return
+    for token_type in ("prompt_tokens", "completion_tokens"):
+        value = getattr(usage, token_type, None)
+        if isinstance(value, int):
+            LLM_TOKENS.labels(kind, token_type.removesuffix("_tokens")).inc(value)
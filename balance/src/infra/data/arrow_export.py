@@ -0,0 +1,168 @@
+import os
+import pyarrow as pa
+import pyarrow.parquet as pq
+from datetime import date
+from typing import Any, AsyncIterator, BinaryIO, List, Mapping, Optional, Tuple
+from ..core.config import settings
+
+# Mesmos campos da API; categoria e tipo se repetem muito e vão como dicionário
+SCHEMA = pa.schema([
+    ("id", pa.int64()),
+    ("item", pa.string()),
+    ("valor", pa.decimal128(12, 2)),
+    ("data", pa.date32()),
+    ("categoria", pa.dictionary(pa.int32(), pa.string())),
+    ("descricao", pa.string()),
+    ("transaction_type", pa.dictionary(pa.int8(), pa.string())),
+    ("created_at", pa.timestamp("us")),
+    ("parcela", pa.int16()),
+])
+
+# Sem período, a exportação cobre o ledger inteiro
+FULL_RANGE = (date(1900, 1, 1), date(9999, 12, 31))
+
+FORMATS = {
+    "arrow": ("arrows", "application/vnd.apache.arrow.stream"),
+    "parquet": ("parquet", "application/vnd.apache.parquet"),
+}
+
+def to_batch(rows: List[Mapping[str, Any]]) -> pa.RecordBatch:
+    return pa.RecordBatch.from_pydict(
+        {name: [row[name] for row in rows] for name in SCHEMA.names},
+        schema=SCHEMA,
+    )
+
+async def record_batches(
+    rows: AsyncIterator[Mapping[str, Any]],
+    batch_rows: int = settings.EXPORT_ARROW_BATCH_ROWS,
+    by_month: bool = False,
+) -> AsyncIterator[Tuple[Optional[str], pa.RecordBatch]]:
+    """
+    Agrupa as linhas (em ordem cronológica) em record batches de até `batch_rows`.
+    Com `by_month`, um batch nunca mistura meses e vem acompanhado do mês (YYYY-MM).
+    """
+    pending: List[Mapping[str, Any]] = []
+    month = None
+
+    async for row in rows:
+        row_month = f"{row['data']:%Y-%m}" if by_month else None
+        if pending and (len(pending) >= batch_rows or row_month != month):
+            yield month, to_batch(pending)
+            pending = []
+
+        month = row_month
+        pending.append(row)
+
+    if pending:
+        yield month, to_batch(pending)
+
+class TableWriter:
+    """Escreve record batches em Arrow IPC (formato stream) ou Parquet"""
+
+    def __init__(self, sink: Any, fmt: str):
+        if fmt == "parquet":
+            self._writer = pq.ParquetWriter(sink, SCHEMA, compression="zstd")
+        else:
+            # O formato stream aceita dicionários diferentes a cada batch (o formato file não)
+            self._writer = pa.ipc.new_stream(sink, SCHEMA)
+
+    def write(self, batch: pa.RecordBatch):
+        self._writer.write_batch(batch)
+
+    def close(self):
+        self._writer.close()
+
+class _ChunkSink:
+    """Destino file-like que acumula o que o writer produziu até ser drenado"""
+
+    def __init__(self):
+        self.parts: List[bytes] = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        self.parts.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self.parts)
+        self.parts = []
+        return data
+
+async def stream_table(
+    rows: AsyncIterator[Mapping[str, Any]],
+    fmt: str,
+    batch_rows: int = settings.EXPORT_ARROW_BATCH_ROWS,
+) -> AsyncIterator[bytes]:
+    """Um único arquivo Arrow/Parquet, entregue em pedaços a cada batch escrito"""
+    sink = _ChunkSink()
+    writer = TableWriter(sink, fmt)
+
+    async for _, batch in record_batches(rows, batch_rows):
+        writer.write(batch)
+        data = sink.drain()
+        if data:
+            yield data
+
+    writer.close()
+    data = sink.drain()
+    if data:
+        yield data
+
+async def write_files(
+    rows: AsyncIterator[Mapping[str, Any]],
+    path: str,
+    fmt: str,
+    partition_by_month: bool = False,
+    batch_rows: int = settings.EXPORT_ARROW_BATCH_ROWS,
+) -> int:
+    """
+    Grava as linhas em `path` (um arquivo) ou, com `partition_by_month`, em
+    `path/month=YYYY-MM/part-0.<ext>` (layout hive, lido direto por pandas/duckdb).
+    Retorna o número de linhas gravadas.
+    """
+    total = 0
+
+    if not partition_by_month:
+        with open(path, "wb") as sink:
+            writer = TableWriter(sink, fmt)
+            async for _, batch in record_batches(rows, batch_rows):
+                writer.write(batch)
+                total += batch.num_rows
+            writer.close()
+        return total
+
+    # As linhas chegam em ordem cronológica: cada mês é aberto e fechado uma única vez
+    extension = FORMATS[fmt][0]
+    current: Optional[Tuple[str, BinaryIO, TableWriter]] = None
+    try:
+        async for month, batch in record_batches(rows, batch_rows, by_month=True):
+            if current is None or current[0] != month:
+                if current:
+                    current[2].close()
+                    current[1].close()
+
+                directory = os.path.join(path, f"month={month}")
+                os.makedirs(directory, exist_ok=True)
+                sink = open(os.path.join(directory, f"part-0.{extension}"), "wb")
+                current = (month, sink, TableWriter(sink, fmt))
+
+            current[2].write(batch)
+            total += batch.num_rows
+
+    finally:
+        if current:
+            current[2].close()
+            current[1].close()
+
+    return total
@@ -1,7 +1,10 @@
 import asyncio
 import argparse
+import json
 import sys
 import os
+import time
+from datetime import date
 from alembic.config import Config
 from alembic import command
 
@@ -9,6 +12,18 @@ from alembic import command
 sys.path.insert(0, os.getcwd())
 
 from .database import db
+from .redis_client import redis_client
+from .repositories.transaction_repository import TransactionRepository
+from ...domain.models.transaction_filter import TransactionFilter
+from .telegram_export import read_chat_id, iter_messages
+from .arrow_export import write_files, FULL_RANGE
+from .partitions import ensure_partitions, detach_partitions_before
+from ..core.config import settings
+from ..core.dependencies import get_ai_agent, get_response_cache
+from ..services.llm_batcher import LLMBatcher
+from ..services.openai_pool import openai_pool
+from ..services.rule_based_parser import rule_based_parser
+from ...application.usecases.process_telegram_message import ProcessTelegramMessage
 
 def get_alembic_config():
     """Configura o objeto de configuração do Alembic"""
@@ -35,13 +50,177 @@ async def run_setup():
     run_migrate()
     print("✨ Setup finalizado com sucesso!")
 
+def load_checkpoint(path: str) -> int:
+    """Último message_id já importado (0 se a importação ainda não começou)"""
+    if not os.path.exists(path):
+        return 0
+    with open(path) as f:
+        return json.load(f).get("last_message_id", 0)
+
+def save_checkpoint(path: str, chat_id: int, last_message_id: int):
+    """Grava o checkpoint de forma atômica (arquivo temporário + rename)"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"chat_id": chat_id, "last_message_id": last_message_id}, f)
+    os.replace(tmp_path, path)
+
+async def run_backfill(
+    export_path: str,
+    checkpoint_path: str = None,
+    from_id: str = None,
+    concurrency: int = 16,
+    batch_size: int = 500,
+):
+    """Importa o histórico de um chat a partir do export JSON do Telegram Desktop"""
+    checkpoint_path = checkpoint_path or f"{export_path}.checkpoint.json"
+    chat_id = read_chat_id(export_path)
+    last_imported = load_checkpoint(checkpoint_path)
+    if last_imported:
+        print(f"↩️  Retomando após a mensagem {last_imported}")
+
+    await db.connect()
+    await redis_client.connect()
+    await openai_pool.connect()
+    if openai_pool.client and not openai_pool.batcher:
+        # Na importação sempre há mensagens suficientes para encher os lotes
+        openai_pool.batcher = LLMBatcher(openai_pool.client, limiter=openai_pool.limiter)
+
+    repo = TransactionRepository(db.pool, get_response_cache(redis_client.client))
+    use_case = ProcessTelegramMessage(repo, get_ai_agent(redis_client.client))
+
+    stats = {"lidas": 0, "ignoradas": 0, "importadas": 0, "sem_lancamento": 0, "falhas": 0}
+    seen = set()
+    chunk = []
+    started = time.monotonic()
+
+    async def flush():
+        result = await use_case.execute_many(chat_id, chunk, concurrency)
+        if result is None:
+            raise RuntimeError("Falha ao gravar lote; rode o backfill novamente para retomar do checkpoint")
+
+        imported, failed = result
+        stats["importadas"] += imported
+        stats["sem_lancamento"] += len(chunk) - imported - len(failed)
+        stats["falhas"] += len(failed)
+
+        if failed:
+            # O checkpoint para antes da primeira mensagem que a IA não interpretou: na
+            # próxima execução ela (e as seguintes, já gravadas de forma idempotente) é refeita
+            first_failed = min(failed)
+            done = [message_id for message_id, _, _ in chunk if message_id < first_failed]
+            if done:
+                save_checkpoint(checkpoint_path, chat_id, done[-1])
+            raise RuntimeError(
+                f"{len(failed)} mensagens não foram interpretadas (a partir da {first_failed}); "
+                "rode o backfill novamente para retomar do checkpoint"
+            )
+
+        save_checkpoint(checkpoint_path, chat_id, chunk[-1][0])
+
+        elapsed = time.monotonic() - started
+        processed = stats["importadas"] + stats["sem_lancamento"]
+        print(
+            f"📥 {processed} processadas ({processed / elapsed:.1f} msg/s) | "
+            f"importadas {stats['importadas']} | sem lançamento {stats['sem_lancamento']} | "
+            f"ignoradas {stats['ignoradas']} | fast-path {rule_based_parser.hit_rate:.0%}"
+        )
+        chunk.clear()
+
+    try:
+        for message_id, text, sent_on, sender in iter_messages(export_path):
+            stats["lidas"] += 1
+
+            # Mensagens repetidas, já importadas ou de outro remetente (ex: respostas do bot)
+            if message_id <= last_imported or message_id in seen or (from_id and sender != from_id):
+                stats["ignoradas"] += 1
+                continue
+
+            seen.add(message_id)
+            chunk.append((message_id, text, sent_on))
+            if len(chunk) >= batch_size:
+                await flush()
+
+        if chunk:
+            await flush()
+
+    finally:
+        await openai_pool.disconnect()
+        await redis_client.disconnect()
+        await db.disconnect()
+
+    elapsed = time.monotonic() - started
+    print(f"✅ Backfill concluído em {elapsed:.1f}s: {stats}")
+
+async def run_export(
+    output: str,
+    fmt: str = "parquet",
+    start_date: date = None,
+    end_date: date = None,
+    partition_by_month: bool = False,
+    owner_id: int = None,
+):
+    """Exporta o ledger (ou um período, ou um dono) em Arrow IPC ou Parquet para análise"""
+    start_date = start_date or FULL_RANGE[0]
+    end_date = end_date or FULL_RANGE[1]
+
+    await db.connect()
+    try:
+        repo = TransactionRepository(db.pool, read_pool=db.read_pool())
+        started = time.monotonic()
+        total = await write_files(
+            repo.iter_by_period(start_date, end_date, TransactionFilter(owner_id=owner_id)), output, fmt, partition_by_month
+        )
+    finally:
+        await db.disconnect()
+
+    elapsed = time.monotonic() - started
+    print(f"✅ {total} transações exportadas para {output} em {elapsed:.1f}s")
+
+async def run_partitions(months_ahead: int, detach_before: date = None):
+    """Cria as partições mensais futuras e, opcionalmente, arquiva as antigas"""
+    await db.connect()
+    try:
+        created = await ensure_partitions(db.pool, months_ahead)
+        print(f"🧱 {len(created)} partições criadas ({months_ahead} meses à frente)")
+
+        if detach_before:
+            detached = await detach_partitions_before(db.pool, detach_before.replace(day=1))
+            print(f"📦 {len(detached)} partições desanexadas: {', '.join(detached) or '-'}")
+    finally:
+        await db.disconnect()
+
+async def run_snapshots():
+    """Recalcula os saldos de abertura mensais usados por /transactions/running-balance"""
+    await db.connect()
+    try:
+        count = await TransactionRepository(db.pool).refresh_balance_snapshots()
+    finally:
+        await db.disconnect()
+
+    if count is None:
+        raise RuntimeError("Falha ao atualizar os snapshots de saldo")
+    print(f"📸 {count} snapshots de saldo atualizados")
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Database Management CLI")
     parser.add_argument(
         "command", 
-        choices=["migrate", "rollback", "seed", "setup"], 
+        choices=["migrate", "rollback", "seed", "setup", "backfill", "export", "partitions", "snapshots"], 
         help="Command to run"
     )
+    parser.add_argument("--export", help="backfill: caminho do result.json exportado pelo Telegram Desktop")
+    parser.add_argument("--checkpoint", help="backfill: arquivo de checkpoint (padrão: <export>.checkpoint.json)")
+    parser.add_argument("--from-id", help="backfill: importa apenas mensagens deste remetente (ex: user123456)")
+    parser.add_argument("--concurrency", type=int, default=16, help="backfill: mensagens interpretadas em paralelo")
+    parser.add_argument("--batch-size", type=int, default=500, help="backfill: mensagens por lote gravado")
+    parser.add_argument("--output", help="export: arquivo de saída (ou diretório com --partition-by-month)")
+    parser.add_argument("--format", choices=["parquet", "arrow"], default="parquet", help="export: parquet ou arrow (IPC stream)")
+    parser.add_argument("--start-date", type=date.fromisoformat, help="export: data inicial YYYY-MM-DD (padrão: todo o ledger)")
+    parser.add_argument("--end-date", type=date.fromisoformat, help="export: data final YYYY-MM-DD (padrão: todo o ledger)")
+    parser.add_argument("--partition-by-month", action="store_true", help="export: um arquivo por mês em <output>/month=YYYY-MM/")
+    parser.add_argument("--owner-id", type=int, help="export: apenas as transações deste dono (id do chat do Telegram)")
+    parser.add_argument("--ahead", type=int, default=settings.TRANSACTION_PARTITIONS_AHEAD, help="partitions: meses futuros com partição criada")
+    parser.add_argument("--detach-before", type=date.fromisoformat, help="partitions: desanexa as partições de meses anteriores a YYYY-MM-DD")
     
     args = parser.parse_args()
     
@@ -51,3 +230,15 @@ if __name__ == "__main__":
         run_rollback()
     elif args.command == "setup":
         asyncio.run(run_setup())
+    elif args.command == "backfill":
+        if not args.export:
+            parser.error("backfill requer --export")
+        asyncio.run(run_backfill(args.export, args.checkpoint, args.from_id, args.concurrency, args.batch_size))
+    elif args.command == "export":
+        if not args.output:
+            parser.error("export requer --output")
+        asyncio.run(run_export(args.output, args.format, args.start_date, args.end_date, args.partition_by_month, args.owner_id))
+    elif args.command == "partitions":
+        asyncio.run(run_partitions(args.ahead, args.detach_before))
+    elif args.command == "snapshots":
+        asyncio.run(run_snapshots())
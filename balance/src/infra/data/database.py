@@ -1,29 +1,138 @@
+import asyncio
 import asyncpg
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Dict, List, Optional, Tuple
 from ..core.config import settings
 from ..core.logger import logger
+from ..core.metrics import DB_POOL_IDLE, DB_POOL_MAX, DB_POOL_SIZE, DB_REPLICA_LAG
+from .statements import StatementConnection, init_connection
+
+# Atraso de replicação em segundos (0 quando a réplica já aplicou todo o WAL recebido)
+REPLICA_LAG_QUERY = """
+    SELECT CASE
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+"""
 
 class Database:
     def __init__(self):
         self.pool: asyncpg.Pool = None
+        self.replicas: List[Tuple[str, asyncpg.Pool]] = []
+        self.replica_lag: Dict[str, Optional[float]] = {}
+        self._monitor: Optional[asyncio.Task] = None
+        self._next_replica = 0
     
     async def connect(self):
-        """Conecta ao banco de dados"""
+        """Conecta ao banco de dados (primário e réplicas de leitura, se configuradas)"""
         try:
-            self.pool = await asyncpg.create_pool(
-                dsn=settings.DATABASE_URL,
-                min_size=settings.DB_POOL_MIN,
-                max_size=settings.DB_POOL_MAX,
-                command_timeout=60
-            )
+            self.pool = await self._create_pool(settings.DATABASE_URL, settings.DB_POOL_MIN, settings.DB_POOL_MAX)
             logger.info("✅ Conectado ao PostgreSQL")
             
         except Exception as e:
             logger.error(f"❌ Erro ao conectar ao banco: {str(e)}")
             raise
+
+        dsns = [dsn.strip() for dsn in settings.DATABASE_REPLICA_URLS.split(",") if dsn.strip()]
+        for index, dsn in enumerate(dsns, start=1):
+            name = f"replica_{index}"
+            try:
+                pool = await self._create_pool(dsn, settings.DB_REPLICA_POOL_MIN, settings.DB_REPLICA_POOL_MAX)
+                self.replicas.append((name, pool))
+                logger.info(f"✅ Conectado à réplica de leitura {name}")
+            except Exception as e:
+                # Sem a réplica as leituras continuam no primário
+                logger.warning(f"⚠️ Réplica {name} indisponível: {str(e)}")
+
+        if self.replicas:
+            self._monitor = asyncio.create_task(self._monitor_replicas())
+
+    async def _create_pool(self, dsn: str, min_size: int, max_size: int) -> asyncpg.Pool:
+        return await asyncpg.create_pool(
+            dsn=dsn,
+            min_size=min_size,
+            max_size=max_size,
+            command_timeout=60,
+            statement_cache_size=settings.DB_STATEMENT_CACHE_SIZE,
+            connection_class=StatementConnection,
+            init=init_connection
+        )
+
+    async def check_lag(self, pool: asyncpg.Pool) -> Optional[float]:
+        """Atraso da réplica em segundos (None se ela não respondeu)"""
+        try:
+            return float(await pool.fetchval(REPLICA_LAG_QUERY))
+        except Exception as e:
+            logger.warning(f"⚠️ Falha ao medir atraso da réplica: {str(e)}")
+            return None
+
+    async def _monitor_replicas(self):
+        """Mede o atraso das réplicas a cada DB_REPLICA_CHECK_SECONDS"""
+        while True:
+            for name, pool in self.replicas:
+                self.replica_lag[name] = await self.check_lag(pool)
+            await asyncio.sleep(settings.DB_REPLICA_CHECK_SECONDS)
+
+    def read_pool(self) -> asyncpg.Pool:
+        """
+        Pool para leituras analíticas: uma réplica com atraso até
+        DB_REPLICA_MAX_LAG_SECONDS (em rodízio) ou, se nenhuma estiver em dia, o primário
+        """
+        fresh = [
+            pool for name, pool in self.replicas
+            if self.replica_lag.get(name) is not None
+            and self.replica_lag[name] <= settings.DB_REPLICA_MAX_LAG_SECONDS
+        ]
+        if not fresh:
+            return self.pool
+
+        self._next_replica = (self._next_replica + 1) % len(fresh)
+        return fresh[self._next_replica]
+
+    async def pool_status(self) -> Dict[str, str]:
+        """Estado de cada pool: connected, stale (réplica atrasada demais) ou disconnected"""
+        status = {}
+        try:
+            await self.pool.fetchval("SELECT 1")
+            status["primary"] = "connected"
+        except Exception as e:
+            logger.error(f"❌ Erro na conexão com banco: {str(e)}")
+            status["primary"] = "disconnected"
+
+        for name, pool in self.replicas:
+            lag = await self.check_lag(pool)
+            if lag is None:
+                status[name] = "disconnected"
+            elif lag > settings.DB_REPLICA_MAX_LAG_SECONDS:
+                status[name] = "stale"
+            else:
+                status[name] = "connected"
+        return status
     
+    def update_pool_metrics(self):
+        """Atualiza os gauges de tamanho/ociosidade de cada pool (chamado a cada scrape)"""
+        pools = [("primary", self.pool)] + self.replicas
+        for name, pool in pools:
+            if pool is None:
+                continue
+            DB_POOL_SIZE.labels(name).set(pool.get_size())
+            DB_POOL_IDLE.labels(name).set(pool.get_idle_size())
+            DB_POOL_MAX.labels(name).set(pool.get_max_size())
+
+        for name, lag in self.replica_lag.items():
+            if lag is not None:
+                DB_REPLICA_LAG.labels(name).set(lag)
+
     async def disconnect(self):
         """Desconecta do banco de dados"""
+        if self._monitor:
+            self._monitor.cancel()
+            self._monitor = None
+
+        for _, pool in self.replicas:
+            await pool.close()
+        self.replicas = []
+        self.replica_lag = {}
+
         if self.pool:
             await self.pool.close()
             logger.info("❌ Desconectado do PostgreSQL")
@@ -33,4 +142,8 @@ db = Database()
 
 async def get_db() -> asyncpg.Pool:
     """Dependency para obter conexão do pool"""
-    return db.pool
\ No newline at end of file
+    return db.pool
+
+async def get_read_db() -> asyncpg.Pool:
+    """Dependency para o pool de leitura (réplica em dia ou primário)"""
+    return db.read_pool()
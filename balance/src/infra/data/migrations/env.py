@@ -42,7 +42,13 @@ def run_migrations_offline() -> None:
         context.run_migrations()
 
 def do_run_migrations(connection):
-    context.configure(connection=connection, target_metadata=target_metadata)
+    # Uma transação por migration: locks de uma (ex: a troca de tabelas do
+    # particionamento) são liberados no commit dela, não no fim do upgrade inteiro
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        transaction_per_migration=True,
+    )
     with context.begin_transaction():
         context.run_migrations()
 
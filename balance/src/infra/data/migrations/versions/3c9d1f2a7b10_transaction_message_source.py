@@ -0,0 +1,44 @@
+"""transaction_message_source
+
+Revision ID: 3c9d1f2a7b10
+Revises: e7a359092aa0
+Create Date: 2026-10-18 10:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c9d1f2a7b10'
+down_revision: Union[str, Sequence[str], None] = 'e7a359092aa0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Mensagem do Telegram que originou a transação (chat, message_id e posição da parcela)
+    op.execute("""
+        ALTER TABLE transactions
+            ADD COLUMN source_chat_id BIGINT,
+            ADD COLUMN source_message_id BIGINT,
+            ADD COLUMN source_seq SMALLINT;
+    """)
+
+    # Reentregas e edições da mesma mensagem atualizam as linhas existentes
+    op.execute("""
+        CREATE UNIQUE INDEX uq_transactions_source
+        ON transactions(source_chat_id, source_message_id, source_seq);
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS uq_transactions_source;")
+    op.execute("""
+        ALTER TABLE transactions
+            DROP COLUMN IF EXISTS source_seq,
+            DROP COLUMN IF EXISTS source_message_id,
+            DROP COLUMN IF EXISTS source_chat_id;
+    """)
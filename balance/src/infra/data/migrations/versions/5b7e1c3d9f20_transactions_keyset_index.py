@@ -0,0 +1,42 @@
+"""transactions_keyset_index
+
+Revision ID: 5b7e1c3d9f20
+Revises: 8a4e2b6c9d31
+Create Date: 2026-10-18 14:20:41.318027
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b7e1c3d9f20'
+down_revision: Union[str, Sequence[str], None] = '8a4e2b6c9d31'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # A chave de paginação (data, created_at, id) não pode ter NULL: a comparação
+    # de tuplas com NULL descartaria a linha de todas as páginas
+    for table in ("transactions", "installment_plans"):
+        op.execute(f"UPDATE {table} SET created_at = COALESCE(updated_at, CURRENT_TIMESTAMP) WHERE created_at IS NULL;")
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN created_at SET NOT NULL;")
+
+    # Mesma ordem do ORDER BY da listagem: cada página é um range scan a partir do cursor.
+    # Cobre as buscas por data, então o índice simples deixa de ser necessário
+    op.execute("""
+        CREATE INDEX idx_transactions_keyset
+        ON transactions(data DESC, created_at DESC, id DESC);
+    """)
+    op.execute("DROP INDEX IF EXISTS idx_transactions_data;")
+
+
+def downgrade() -> None:
+    op.execute("CREATE INDEX idx_transactions_data ON transactions(data);")
+    op.execute("DROP INDEX IF EXISTS idx_transactions_keyset;")
+
+    for table in ("transactions", "installment_plans"):
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN created_at DROP NOT NULL;")
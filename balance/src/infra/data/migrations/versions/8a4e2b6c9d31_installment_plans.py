@@ -0,0 +1,91 @@
+"""installment_plans
+
+Revision ID: 8a4e2b6c9d31
+Revises: 3c9d1f2a7b10
+Create Date: 2026-10-18 11:02:17.904512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8a4e2b6c9d31'
+down_revision: Union[str, Sequence[str], None] = '3c9d1f2a7b10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Uma linha por compra parcelada; os ids vêm da mesma sequence de transactions
+    # para que parcelas e transações nunca colidam no ledger
+    op.execute("""
+        CREATE TABLE installment_plans (
+            id INTEGER PRIMARY KEY DEFAULT nextval('transactions_id_seq'),
+            item VARCHAR(255) NOT NULL,
+            valor_total DECIMAL(10,2) NOT NULL,
+            parcelas SMALLINT NOT NULL CHECK (parcelas > 1),
+            data_compra DATE NOT NULL,
+            first_due_date DATE NOT NULL,
+            last_due_date DATE NOT NULL,
+            cutoff_day SMALLINT,
+            categoria VARCHAR(100) NOT NULL,
+            transaction_type VARCHAR(50) NOT NULL DEFAULT 'expense',
+            descricao TEXT NOT NULL,
+            source_chat_id BIGINT,
+            source_message_id BIGINT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+    """)
+
+    op.execute("CREATE INDEX idx_installment_plans_due ON installment_plans(first_due_date, last_due_date);")
+    op.execute("""
+        CREATE UNIQUE INDEX uq_installment_plans_source
+        ON installment_plans(source_chat_id, source_message_id);
+    """)
+
+    # Ledger do período: transações avulsas + parcelas geradas sob demanda a partir dos
+    # planos. Função SQL STABLE de um único SELECT é "inlined" pelo planner, então os
+    # filtros de quem consulta chegam aos índices de transactions e installment_plans
+    op.execute("""
+        CREATE FUNCTION ledger(start_date DATE, end_date DATE)
+        RETURNS TABLE (
+            id INTEGER,
+            item VARCHAR,
+            valor NUMERIC,
+            data DATE,
+            categoria VARCHAR,
+            transaction_type VARCHAR,
+            descricao TEXT,
+            created_at TIMESTAMP,
+            updated_at TIMESTAMP
+        )
+        LANGUAGE sql STABLE
+        AS $$
+            SELECT t.id, t.item, t.valor, t.data, t.categoria, t.transaction_type,
+                   t.descricao, t.created_at, t.updated_at
+            FROM transactions t
+            WHERE t.data BETWEEN start_date AND end_date
+            UNION ALL
+            SELECT p.id, p.item, i.valor, i.data, p.categoria, p.transaction_type,
+                   p.descricao || ' (Parcela ' || g.n || '/' || p.parcelas || ')',
+                   p.created_at, p.updated_at
+            FROM installment_plans p
+            CROSS JOIN LATERAL generate_series(1, p.parcelas) AS g(n)
+            CROSS JOIN LATERAL (
+                SELECT round(p.valor_total / p.parcelas, 2) AS valor,
+                       (p.first_due_date + (g.n - 1) * interval '1 month')::date AS data
+            ) i
+            WHERE p.first_due_date <= end_date
+              AND p.last_due_date >= start_date
+              AND i.data BETWEEN start_date AND end_date
+        $$;
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP FUNCTION IF EXISTS ledger(DATE, DATE);")
+    op.execute("DROP TABLE IF EXISTS installment_plans;")
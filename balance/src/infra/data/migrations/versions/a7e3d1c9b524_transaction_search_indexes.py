@@ -0,0 +1,43 @@
+"""transaction_search_indexes
+
+Revision ID: a7e3d1c9b524
+Revises: f2c6b9d4a871
+Create Date: 2026-10-18 20:11:47.902315
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7e3d1c9b524'
+down_revision: Union[str, Sequence[str], None] = 'f2c6b9d4a871'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+
+    # Busca de /transactions/search: trigramas no item (ILIKE e similaridade com erros de
+    # digitação, ex: "ifod") e full-text em português na mensagem original. A expressão do
+    # tsvector precisa ser idêntica à usada na consulta para o índice ser escolhido
+    for table in ("transactions", "installment_plans"):
+        op.execute(f"""
+            CREATE INDEX idx_{table}_item_trgm
+            ON {table} USING gin (item gin_trgm_ops);
+        """)
+    # Nos planos o ledger acrescenta " (Parcela n/N)" à descricao: só o item usa índice
+    op.execute("""
+        CREATE INDEX idx_transactions_descricao_fts
+        ON transactions USING gin (to_tsvector('portuguese', descricao));
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_transactions_descricao_fts;")
+    for table in ("transactions", "installment_plans"):
+        op.execute(f"DROP INDEX IF EXISTS idx_{table}_item_trgm;")
+    op.execute("DROP EXTENSION IF EXISTS pg_trgm;")
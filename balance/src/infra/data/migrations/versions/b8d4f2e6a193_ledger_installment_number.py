@@ -0,0 +1,72 @@
+"""ledger_installment_number
+
+Revision ID: b8d4f2e6a193
+Revises: e5b2a9c7f314
+Create Date: 2026-10-18 22:31:40.618203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8d4f2e6a193'
+down_revision: Union[str, Sequence[str], None] = 'e5b2a9c7f314'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def replace_ledger(installment_number: bool) -> None:
+    # Todas as parcelas de um plano saem com o id do plano: o número da parcela
+    # completa a chave, (id, parcela) é único no ledger (NULL nas transações avulsas)
+    parcela_column = "parcela INTEGER," if installment_number else ""
+    transaction_parcela = "NULL::integer," if installment_number else ""
+    plan_parcela = "g.n," if installment_number else ""
+    op.execute("DROP FUNCTION IF EXISTS ledger(DATE, DATE);")
+    op.execute(f"""
+        CREATE FUNCTION ledger(start_date DATE, end_date DATE)
+        RETURNS TABLE (
+            owner_id BIGINT,
+            id INTEGER,
+            {parcela_column}
+            item VARCHAR,
+            valor NUMERIC,
+            data DATE,
+            categoria VARCHAR,
+            transaction_type VARCHAR,
+            descricao TEXT,
+            created_at TIMESTAMP,
+            updated_at TIMESTAMP
+        )
+        LANGUAGE sql STABLE
+        AS $$
+            SELECT t.owner_id, t.id, {transaction_parcela} t.item, t.valor, t.data, t.categoria,
+                   t.transaction_type, t.descricao, t.created_at, t.updated_at
+            FROM transactions t
+            WHERE t.data BETWEEN start_date AND end_date
+            UNION ALL
+            SELECT p.owner_id, p.id, {plan_parcela} p.item, i.valor, i.data, p.categoria,
+                   p.transaction_type,
+                   p.descricao || ' (Parcela ' || g.n || '/' || p.parcelas || ')',
+                   p.created_at, p.updated_at
+            FROM installment_plans p
+            CROSS JOIN LATERAL generate_series(1, p.parcelas) AS g(n)
+            CROSS JOIN LATERAL (
+                SELECT round(p.valor_total / p.parcelas, 2) AS valor,
+                       (p.first_due_date + (g.n - 1) * interval '1 month')::date AS data
+            ) i
+            WHERE p.first_due_date <= end_date
+              AND p.last_due_date >= start_date
+              AND i.data BETWEEN start_date AND end_date
+        $$;
+    """)
+
+
+def upgrade() -> None:
+    replace_ledger(installment_number=True)
+
+
+def downgrade() -> None:
+    replace_ledger(installment_number=False)
@@ -0,0 +1,153 @@
+"""monthly_rollups
+
+Revision ID: b93c5e7a1d48
+Revises: d41f6a8e2c57
+Create Date: 2026-10-18 17:42:30.215764
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b93c5e7a1d48'
+down_revision: Union[str, Sequence[str], None] = 'd41f6a8e2c57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Aplica um delta (já agregado por mês/categoria/tipo) na tabela de rollups.
+# ORDER BY fixa a ordem de lock das linhas e evita deadlock entre escritas concorrentes
+APPLY_DELTA = """
+    INSERT INTO monthly_rollups (month, categoria, transaction_type, total, count)
+    SELECT month, categoria, transaction_type, SUM(total), SUM(count)
+    FROM delta
+    GROUP BY month, categoria, transaction_type
+    ORDER BY month, categoria, transaction_type
+    ON CONFLICT (month, categoria, transaction_type) DO UPDATE SET
+        total = monthly_rollups.total + EXCLUDED.total,
+        count = monthly_rollups.count + EXCLUDED.count;
+"""
+
+# Parcelas de um conjunto de planos, uma linha por mês de vencimento (mesma regra de ledger())
+PLAN_INSTALLMENTS = """
+    SELECT date_trunc('month', p.first_due_date + (g.n - 1) * interval '1 month')::date AS month,
+           p.categoria, p.transaction_type,
+           {sign} round(p.valor_total / p.parcelas, 2) AS total, {sign} 1 AS count
+    FROM {source} p
+    CROSS JOIN LATERAL generate_series(1, p.parcelas) AS g(n)
+"""
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TABLE monthly_rollups (
+            month DATE NOT NULL,
+            categoria VARCHAR(100) NOT NULL,
+            transaction_type VARCHAR(50) NOT NULL,
+            total NUMERIC(14,2) NOT NULL DEFAULT 0,
+            count BIGINT NOT NULL DEFAULT 0,
+            PRIMARY KEY (month, categoria, transaction_type)
+        );
+    """)
+
+    # Triggers por statement com transition tables: um INSERT em lote (unnest, COPY)
+    # atualiza cada (mês, categoria, tipo) uma única vez, não uma vez por linha
+    op.execute(f"""
+        CREATE FUNCTION rollup_transactions() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                WITH delta AS (
+                    SELECT date_trunc('month', data)::date AS month, categoria, transaction_type,
+                           valor AS total, 1 AS count
+                    FROM new_rows
+                )
+                {APPLY_DELTA}
+            ELSIF TG_OP = 'DELETE' THEN
+                WITH delta AS (
+                    SELECT date_trunc('month', data)::date AS month, categoria, transaction_type,
+                           -valor AS total, -1 AS count
+                    FROM old_rows
+                )
+                {APPLY_DELTA}
+            ELSE
+                WITH delta AS (
+                    SELECT date_trunc('month', data)::date AS month, categoria, transaction_type,
+                           valor AS total, 1 AS count
+                    FROM new_rows
+                    UNION ALL
+                    SELECT date_trunc('month', data)::date, categoria, transaction_type, -valor, -1
+                    FROM old_rows
+                )
+                {APPLY_DELTA}
+            END IF;
+            RETURN NULL;
+        END;
+        $$;
+    """)
+
+    op.execute(f"""
+        CREATE FUNCTION rollup_installment_plans() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                WITH delta AS ({PLAN_INSTALLMENTS.format(sign="", source="new_rows")})
+                {APPLY_DELTA}
+            ELSIF TG_OP = 'DELETE' THEN
+                WITH delta AS ({PLAN_INSTALLMENTS.format(sign="-", source="old_rows")})
+                {APPLY_DELTA}
+            ELSE
+                WITH delta AS (
+                    {PLAN_INSTALLMENTS.format(sign="", source="new_rows")}
+                    UNION ALL
+                    {PLAN_INSTALLMENTS.format(sign="-", source="old_rows")}
+                )
+                {APPLY_DELTA}
+            END IF;
+            RETURN NULL;
+        END;
+        $$;
+    """)
+
+    # Transition tables só podem ser declaradas em triggers de um único evento
+    for table, function in (("transactions", "rollup_transactions"), ("installment_plans", "rollup_installment_plans")):
+        op.execute(f"""
+            CREATE TRIGGER {table}_rollup_insert AFTER INSERT ON {table}
+            REFERENCING NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION {function}();
+        """)
+        op.execute(f"""
+            CREATE TRIGGER {table}_rollup_update AFTER UPDATE ON {table}
+            REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION {function}();
+        """)
+        op.execute(f"""
+            CREATE TRIGGER {table}_rollup_delete AFTER DELETE ON {table}
+            REFERENCING OLD TABLE AS old_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION {function}();
+        """)
+
+    # Carga inicial com o que já existe no ledger
+    op.execute(f"""
+        WITH delta AS (
+            SELECT date_trunc('month', data)::date AS month, categoria, transaction_type,
+                   valor AS total, 1 AS count
+            FROM transactions
+            UNION ALL
+            {PLAN_INSTALLMENTS.format(sign="", source="installment_plans")}
+        )
+        {APPLY_DELTA}
+    """)
+
+
+def downgrade() -> None:
+    for table in ("transactions", "installment_plans"):
+        for event in ("insert", "update", "delete"):
+            op.execute(f"DROP TRIGGER IF EXISTS {table}_rollup_{event} ON {table};")
+
+    op.execute("DROP FUNCTION IF EXISTS rollup_installment_plans();")
+    op.execute("DROP FUNCTION IF EXISTS rollup_transactions();")
+    op.execute("DROP TABLE IF EXISTS monthly_rollups;")
@@ -0,0 +1,233 @@
+"""transaction_owner
+
+Revision ID: c1f8e4a2d736
+Revises: a7e3d1c9b524
+Create Date: 2026-10-18 21:02:33.517260
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c1f8e4a2d736'
+down_revision: Union[str, Sequence[str], None] = 'a7e3d1c9b524'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def rollup_key(owner: bool) -> str:
+    return "owner_id, month, categoria, transaction_type" if owner else "month, categoria, transaction_type"
+
+
+def apply_delta(owner: bool) -> str:
+    """Mesmo APPLY_DELTA de monthly_rollups, com ou sem o dono na chave"""
+    key = rollup_key(owner)
+    return f"""
+        INSERT INTO monthly_rollups ({key}, total, count)
+        SELECT {key}, SUM(total), SUM(count)
+        FROM delta
+        GROUP BY {key}
+        ORDER BY {key}
+        ON CONFLICT ({key}) DO UPDATE SET
+            total = monthly_rollups.total + EXCLUDED.total,
+            count = monthly_rollups.count + EXCLUDED.count;
+    """
+
+
+def row_delta(owner: bool, source: str, sign: str = "") -> str:
+    owner_column = "owner_id, " if owner else ""
+    return f"""
+        SELECT {owner_column}date_trunc('month', data)::date AS month, categoria, transaction_type,
+               {sign}valor AS total, {sign}1 AS count
+        FROM {source}
+    """
+
+
+def plan_installments(owner: bool, source: str, sign: str = "") -> str:
+    owner_column = "p.owner_id, " if owner else ""
+    return f"""
+        SELECT {owner_column}date_trunc('month', p.first_due_date + (g.n - 1) * interval '1 month')::date AS month,
+               p.categoria, p.transaction_type,
+               {sign} round(p.valor_total / p.parcelas, 2) AS total, {sign} 1 AS count
+        FROM {source} p
+        CROSS JOIN LATERAL generate_series(1, p.parcelas) AS g(n)
+    """
+
+
+def replace_rollup_functions(owner: bool) -> None:
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION rollup_transactions() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                WITH delta AS ({row_delta(owner, "new_rows")})
+                {apply_delta(owner)}
+            ELSIF TG_OP = 'DELETE' THEN
+                WITH delta AS ({row_delta(owner, "old_rows", "-")})
+                {apply_delta(owner)}
+            ELSE
+                WITH delta AS (
+                    {row_delta(owner, "new_rows")}
+                    UNION ALL
+                    {row_delta(owner, "old_rows", "-")}
+                )
+                {apply_delta(owner)}
+            END IF;
+            RETURN NULL;
+        END;
+        $$;
+    """)
+
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION rollup_installment_plans() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                WITH delta AS ({plan_installments(owner, "new_rows")})
+                {apply_delta(owner)}
+            ELSIF TG_OP = 'DELETE' THEN
+                WITH delta AS ({plan_installments(owner, "old_rows", "-")})
+                {apply_delta(owner)}
+            ELSE
+                WITH delta AS (
+                    {plan_installments(owner, "new_rows")}
+                    UNION ALL
+                    {plan_installments(owner, "old_rows", "-")}
+                )
+                {apply_delta(owner)}
+            END IF;
+            RETURN NULL;
+        END;
+        $$;
+    """)
+
+    # O arquivamento de partições desconta o mês do rollup com a mesma chave
+    key = rollup_key(owner)
+    match = " AND ".join(f"r.{column} = d.{column}" for column in key.split(", "))
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION detach_transaction_partition(month DATE) RETURNS TEXT
+        LANGUAGE plpgsql AS $$
+        DECLARE
+            partition_name TEXT := 'transactions_' || to_char(month, 'YYYY_MM');
+        BEGIN
+            IF to_regclass(partition_name) IS NULL THEN
+                RETURN NULL;
+            END IF;
+
+            EXECUTE format('ALTER TABLE transactions DETACH PARTITION %I', partition_name);
+            EXECUTE format($q$
+                WITH delta AS ({row_delta(owner, "%I")})
+                UPDATE monthly_rollups r
+                SET total = r.total - d.total, count = r.count - d.count
+                FROM (
+                    SELECT {key}, SUM(total) AS total, SUM(count) AS count
+                    FROM delta
+                    GROUP BY {key}
+                ) d
+                WHERE {match}
+            $q$, partition_name);
+            RETURN partition_name;
+        END;
+        $$;
+    """)
+
+
+def replace_ledger(owner: bool) -> None:
+    owner_column = "owner_id BIGINT," if owner else ""
+    transaction_owner = "t.owner_id," if owner else ""
+    plan_owner = "p.owner_id," if owner else ""
+    op.execute("DROP FUNCTION IF EXISTS ledger(DATE, DATE);")
+    op.execute(f"""
+        CREATE FUNCTION ledger(start_date DATE, end_date DATE)
+        RETURNS TABLE (
+            {owner_column}
+            id INTEGER,
+            item VARCHAR,
+            valor NUMERIC,
+            data DATE,
+            categoria VARCHAR,
+            transaction_type VARCHAR,
+            descricao TEXT,
+            created_at TIMESTAMP,
+            updated_at TIMESTAMP
+        )
+        LANGUAGE sql STABLE
+        AS $$
+            SELECT {transaction_owner} t.id, t.item, t.valor, t.data, t.categoria, t.transaction_type,
+                   t.descricao, t.created_at, t.updated_at
+            FROM transactions t
+            WHERE t.data BETWEEN start_date AND end_date
+            UNION ALL
+            SELECT {plan_owner} p.id, p.item, i.valor, i.data, p.categoria, p.transaction_type,
+                   p.descricao || ' (Parcela ' || g.n || '/' || p.parcelas || ')',
+                   p.created_at, p.updated_at
+            FROM installment_plans p
+            CROSS JOIN LATERAL generate_series(1, p.parcelas) AS g(n)
+            CROSS JOIN LATERAL (
+                SELECT round(p.valor_total / p.parcelas, 2) AS valor,
+                       (p.first_due_date + (g.n - 1) * interval '1 month')::date AS data
+            ) i
+            WHERE p.first_due_date <= end_date
+              AND p.last_due_date >= start_date
+              AND i.data BETWEEN start_date AND end_date
+        $$;
+    """)
+
+
+def upgrade() -> None:
+    # Dono do ledger: o chat do Telegram de onde veio o lançamento (0 = sem dono,
+    # ex: importação em lote pela API). Default constante não reescreve as tabelas
+    for table in ("transactions", "installment_plans", "monthly_rollups"):
+        op.execute(f"ALTER TABLE {table} ADD COLUMN owner_id BIGINT NOT NULL DEFAULT 0;")
+
+    op.execute("ALTER TABLE monthly_rollups DROP CONSTRAINT monthly_rollups_pkey;")
+    op.execute(f"ALTER TABLE monthly_rollups ADD PRIMARY KEY ({rollup_key(True)});")
+    replace_rollup_functions(owner=True)
+
+    # Com os triggers já cientes do dono, o UPDATE move os totais do dono 0 para cada chat
+    for table in ("transactions", "installment_plans"):
+        op.execute(f"""
+            UPDATE {table} SET owner_id = source_chat_id
+            WHERE source_chat_id IS NOT NULL;
+        """)
+
+    replace_ledger(owner=True)
+
+    # Consultas por dono leem só o trecho do índice daquele dono (e das partições do período)
+    op.execute("""
+        CREATE INDEX idx_transactions_owner_keyset
+        ON transactions (owner_id, data DESC, created_at DESC, id DESC);
+    """)
+    op.execute("""
+        CREATE INDEX idx_installment_plans_owner_due
+        ON installment_plans (owner_id, first_due_date, last_due_date);
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_installment_plans_owner_due;")
+    op.execute("DROP INDEX IF EXISTS idx_transactions_owner_keyset;")
+    replace_ledger(owner=False)
+
+    # Os totais por dono são somados de volta em uma linha por (mês, categoria, tipo)
+    op.execute(f"""
+        CREATE TEMP TABLE rollups_without_owner ON COMMIT DROP AS
+        SELECT {rollup_key(False)}, SUM(total) AS total, SUM(count) AS count
+        FROM monthly_rollups
+        GROUP BY {rollup_key(False)};
+    """)
+    op.execute("TRUNCATE monthly_rollups;")
+    op.execute("ALTER TABLE monthly_rollups DROP CONSTRAINT monthly_rollups_pkey;")
+    op.execute("ALTER TABLE monthly_rollups DROP COLUMN owner_id;")
+    op.execute(f"ALTER TABLE monthly_rollups ADD PRIMARY KEY ({rollup_key(False)});")
+    op.execute(f"""
+        INSERT INTO monthly_rollups ({rollup_key(False)}, total, count)
+        SELECT {rollup_key(False)}, total, count FROM rollups_without_owner;
+    """)
+
+    replace_rollup_functions(owner=False)
+    for table in ("transactions", "installment_plans"):
+        op.execute(f"ALTER TABLE {table} DROP COLUMN owner_id;")
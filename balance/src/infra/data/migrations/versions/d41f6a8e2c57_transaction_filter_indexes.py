@@ -0,0 +1,49 @@
+"""transaction_filter_indexes
+
+Revision ID: d41f6a8e2c57
+Revises: 5b7e1c3d9f20
+Create Date: 2026-10-18 16:05:12.440918
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd41f6a8e2c57'
+down_revision: Union[str, Sequence[str], None] = '5b7e1c3d9f20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Um índice parcial por tipo, na ordem da paginação: listar só receitas (ou só
+    # despesas) do período não percorre as linhas do outro tipo
+    for transaction_type in ("income", "expense"):
+        op.execute(f"""
+            CREATE INDEX idx_transactions_{transaction_type}_keyset
+            ON transactions(data DESC, created_at DESC, id DESC, valor)
+            WHERE transaction_type = '{transaction_type}';
+        """)
+
+    # Filtro por categoria dentro do período; substitui o índice só de categoria
+    op.execute("""
+        CREATE INDEX idx_transactions_categoria_data
+        ON transactions(categoria, data DESC, created_at DESC, id DESC);
+    """)
+    op.execute("DROP INDEX IF EXISTS idx_transactions_categoria;")
+
+    op.execute("""
+        CREATE INDEX idx_installment_plans_type_due
+        ON installment_plans(transaction_type, categoria, first_due_date, last_due_date);
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_installment_plans_type_due;")
+    op.execute("CREATE INDEX idx_transactions_categoria ON transactions(categoria);")
+    op.execute("DROP INDEX IF EXISTS idx_transactions_categoria_data;")
+    op.execute("DROP INDEX IF EXISTS idx_transactions_expense_keyset;")
+    op.execute("DROP INDEX IF EXISTS idx_transactions_income_keyset;")
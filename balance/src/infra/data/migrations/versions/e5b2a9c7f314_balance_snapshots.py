@@ -0,0 +1,67 @@
+"""balance_snapshots
+
+Revision ID: e5b2a9c7f314
+Revises: c1f8e4a2d736
+Create Date: 2026-10-18 21:48:09.336174
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b2a9c7f314'
+down_revision: Union[str, Sequence[str], None] = 'c1f8e4a2d736'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Saldo de abertura (antes do dia 1º) de cada mês por dono, calculado a partir de
+    # monthly_rollups pelo comando `snapshots` da CLI
+    op.execute("""
+        CREATE TABLE balance_snapshots (
+            owner_id BIGINT NOT NULL,
+            month DATE NOT NULL,
+            opening_balance NUMERIC(14,2) NOT NULL,
+            computed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (owner_id, month)
+        );
+    """)
+
+    # Escrita em um mês muda a abertura de todos os meses seguintes do dono: esses
+    # snapshots são removidos e o saldo volta a partir do snapshot válido anterior
+    op.execute("""
+        CREATE FUNCTION expire_balance_snapshots() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            DELETE FROM balance_snapshots s
+            USING (
+                SELECT owner_id, MIN(month) AS month FROM changed_rows GROUP BY owner_id
+            ) c
+            WHERE s.owner_id = c.owner_id
+              AND s.month > c.month;
+            RETURN NULL;
+        END;
+        $$;
+    """)
+
+    op.execute("""
+        CREATE TRIGGER monthly_rollups_expire_insert AFTER INSERT ON monthly_rollups
+        REFERENCING NEW TABLE AS changed_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION expire_balance_snapshots();
+    """)
+    op.execute("""
+        CREATE TRIGGER monthly_rollups_expire_update AFTER UPDATE ON monthly_rollups
+        REFERENCING NEW TABLE AS changed_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION expire_balance_snapshots();
+    """)
+
+
+def downgrade() -> None:
+    for event in ("insert", "update"):
+        op.execute(f"DROP TRIGGER IF EXISTS monthly_rollups_expire_{event} ON monthly_rollups;")
+    op.execute("DROP FUNCTION IF EXISTS expire_balance_snapshots();")
+    op.execute("DROP TABLE IF EXISTS balance_snapshots;")
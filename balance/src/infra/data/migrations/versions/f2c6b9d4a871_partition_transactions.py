@@ -0,0 +1,253 @@
+"""partition_transactions
+
+Revision ID: f2c6b9d4a871
+Revises: b93c5e7a1d48
+Create Date: 2026-10-18 19:05:12.481907
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2c6b9d4a871'
+down_revision: Union[str, Sequence[str], None] = 'b93c5e7a1d48'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+COLUMNS = (
+    "id, item, valor, data, categoria, transaction_type, descricao, created_at, updated_at, "
+    "source_chat_id, source_message_id, source_seq"
+)
+
+# Partições futuras criadas já na migration (depois disso, o comando `partitions` da CLI)
+MONTHS_AHEAD = 12
+
+
+INDEXES = (
+    "transactions_pkey", "uq_transactions_source", "idx_transactions_keyset",
+    "idx_transactions_income_keyset", "idx_transactions_expense_keyset",
+    "idx_transactions_categoria_data",
+)
+
+
+def temporary_name(index: str, table: str) -> str:
+    return index.replace("transactions", table, 1)
+
+
+def create_indexes(table: str, unique_source: str) -> None:
+    """Índices de transactions criados na tabela nova, ainda com o nome temporário"""
+    op.execute(f"""
+        CREATE UNIQUE INDEX {temporary_name("uq_transactions_source", table)}
+        ON {table} ({unique_source});
+    """)
+    op.execute(f"""
+        CREATE INDEX {temporary_name("idx_transactions_keyset", table)}
+        ON {table} (data DESC, created_at DESC, id DESC);
+    """)
+    for transaction_type in ("income", "expense"):
+        op.execute(f"""
+            CREATE INDEX {temporary_name(f"idx_transactions_{transaction_type}_keyset", table)}
+            ON {table} (data DESC, created_at DESC, id DESC, valor)
+            WHERE transaction_type = '{transaction_type}';
+        """)
+    op.execute(f"""
+        CREATE INDEX {temporary_name("idx_transactions_categoria_data", table)}
+        ON {table} (categoria, data DESC, created_at DESC, id DESC);
+    """)
+
+
+def swap_tables(table: str, old_table: str) -> None:
+    """
+    Troca final: a tabela nova assume o nome transactions e os nomes dos índices.
+    Só aqui é pedido ACCESS EXCLUSIVE, por poucos catálogos alterados
+    """
+    op.execute("ALTER SEQUENCE transactions_id_seq OWNED BY NONE;")
+    op.execute(f"ALTER TABLE transactions RENAME TO {old_table};")
+    op.execute(f"ALTER TABLE {table} RENAME TO transactions;")
+    op.execute(f"DROP TABLE {old_table};")
+    # Renomear o índice da PK renomeia também a constraint
+    for index in INDEXES:
+        op.execute(f"ALTER INDEX {temporary_name(index, table)} RENAME TO {index};")
+    op.execute("ALTER SEQUENCE transactions_id_seq OWNED BY transactions.id;")
+
+
+def create_rollup_triggers() -> None:
+    # Em tabela particionada os triggers por statement ficam no pai e enxergam as linhas
+    # de todas as partições nas transition tables
+    op.execute("""
+        CREATE TRIGGER transactions_rollup_insert AFTER INSERT ON transactions
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION rollup_transactions();
+    """)
+    op.execute("""
+        CREATE TRIGGER transactions_rollup_update AFTER UPDATE ON transactions
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION rollup_transactions();
+    """)
+    op.execute("""
+        CREATE TRIGGER transactions_rollup_delete AFTER DELETE ON transactions
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION rollup_transactions();
+    """)
+
+
+def upgrade() -> None:
+    # SHARE bloqueia só escritas: as leituras continuam em transactions durante a cópia
+    # (o webhook segue aceitando mensagens, que ficam no stream de ingestão até o worker
+    # gravar). A tabela particionada é montada ao lado, com nome temporário
+    op.execute("LOCK TABLE transactions IN SHARE MODE;")
+
+    # Uma partição por mês de `data`: consultas de período (ledger, keyset, rollup das pontas)
+    # só leem as partições do intervalo. A chave de partição entra na PK e nos índices únicos
+    op.execute("""
+        CREATE TABLE transactions_partitioned (
+            id INTEGER NOT NULL DEFAULT nextval('transactions_id_seq'),
+            item VARCHAR(255) NOT NULL,
+            valor DECIMAL(10,2) NOT NULL,
+            data DATE NOT NULL,
+            categoria VARCHAR(100) NOT NULL,
+            transaction_type VARCHAR(50) NOT NULL DEFAULT 'expense',
+            descricao TEXT NOT NULL,
+            created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            source_chat_id BIGINT,
+            source_message_id BIGINT,
+            source_seq SMALLINT,
+            CONSTRAINT transactions_partitioned_pkey PRIMARY KEY (id, data)
+        ) PARTITION BY RANGE (data);
+    """)
+    # Datas fora dos meses já criados (ex: lançamento muito no futuro) não falham o INSERT
+    op.execute("CREATE TABLE transactions_default PARTITION OF transactions_partitioned DEFAULT;")
+
+    # Meses com dados + os próximos MONTHS_AHEAD meses, já com o nome final de cada partição
+    op.execute(f"""
+        DO $$
+        DECLARE
+            month DATE;
+        BEGIN
+            FOR month IN
+                SELECT date_trunc('month', data)::date FROM transactions
+                UNION
+                SELECT generate_series(
+                    date_trunc('month', CURRENT_DATE),
+                    date_trunc('month', CURRENT_DATE) + interval '{MONTHS_AHEAD} months',
+                    interval '1 month'
+                )::date
+                ORDER BY 1
+            LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF transactions_partitioned FOR VALUES FROM (%L) TO (%L)',
+                    'transactions_' || to_char(month, 'YYYY_MM'), month, (month + interval '1 month')::date
+                );
+            END LOOP;
+        END;
+        $$;
+    """)
+
+    # A tabela nova ainda não tem os triggers de rollup: a cópia não conta em dobro
+    op.execute(f"""
+        INSERT INTO transactions_partitioned ({COLUMNS})
+        SELECT {COLUMNS} FROM transactions;
+    """)
+    create_indexes("transactions_partitioned", "source_chat_id, source_message_id, source_seq, data")
+
+    swap_tables("transactions_partitioned", "transactions_unpartitioned")
+    create_rollup_triggers()
+
+    # Cria a partição do mês; linhas do mês que caíram na default são movidas para ela antes
+    # do ATTACH (sem passar pelos triggers do pai: o rollup já as contabilizou)
+    op.execute("""
+        CREATE FUNCTION create_transaction_partition(month DATE) RETURNS BOOLEAN
+        LANGUAGE plpgsql AS $$
+        DECLARE
+            first_day DATE := date_trunc('month', month)::date;
+            next_month DATE := (date_trunc('month', month) + interval '1 month')::date;
+            partition_name TEXT := 'transactions_' || to_char(month, 'YYYY_MM');
+        BEGIN
+            IF to_regclass(partition_name) IS NOT NULL THEN
+                RETURN FALSE;
+            END IF;
+
+            EXECUTE format('CREATE TABLE %I (LIKE transactions INCLUDING DEFAULTS)', partition_name);
+            EXECUTE format(
+                'WITH moved AS (DELETE FROM transactions_default WHERE data >= %L AND data < %L RETURNING *) '
+                'INSERT INTO %I SELECT * FROM moved',
+                first_day, next_month, partition_name
+            );
+            EXECUTE format(
+                'ALTER TABLE transactions ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+                partition_name, first_day, next_month
+            );
+            RETURN TRUE;
+        END;
+        $$;
+    """)
+
+    # Arquivamento: a partição sai do ledger (vira uma tabela comum, pronta para dump/DROP)
+    # e o rollup desconta o mês na mesma transação, já que o DETACH não dispara triggers
+    op.execute("""
+        CREATE FUNCTION detach_transaction_partition(month DATE) RETURNS TEXT
+        LANGUAGE plpgsql AS $$
+        DECLARE
+            partition_name TEXT := 'transactions_' || to_char(month, 'YYYY_MM');
+        BEGIN
+            IF to_regclass(partition_name) IS NULL THEN
+                RETURN NULL;
+            END IF;
+
+            EXECUTE format('ALTER TABLE transactions DETACH PARTITION %I', partition_name);
+            EXECUTE format($q$
+                WITH delta AS (
+                    SELECT date_trunc('month', data)::date AS month, categoria, transaction_type,
+                           SUM(valor) AS total, COUNT(*) AS count
+                    FROM %I
+                    GROUP BY 1, 2, 3
+                )
+                UPDATE monthly_rollups r
+                SET total = r.total - d.total, count = r.count - d.count
+                FROM delta d
+                WHERE r.month = d.month
+                  AND r.categoria = d.categoria
+                  AND r.transaction_type = d.transaction_type
+            $q$, partition_name);
+            RETURN partition_name;
+        END;
+        $$;
+    """)
+
+
+def downgrade() -> None:
+    # Mesma troca no sentido inverso: cópia sob SHARE e renomeação só no final
+    op.execute("LOCK TABLE transactions IN SHARE MODE;")
+    op.execute("""
+        CREATE TABLE transactions_unpartitioned (
+            id INTEGER DEFAULT nextval('transactions_id_seq'),
+            item VARCHAR(255) NOT NULL,
+            valor DECIMAL(10,2) NOT NULL,
+            data DATE NOT NULL,
+            categoria VARCHAR(100) NOT NULL,
+            transaction_type VARCHAR(50) NOT NULL DEFAULT 'expense',
+            descricao TEXT NOT NULL,
+            created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            source_chat_id BIGINT,
+            source_message_id BIGINT,
+            source_seq SMALLINT,
+            CONSTRAINT transactions_unpartitioned_pkey PRIMARY KEY (id)
+        );
+    """)
+    op.execute(f"""
+        INSERT INTO transactions_unpartitioned ({COLUMNS})
+        SELECT {COLUMNS} FROM transactions;
+    """)
+    create_indexes("transactions_unpartitioned", "source_chat_id, source_message_id, source_seq")
+
+    # Remove o pai e todas as partições ainda anexadas (as desanexadas ficam como estão)
+    swap_tables("transactions_unpartitioned", "transactions_partitioned")
+    op.execute("DROP FUNCTION IF EXISTS detach_transaction_partition(DATE);")
+    op.execute("DROP FUNCTION IF EXISTS create_transaction_partition(DATE);")
+    create_rollup_triggers()
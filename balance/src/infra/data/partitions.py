@@ -0,0 +1,66 @@
+import asyncpg
+from datetime import date
+from typing import List
+from ..core.logger import logger
+
+# Partições mensais de `transactions` (ver migration partition_transactions): o nome de cada
+# partição é transactions_YYYY_MM e a criação/desanexação ficam em funções SQL
+ATTACHED_PARTITIONS = r"""
+    SELECT c.relname
+    FROM pg_inherits i
+    JOIN pg_class c ON c.oid = i.inhrelid
+    WHERE i.inhparent = 'transactions'::regclass
+      AND c.relname ~ '^transactions_\d{4}_\d{2}$'
+    ORDER BY c.relname
+"""
+
+# Meses com linhas na partição default (datas de antes de existir uma partição para elas)
+DEFAULT_PARTITION_MONTHS = """
+    SELECT DISTINCT date_trunc('month', data)::date AS month
+    FROM transactions_default
+    ORDER BY month
+"""
+
+def add_months(day: date, months: int) -> date:
+    """Primeiro dia do mês `months` meses depois do mês de `day`"""
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+def partition_month(name: str) -> date:
+    """transactions_2024_03 -> 2024-03-01"""
+    year, month = name.rsplit("_", 2)[1:]
+    return date(int(year), int(month), 1)
+
+async def ensure_partitions(pool: asyncpg.Pool, months_ahead: int, today: date = None) -> List[date]:
+    """
+    Cria as partições que ainda não existem: dos meses com linhas na default (que são
+    movidas para a partição nova) e do mês atual e dos próximos `months_ahead` meses
+    """
+    today = today or date.today()
+    stranded = [row["month"] for row in await pool.fetch(DEFAULT_PARTITION_MONTHS)]
+    ahead = [add_months(today, offset) for offset in range(months_ahead + 1)]
+
+    created = []
+    for month in sorted(set(stranded + ahead)):
+        if await pool.fetchval("SELECT create_transaction_partition($1)", month):
+            created.append(month)
+
+    if created:
+        logger.info(f"🧱 {len(created)} partições de transactions criadas (até {created[-1]:%Y-%m})")
+    return created
+
+async def detach_partitions_before(pool: asyncpg.Pool, month: date) -> List[str]:
+    """
+    Desanexa as partições de meses anteriores a `month`. Cada uma em sua própria transação:
+    a tabela desanexada continua no banco para dump/DROP e o rollup deixa de contá-la
+    """
+    rows = await pool.fetch(ATTACHED_PARTITIONS)
+    detached = []
+    for row in rows:
+        if partition_month(row["relname"]) >= month:
+            continue
+        name = await pool.fetchval("SELECT detach_transaction_partition($1)", partition_month(row["relname"]))
+        if name:
+            detached.append(name)
+            logger.info(f"📦 Partição {name} desanexada")
+    return detached
@@ -0,0 +1,31 @@
+import redis.asyncio as redis
+from ..core.config import settings
+from ..core.logger import logger
+
+class RedisClient:
+    def __init__(self):
+        self.client: redis.Redis = None
+
+    async def connect(self):
+        """Conecta ao Redis"""
+        try:
+            self.client = redis.from_url(settings.REDIS_URL, decode_responses=True)
+            await self.client.ping()
+            logger.info("✅ Conectado ao Redis")
+
+        except Exception as e:
+            logger.error(f"❌ Erro ao conectar ao Redis: {str(e)}")
+            raise
+
+    async def disconnect(self):
+        """Desconecta do Redis"""
+        if self.client:
+            await self.client.aclose()
+            logger.info("❌ Desconectado do Redis")
+
+# Instância global do Redis
+redis_client = RedisClient()
+
+async def get_redis() -> redis.Redis:
+    """Dependency para obter o cliente Redis"""
+    return redis_client.client
@@ -1,54 +1,658 @@
 import asyncpg
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple, AsyncIterator
 from decimal import Decimal
-from datetime import datetime
+from datetime import date, datetime, timedelta
 from ....domain.interfaces.repositories.itransaction_repository import ITransactionRepository
+from ....domain.models.installment_plan import InstallmentPlan, InstallmentPlanCreate, add_months
+from ....domain.models.period_summary import PeriodSummary
+from ....domain.models.transaction_filter import TransactionFilter
 from ....domain.models.transaction import Transaction, TransactionCreate
+from ....infra.core.config import settings
 from ....infra.core.logger import logger
+from ....infra.core.metrics import track_query
+from ....infra.services.response_cache import ResponseCache, months_between
+from ..statements import acquire, run, run_sql, PERIOD_COLUMNS, SLIM_PERIOD_COLUMNS, TRANSACTION_COLUMNS
 
 class TransactionRepository(ITransactionRepository):
-    def __init__(self, db_pool: asyncpg.Pool):
+    def __init__(
+        self,
+        db_pool: asyncpg.Pool,
+        cache: Optional[ResponseCache] = None,
+        read_pool: Optional[asyncpg.Pool] = None,
+    ):
         self.db = db_pool
+        self.cache = cache
+        # Listagens e totais podem vir de uma réplica; escritas sempre no primário
+        self.read_db = read_pool or db_pool
     
-    async def create(self, transaction: TransactionCreate) -> Optional[Transaction]:
-        """Cria uma nova transação (Gasto)"""
-        try:
-            row = await self.db.fetchrow("""
-                INSERT INTO transactions (
-                    item, valor, data, categoria, transaction_type, descricao
-                ) VALUES ($1, $2, $3, $4, $5, $6)
-                RETURNING *
-            """,
+    async def create(self, transaction: TransactionCreate, owner_id: int = 0) -> Optional[Transaction]:
+        """Cria uma nova transação (Gasto) no ledger de `owner_id`"""
+        try:
+            row = await run(self.db, "fetchrow", "create_transaction",
                 transaction.item,
                 transaction.valor,
                 transaction.data,
                 transaction.categoria,
                 transaction.transaction_type,
-                transaction.descricao
+                transaction.descricao,
+                owner_id
             )
             
             logger.info(f"✅ Transação registrada [{transaction.transaction_type}]: {transaction.item} - R$ {transaction.valor}")
+            await self._invalidate([transaction])
             return Transaction(**dict(row)) if row else None
             
         except Exception as e:
             logger.error(f"Erro ao criar transação: {str(e)}")
             return None
 
+    async def create_many(self, transactions: List[TransactionCreate], owner_id: int = 0) -> List[Transaction]:
+        """Cria várias transações (ex: parcelas) em um único INSERT atômico"""
+        if not transactions:
+            return []
+
+        try:
+            rows = await run(self.db, "fetch", "create_transactions", *self._as_arrays(transactions), owner_id)
+
+            logger.info(f"✅ {len(rows)} transações registradas em lote")
+            await self._invalidate(transactions)
+            return [Transaction(**dict(row)) for row in rows]
+
+        except Exception as e:
+            logger.error(f"Erro ao criar transações em lote: {str(e)}")
+            return []
+
+    async def copy_many(self, transactions: List[TransactionCreate], owner_id: int = 0) -> int:
+        """Carrega as transações pelo protocolo COPY (bem mais rápido que INSERT para milhares de linhas)"""
+        if not transactions:
+            return 0
+
+        try:
+            with track_query("copy_transactions"):
+                await self.db.copy_records_to_table(
+                    "transactions",
+                    records=[
+                        (t.item, t.valor, t.data, t.categoria, t.transaction_type, t.descricao, owner_id)
+                        for t in transactions
+                    ],
+                    columns=["item", "valor", "data", "categoria", "transaction_type", "descricao", "owner_id"],
+                )
+
+            logger.info(f"✅ {len(transactions)} transações carregadas via COPY")
+            await self._invalidate(transactions)
+            return len(transactions)
+
+        except Exception as e:
+            logger.error(f"Erro ao carregar transações via COPY: {str(e)}")
+            return 0
+
+    async def upsert_by_source(
+        self,
+        chat_id: int,
+        message_id: int,
+        transactions: List[TransactionCreate],
+    ) -> List[Transaction]:
+        """Grava as transações de uma mensagem do Telegram, atualizando as já existentes"""
+        if not transactions:
+            return []
+
+        try:
+            previous = await self._source_months(chat_id, message_id)
+
+            rows = await run(
+                self.db, "fetch", "upsert_transactions_by_source",
+                *self._as_arrays(transactions), chat_id, message_id, len(transactions)
+            )
+
+            logger.info(f"✅ {len(rows)} transações gravadas para a mensagem {chat_id}/{message_id}")
+            await self._invalidate(transactions, extra_months=previous)
+            return [Transaction(**dict(row)) for row in rows]
+
+        except Exception as e:
+            logger.error(f"Erro ao gravar transações da mensagem {chat_id}/{message_id}: {str(e)}")
+            return []
+
+    async def create_plan(self, plan: InstallmentPlanCreate, owner_id: int = 0) -> Optional[InstallmentPlan]:
+        """Cria um plano de parcelas (uma linha, independente do número de parcelas)"""
+        try:
+            row = await run(self.db, "fetchrow", "create_plan", *self._plan_values(plan), owner_id)
+
+            logger.info(f"✅ Plano registrado: {plan.item} - {plan.parcelas}x de R$ {plan.valor_total}")
+            await self._invalidate(plans=[plan])
+            return InstallmentPlan(**dict(row)) if row else None
+
+        except Exception as e:
+            logger.error(f"Erro ao criar plano de parcelas: {str(e)}")
+            return None
+
+    async def upsert_plan_by_source(
+        self,
+        chat_id: int,
+        message_id: int,
+        plan: InstallmentPlanCreate,
+    ) -> Optional[InstallmentPlan]:
+        """Grava o plano de parcelas de uma mensagem do Telegram, atualizando o existente"""
+        try:
+            previous = await self._source_months(chat_id, message_id)
+
+            row = await run(self.db, "fetchrow", "upsert_plan_by_source", *self._plan_values(plan), chat_id, message_id)
+
+            logger.info(f"✅ Plano gravado para a mensagem {chat_id}/{message_id}: {plan.parcelas}x")
+            await self._invalidate(plans=[plan], extra_months=previous)
+            return InstallmentPlan(**dict(row)) if row else None
+
+        except Exception as e:
+            logger.error(f"Erro ao gravar plano da mensagem {chat_id}/{message_id}: {str(e)}")
+            return None
+
+    async def upsert_many_by_source(
+        self,
+        chat_id: int,
+        messages: Dict[int, List[TransactionCreate]],
+    ) -> List[Transaction]:
+        """Grava as transações de várias mensagens de um chat em um único INSERT"""
+        if not messages:
+            return []
+
+        transactions = [t for items in messages.values() for t in items]
+        message_ids = [message_id for message_id, items in messages.items() for _ in items]
+        seqs = [seq for items in messages.values() for seq in range(1, len(items) + 1)]
+
+        try:
+            rows = await run(
+                self.db, "fetch", "upsert_many_transactions_by_source",
+                *self._as_arrays(transactions), message_ids, seqs, chat_id
+            )
+
+            logger.info(f"✅ {len(rows)} transações gravadas para {len(messages)} mensagens do chat {chat_id}")
+            await self._invalidate(transactions)
+            return [Transaction(**dict(row)) for row in rows]
+
+        except Exception as e:
+            logger.error(f"Erro ao gravar transações em lote do chat {chat_id}: {str(e)}")
+            return []
+
+    async def upsert_plans_by_source(
+        self,
+        chat_id: int,
+        plans: Dict[int, InstallmentPlanCreate],
+    ) -> List[InstallmentPlan]:
+        """Grava os planos de parcelas de várias mensagens de um chat em um único INSERT"""
+        if not plans:
+            return []
+
+        # Um array por coluna, na ordem de _plan_values
+        columns = [list(column) for column in zip(*(self._plan_values(p) for p in plans.values()))]
+
+        try:
+            rows = await run(self.db, "fetch", "upsert_plans_by_source", *columns, list(plans.keys()), chat_id)
+
+            logger.info(f"✅ {len(rows)} planos de parcelas gravados para o chat {chat_id}")
+            await self._invalidate(plans=list(plans.values()))
+            return [InstallmentPlan(**dict(row)) for row in rows]
+
+        except Exception as e:
+            logger.error(f"Erro ao gravar planos em lote do chat {chat_id}: {str(e)}")
+            return []
+
+    async def _source_months(self, chat_id: int, message_id: int) -> List[str]:
+        """Meses em que a mensagem já tem lançamentos (uma edição pode mudar a data)"""
+        if not self.cache:
+            return []
+
+        rows = await run(self.db, "fetch", "source_months", chat_id, message_id)
+        return [month for row in rows for month in months_between(row["first_day"], row["last_day"])]
+
+    async def _invalidate(
+        self,
+        transactions: List[TransactionCreate] = (),
+        plans: List[InstallmentPlanCreate] = (),
+        extra_months: List[str] = (),
+    ):
+        """Invalida as respostas em cache dos meses tocados pela escrita"""
+        if not self.cache:
+            return
+
+        months = set(extra_months)
+        months.update(t.data.strftime("%Y-%m") for t in transactions)
+        for plan in plans:
+            months.update(months_between(plan.first_due_date, plan.last_due_date))
+        await self.cache.invalidate(months)
+
+    def _plan_values(self, plan: InstallmentPlanCreate) -> List[Any]:
+        return [
+            plan.item,
+            plan.valor_total,
+            plan.parcelas,
+            plan.data_compra,
+            plan.first_due_date,
+            plan.last_due_date,
+            plan.cutoff_day,
+            plan.categoria,
+            plan.transaction_type,
+            plan.descricao,
+        ]
+
+    def _as_arrays(self, transactions: List[TransactionCreate]) -> List[List[Any]]:
+        """Transforma as transações em um array por coluna (parâmetros do unnest)"""
+        return [
+            [t.item for t in transactions],
+            [t.valor for t in transactions],
+            [t.data for t in transactions],
+            [t.categoria for t in transactions],
+            [t.transaction_type for t in transactions],
+            [t.descricao for t in transactions],
+        ]
+
     async def list_by_period(
         self,
         start_date: datetime,
         end_date: datetime,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[date, datetime, int]] = None,
+        filters: Optional[TransactionFilter] = None,
     ) -> List[Transaction]:
-        """Lista transações por período"""
+        """
+        Lista transações por período (parcelas dos planos geradas pela função ledger),
+        em páginas de `limit` linhas a partir da chave (data, created_at, id) `after`
+        """
+        query, args = self._period_query(TRANSACTION_COLUMNS, start_date, end_date, limit, after, filters)
+
         try:
-            rows = await self.db.fetch("""
-                SELECT * FROM transactions
-                WHERE data BETWEEN $1 AND $2
-                ORDER BY data DESC, created_at DESC
-            """, start_date, end_date)
+            with track_query("list_by_period"):
+                rows = await run_sql(self.read_db, "fetch", query, *args)
 
             return [Transaction(**dict(row)) for row in rows]
 
         except Exception as e:
             logger.error(f"Erro ao listar transações por período: {str(e)}")
             return []
+
+    async def list_by_period_rows(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[date, datetime, int]] = None,
+        filters: Optional[TransactionFilter] = None,
+        slim: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """
+        Mesma consulta de list_by_period, mas só com as colunas da resposta e sem
+        construir modelos: as linhas vão direto para a serialização JSON.
+        Com `slim`, sem a descricao (mensagem original)
+        """
+        columns = SLIM_PERIOD_COLUMNS if slim else PERIOD_COLUMNS
+        query, args = self._period_query(columns, start_date, end_date, limit, after, filters)
+
+        try:
+            with track_query("list_by_period_rows"):
+                rows = await run_sql(self.read_db, "fetch", query, *args)
+
+            return [dict(row) for row in rows]
+
+        except Exception as e:
+            logger.error(f"Erro ao listar transações por período: {str(e)}")
+            return []
+
+    async def iter_by_period(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        filters: Optional[TransactionFilter] = None,
+        prefetch: int = settings.EXPORT_CURSOR_PREFETCH,
+    ) -> AsyncIterator[asyncpg.Record]:
+        """
+        Percorre o período inteiro em ordem cronológica por um cursor no servidor
+        (dentro de uma transação), trazendo `prefetch` linhas por ida ao banco
+        """
+        query, args = self._period_query(PERIOD_COLUMNS, start_date, end_date, None, None, filters, order="ASC")
+
+        try:
+            with track_query("iter_by_period"):
+                async with acquire(self.read_db) as conn:
+                    async with conn.transaction(readonly=True):
+                        async for row in conn.cursor(query, *args, prefetch=prefetch):
+                            yield row
+
+        except Exception as e:
+            # A resposta já pode ter começado: interrompe o stream em vez de truncar em silêncio
+            logger.error(f"Erro ao exportar transações por período: {str(e)}")
+            raise
+
+    def _period_query(
+        self,
+        columns: str,
+        start_date: datetime,
+        end_date: datetime,
+        limit: Optional[int],
+        after: Optional[Tuple[date, datetime, int]],
+        filters: Optional[TransactionFilter],
+        order: str = "DESC",
+    ) -> Tuple[str, List[Any]]:
+        args: List[Any] = [start_date, end_date]
+        conditions = self._filter_conditions(filters, args)
+        if after:
+            # Comparação de tupla na ordem do índice idx_transactions_keyset
+            args.extend(after)
+            conditions.append(f"(data, created_at, id) < (${len(args) - 2}, ${len(args) - 1}, ${len(args)})")
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        page = ""
+        if limit:
+            args.append(limit)
+            page = f"LIMIT ${len(args)}"
+
+        query = f"""
+            SELECT {columns} FROM ledger($1, $2)
+            {where}
+            ORDER BY data {order}, created_at {order}, id {order}
+            {page}
+        """
+        return query, args
+
+    async def summarize_period(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        filters: Optional[TransactionFilter] = None,
+    ) -> Optional[PeriodSummary]:
+        """
+        Totais do período com SUM condicional: meses completos vêm de monthly_rollups
+        e só os dias das pontas são somados a partir do ledger
+        """
+        start, end = self._as_date(start_date), self._as_date(end_date)
+        args: List[Any] = [start, end]
+        conditions = self._filter_conditions(filters, args)
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        # Faixa de valor é por transação: o rollup não tem como aplicá-la
+        if filters and (filters.min_valor is not None or filters.max_valor is not None):
+            parts = f"SELECT transaction_type, valor, 1 AS count FROM ledger($1, $2) {where}"
+        else:
+            first_month, end_month = self._full_months(start, end)
+            args.extend([first_month, end_month, first_month - timedelta(days=1)])
+            first, after_last, head_end = f"${len(args) - 2}", f"${len(args) - 1}", f"${len(args)}"
+            and_filters = "".join(f" AND {c}" for c in conditions)
+            parts = f"""
+                SELECT transaction_type, total AS valor, count
+                FROM monthly_rollups
+                WHERE month >= {first} AND month < {after_last} {and_filters}
+                UNION ALL
+                SELECT transaction_type, valor, 1 FROM ledger($1, {head_end}::date) {where}
+                UNION ALL
+                SELECT transaction_type, valor, 1 FROM ledger({after_last}::date, $2) {where}
+            """
+
+        query = f"""
+            SELECT income, expense, income - expense AS net, count
+            FROM (
+                SELECT COALESCE(SUM(valor) FILTER (WHERE transaction_type = 'income'), 0) AS income,
+                       COALESCE(SUM(valor) FILTER (WHERE transaction_type <> 'income'), 0) AS expense,
+                       COALESCE(SUM(count), 0)::bigint AS count
+                FROM ({parts}) parts
+            ) totals
+        """
+
+        try:
+            with track_query("summarize_period"):
+                row = await run_sql(self.read_db, "fetchrow", query, *args)
+
+            return PeriodSummary(**dict(row))
+
+        except Exception as e:
+            logger.error(f"Erro ao totalizar transações do período: {str(e)}")
+            return None
+
+    async def search_rows(
+        self,
+        text: str,
+        start_date: datetime,
+        end_date: datetime,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[float, date, datetime, int]] = None,
+        filters: Optional[TransactionFilter] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Transações do período que casam com `text` no item (trigramas) ou na descricao
+        (full-text), da mais relevante para a menos, em páginas a partir da chave
+        (rank, data, created_at, id) `after`
+        """
+        args: List[Any] = [start_date, end_date]
+        conditions = self._search_conditions(text, args) + self._filter_conditions(filters, args)
+
+        page_conditions = []
+        if after:
+            args.extend(after)
+            page_conditions.append(
+                f"(rank, data, created_at, id) < (${len(args) - 3}, ${len(args) - 2}, ${len(args) - 1}, ${len(args)})"
+            )
+        page_where = f"WHERE {' AND '.join(page_conditions)}" if page_conditions else ""
+
+        page = ""
+        if limit:
+            args.append(limit)
+            page = f"LIMIT ${len(args)}"
+
+        # O rank é calculado só para as linhas que os índices GIN trouxeram
+        query = f"""
+            SELECT * FROM (
+                SELECT {PERIOD_COLUMNS},
+                       GREATEST(
+                           word_similarity($3, item),
+                           ts_rank(to_tsvector('portuguese', descricao), websearch_to_tsquery('portuguese', $3))
+                       )::float8 AS rank
+                FROM ledger($1, $2)
+                WHERE {' AND '.join(conditions)}
+            ) matches
+            {page_where}
+            ORDER BY rank DESC, data DESC, created_at DESC, id DESC
+            {page}
+        """
+
+        try:
+            with track_query("search_rows"):
+                rows = await run_sql(self.read_db, "fetch", query, *args)
+
+            return [dict(row) for row in rows]
+
+        except Exception as e:
+            logger.error(f"Erro ao buscar transações por '{text}': {str(e)}")
+            return []
+
+    async def summarize_search(
+        self,
+        text: str,
+        start_date: datetime,
+        end_date: datetime,
+        filters: Optional[TransactionFilter] = None,
+    ) -> Optional[PeriodSummary]:
+        """Totais de todas as transações do período que casam com `text` (não só da página)"""
+        args: List[Any] = [start_date, end_date]
+        conditions = self._search_conditions(text, args) + self._filter_conditions(filters, args)
+
+        query = f"""
+            SELECT income, expense, income - expense AS net, count
+            FROM (
+                SELECT COALESCE(SUM(valor) FILTER (WHERE transaction_type = 'income'), 0) AS income,
+                       COALESCE(SUM(valor) FILTER (WHERE transaction_type <> 'income'), 0) AS expense,
+                       COUNT(*) AS count
+                FROM ledger($1, $2)
+                WHERE {' AND '.join(conditions)}
+            ) totals
+        """
+
+        try:
+            with track_query("summarize_search"):
+                row = await run_sql(self.read_db, "fetchrow", query, *args)
+
+            return PeriodSummary(**dict(row))
+
+        except Exception as e:
+            logger.error(f"Erro ao totalizar a busca por '{text}': {str(e)}")
+            return None
+
+    async def running_balance(
+        self,
+        start_date: date,
+        end_date: date,
+        owner_id: Optional[int] = None,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Saldo acumulado dia a dia no período (data, net do dia, saldo ao fim do dia).
+        A abertura parte do último snapshot até o mês inicial + rollups dos meses entre
+        ele e o período; só os dias do mês inicial em diante vêm do ledger
+        """
+        month_start = start_date.replace(day=1)
+        args: List[Any] = [month_start, end_date, start_date]
+        owner, snapshot_owner, rollup_owner = "", "", ""
+        if owner_id is not None:
+            args.append(owner_id)
+            owner = f"WHERE owner_id = ${len(args)}"
+            snapshot_owner = f"AND owner_id = ${len(args)}"
+            rollup_owner = f"AND r.owner_id = ${len(args)}"
+
+        query = f"""
+            WITH anchor AS (
+                SELECT DISTINCT ON (owner_id) owner_id, month, opening_balance
+                FROM balance_snapshots
+                WHERE month <= $1 {snapshot_owner}
+                ORDER BY owner_id, month DESC
+            ), opening AS (
+                SELECT COALESCE((SELECT SUM(opening_balance) FROM anchor), 0)
+                     + COALESCE((
+                           SELECT SUM(CASE WHEN r.transaction_type = 'income' THEN r.total ELSE -r.total END)
+                           FROM monthly_rollups r
+                           LEFT JOIN anchor a ON a.owner_id = r.owner_id
+                           WHERE r.month < $1
+                             AND (a.month IS NULL OR r.month >= a.month)
+                             {rollup_owner}
+                       ), 0) AS balance
+            ), days AS (
+                SELECT data, SUM(CASE WHEN transaction_type = 'income' THEN valor ELSE -valor END) AS net
+                FROM ledger($1, $2)
+                {owner}
+                GROUP BY data
+            )
+            SELECT data, net, balance FROM (
+                SELECT d.day::date AS data, COALESCE(x.net, 0) AS net,
+                       o.balance + SUM(COALESCE(x.net, 0)) OVER (ORDER BY d.day) AS balance
+                FROM generate_series($1::date, $2::date, interval '1 day') AS d(day)
+                CROSS JOIN opening o
+                LEFT JOIN days x ON x.data = d.day
+            ) series
+            WHERE data >= $3
+            ORDER BY data
+        """
+
+        try:
+            with track_query("running_balance"):
+                rows = await run_sql(self.read_db, "fetch", query, *args)
+
+            return [dict(row) for row in rows]
+
+        except Exception as e:
+            logger.error(f"Erro ao calcular o saldo acumulado de {start_date} a {end_date}: {str(e)}")
+            return None
+
+    async def refresh_balance_snapshots(self) -> Optional[int]:
+        """
+        Recalcula o saldo de abertura de cada mês (até o atual) por dono, somando os
+        meses anteriores de monthly_rollups com uma window function. O SHARE em
+        monthly_rollups segura as escritas durante o recálculo: uma escrita que
+        terminasse no meio dele expiraria os snapshots antes de eles serem gravados
+        """
+        query = """
+            WITH upserted AS (
+                INSERT INTO balance_snapshots (owner_id, month, opening_balance)
+                SELECT owner_id, month, opening_balance
+                FROM (
+                    SELECT owner_id, month,
+                           COALESCE(SUM(net) OVER (
+                               PARTITION BY owner_id ORDER BY month
+                               ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
+                           ), 0) AS opening_balance
+                    FROM (
+                        SELECT owner_id, month,
+                               SUM(CASE WHEN transaction_type = 'income' THEN total ELSE -total END) AS net
+                        FROM monthly_rollups
+                        GROUP BY owner_id, month
+                    ) months
+                ) openings
+                -- Meses futuros (parcelas) mudariam a cada escrita do mês atual
+                WHERE month <= date_trunc('month', CURRENT_DATE)
+                ON CONFLICT (owner_id, month) DO UPDATE SET
+                    opening_balance = EXCLUDED.opening_balance,
+                    computed_at = CURRENT_TIMESTAMP
+                RETURNING 1
+            )
+            SELECT COUNT(*) FROM upserted
+        """
+
+        try:
+            with track_query("refresh_balance_snapshots"):
+                async with acquire(self.db) as conn:
+                    async with conn.transaction():
+                        await conn.execute("LOCK TABLE monthly_rollups IN SHARE MODE")
+                        count = await conn.fetchval(query)
+
+            logger.info(f"📸 {count} snapshots de saldo atualizados")
+            return count
+
+        except Exception as e:
+            logger.error(f"Erro ao atualizar snapshots de saldo: {str(e)}")
+            return None
+
+    def _search_conditions(self, text: str, args: List[Any]) -> List[str]:
+        """
+        Casamento da busca: substring ou palavra parecida no item (pg_trgm: ILIKE e `<%`)
+        ou termos na descricao (tsvector em português). Usa $3 (texto) e $4 (padrão ILIKE)
+        """
+        escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        args.extend([text, f"%{escaped}%"])
+        return [
+            "(item ILIKE $4"
+            " OR $3 <% item"
+            " OR to_tsvector('portuguese', descricao) @@ websearch_to_tsquery('portuguese', $3))"
+        ]
+
+    def _full_months(self, start: date, end: date) -> Tuple[date, date]:
+        """
+        Meses inteiramente contidos no período, como [primeiro mês, mês seguinte ao último).
+        Sem mês completo os dois coincidem e todo o período é somado pelo ledger.
+        """
+        first_month = start if start.day == 1 else add_months(start.replace(day=1), 1)
+        end_month = (end + timedelta(days=1)).replace(day=1)
+        if end_month <= first_month:
+            return end + timedelta(days=1), end + timedelta(days=1)
+        return first_month, end_month
+
+    def _as_date(self, value: datetime) -> date:
+        return value.date() if isinstance(value, datetime) else value
+
+    def _filter_conditions(self, filters: Optional[TransactionFilter], args: List[Any]) -> List[str]:
+        """Monta as condições do WHERE, acrescentando os valores em `args`"""
+        if not filters:
+            return []
+
+        conditions = []
+        if filters.owner_id is not None:
+            # Primeira coluna dos índices por dono (transações, planos e monthly_rollups)
+            args.append(filters.owner_id)
+            conditions.append(f"owner_id = ${len(args)}")
+        if filters.transaction_type:
+            # Literal (já validado como income/expense) para o planner poder escolher
+            # os índices parciais por tipo; com parâmetro o plano genérico não os usa
+            conditions.append(f"transaction_type = '{filters.transaction_type}'")
+        if filters.categorias:
+            args.append(filters.categorias)
+            conditions.append(f"categoria = ANY(${len(args)}::varchar[])")
+        if filters.min_valor is not None:
+            args.append(filters.min_valor)
+            conditions.append(f"valor >= ${len(args)}")
+        if filters.max_valor is not None:
+            args.append(filters.max_valor)
+            conditions.append(f"valor <= ${len(args)}")
+        return conditions
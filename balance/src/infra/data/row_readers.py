@@ -0,0 +1,100 @@
+import csv
+import json
+from collections import deque
+from typing import AsyncIterator, Any, Dict, Tuple, Union
+
+# (nº da linha, registro) — o registro é a exceção quando a linha não pôde ser lida
+Row = Tuple[int, Union[Dict[str, Any], Exception]]
+
+async def iter_lines(chunks: AsyncIterator[bytes], keepends: bool = False) -> AsyncIterator[str]:
+    """
+    Quebra o corpo da requisição em linhas sem carregá-lo inteiro na memória.
+    Com `keepends`, cada linha mantém o terminador original (\\n ou \\r\\n)
+    """
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            text = line.decode("utf-8")
+            yield text + "\n" if keepends else text.rstrip("\r")
+
+    if buffer:
+        text = buffer.decode("utf-8")
+        yield text if keepends else text.rstrip("\r")
+
+async def read_ndjson(chunks: AsyncIterator[bytes]) -> AsyncIterator[Row]:
+    """Um objeto JSON por linha; linhas em branco são ignoradas"""
+    line_number = 0
+    async for line in iter_lines(chunks):
+        line_number += 1
+        if not line.strip():
+            continue
+
+        try:
+            yield line_number, json.loads(line)
+        except ValueError as e:
+            yield line_number, e
+
+class _LineFeed:
+    """
+    Linhas já recebidas, com o terminador (como um arquivo aberto com newline=""),
+    entregues sob demanda ao csv.reader
+    """
+
+    def __init__(self):
+        self.pending = deque()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        if not self.pending:
+            raise StopIteration
+        return self.pending.popleft()
+
+async def read_csv(chunks: AsyncIterator[bytes]) -> AsyncIterator[Row]:
+    """
+    CSV com cabeçalho, lido por um único csv.reader: campos entre aspas podem ter
+    quebras de linha. O número de linha é o do arquivo (reader.line_num)
+    """
+    feed = _LineFeed()
+    reader = csv.reader(feed)
+    header = None
+    quotes = 0
+
+    def parse() -> Union[list, Exception]:
+        try:
+            return next(reader)
+        except csv.Error as e:
+            return e
+
+    async def records() -> AsyncIterator[Union[list, Exception]]:
+        nonlocal quotes
+        async for line in iter_lines(chunks, keepends=True):
+            feed.pending.append(line)
+            # Aspas em número ímpar: o campo entre aspas continua na próxima linha
+            quotes += line.count('"')
+            if quotes % 2:
+                continue
+            quotes = 0
+            yield parse()
+
+        # Aspas não fechadas até o fim do corpo: o resto do arquivo virou um só campo
+        if feed.pending:
+            parse()
+            yield ValueError("aspas não fechadas até o fim do arquivo")
+
+    async for values in records():
+        if isinstance(values, Exception):
+            yield reader.line_num, values
+            continue
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        if not values:
+            continue
+        if len(values) != len(header):
+            yield reader.line_num, ValueError(f"esperadas {len(header)} colunas, recebidas {len(values)}")
+            continue
+        yield reader.line_num, dict(zip(header, values))
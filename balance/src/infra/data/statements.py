@@ -0,0 +1,235 @@
+import asyncpg
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict
+from ..core.logger import logger
+from ..core.metrics import DB_POOL_ACQUIRE_SECONDS, track_query
+
+# Projeções explícitas: nada de SELECT */RETURNING * (colunas novas não mudam o que trafega)
+TRANSACTION_COLUMNS = "id, item, valor, data, categoria, transaction_type, descricao, created_at, updated_at"
+PLAN_COLUMNS = (
+    "id, item, valor_total, parcelas, data_compra, first_due_date, last_due_date, cutoff_day, "
+    "categoria, transaction_type, descricao, created_at, updated_at"
+)
+
+# Colunas expostas pela API (ExpenseResponse), na mesma ordem. As parcelas de um plano
+# repetem o id do plano: a linha do ledger é identificada por (id, parcela)
+PERIOD_COLUMNS = "id, item, valor, data, categoria, descricao, transaction_type, created_at, parcela"
+# Listagem enxuta: sem a mensagem original (descricao), que é a coluna mais larga
+SLIM_PERIOD_COLUMNS = "id, item, valor, data, categoria, transaction_type, created_at, parcela"
+
+# Statements de texto fixo, preparados uma vez por conexão do pool (ver init_connection).
+# Lançamentos vindos do Telegram pertencem ao chat de origem (owner_id = source_chat_id).
+# Consultas montadas dinamicamente (filtros de período) usam o cache automático do asyncpg.
+STATEMENTS: Dict[str, str] = {
+    "create_transaction": f"""
+        INSERT INTO transactions (
+            item, valor, data, categoria, transaction_type, descricao, owner_id
+        ) VALUES ($1, $2, $3, $4, $5, $6, $7)
+        RETURNING {TRANSACTION_COLUMNS}
+    """,
+
+    # Um único statement com arrays via unnest: uma ida ao banco e tudo-ou-nada
+    "create_transactions": f"""
+        INSERT INTO transactions (
+            item, valor, data, categoria, transaction_type, descricao, owner_id
+        )
+        SELECT t.*, $7::bigint FROM unnest(
+            $1::varchar[], $2::numeric[], $3::date[],
+            $4::varchar[], $5::varchar[], $6::text[]
+        ) AS t
+        RETURNING {TRANSACTION_COLUMNS}
+    """,
+
+    # Parcela N da mensagem ocupa sempre a mesma linha (source_seq = N): reentregas e
+    # edições viram UPDATE e parcelas que deixaram de existir na edição são removidas.
+    # A tabela é particionada por `data`, que faz parte da chave única: uma edição que
+    # muda a data remove a linha antiga e insere a nova (pode mudar de partição)
+    "upsert_transactions_by_source": f"""
+        WITH incoming AS (
+            SELECT * FROM unnest(
+                $1::varchar[], $2::numeric[], $3::date[],
+                $4::varchar[], $5::varchar[], $6::text[]
+            ) WITH ORDINALITY AS t(item, valor, data, categoria, transaction_type, descricao, seq)
+        ), stale AS (
+            DELETE FROM transactions x
+            WHERE x.source_chat_id = $7
+              AND x.source_message_id = $8
+              AND (
+                  x.source_seq > $9
+                  OR EXISTS (
+                      SELECT 1 FROM incoming i
+                      WHERE i.seq = x.source_seq AND i.data <> x.data
+                  )
+              )
+        ), stale_plan AS (
+            -- A edição transformou uma compra parcelada em avulsa
+            DELETE FROM installment_plans
+            WHERE source_chat_id = $7
+              AND source_message_id = $8
+        )
+        INSERT INTO transactions (
+            item, valor, data, categoria, transaction_type, descricao,
+            owner_id, source_chat_id, source_message_id, source_seq
+        )
+        SELECT t.item, t.valor, t.data, t.categoria, t.transaction_type, t.descricao,
+               $7, $7, $8, t.seq::smallint
+        FROM incoming t
+        ON CONFLICT (source_chat_id, source_message_id, source_seq, data) DO UPDATE SET
+            item = EXCLUDED.item,
+            valor = EXCLUDED.valor,
+            categoria = EXCLUDED.categoria,
+            transaction_type = EXCLUDED.transaction_type,
+            descricao = EXCLUDED.descricao,
+            updated_at = CURRENT_TIMESTAMP
+        RETURNING {TRANSACTION_COLUMNS}
+    """,
+
+    "upsert_many_transactions_by_source": f"""
+        WITH incoming AS (
+            SELECT * FROM unnest(
+                $1::varchar[], $2::numeric[], $3::date[],
+                $4::varchar[], $5::varchar[], $6::text[],
+                $7::bigint[], $8::smallint[]
+            ) AS t(item, valor, data, categoria, transaction_type, descricao, message_id, seq)
+        ), moved AS (
+            -- Reimportação com outra data para a mesma parcela
+            DELETE FROM transactions x
+            USING incoming i
+            WHERE x.source_chat_id = $9
+              AND x.source_message_id = i.message_id
+              AND x.source_seq = i.seq
+              AND x.data <> i.data
+        )
+        INSERT INTO transactions (
+            item, valor, data, categoria, transaction_type, descricao,
+            owner_id, source_chat_id, source_message_id, source_seq
+        )
+        SELECT t.item, t.valor, t.data, t.categoria, t.transaction_type, t.descricao,
+               $9, $9, t.message_id, t.seq
+        FROM incoming t
+        ON CONFLICT (source_chat_id, source_message_id, source_seq, data) DO UPDATE SET
+            item = EXCLUDED.item,
+            valor = EXCLUDED.valor,
+            categoria = EXCLUDED.categoria,
+            transaction_type = EXCLUDED.transaction_type,
+            descricao = EXCLUDED.descricao,
+            updated_at = CURRENT_TIMESTAMP
+        RETURNING {TRANSACTION_COLUMNS}
+    """,
+
+    "create_plan": f"""
+        INSERT INTO installment_plans (
+            item, valor_total, parcelas, data_compra, first_due_date,
+            last_due_date, cutoff_day, categoria, transaction_type, descricao, owner_id
+        ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11)
+        RETURNING {PLAN_COLUMNS}
+    """,
+
+    "upsert_plan_by_source": f"""
+        WITH stale AS (
+            -- A edição transformou uma compra avulsa em parcelada
+            DELETE FROM transactions
+            WHERE source_chat_id = $11
+              AND source_message_id = $12
+        )
+        INSERT INTO installment_plans (
+            item, valor_total, parcelas, data_compra, first_due_date,
+            last_due_date, cutoff_day, categoria, transaction_type, descricao,
+            owner_id, source_chat_id, source_message_id
+        ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $11, $12)
+        ON CONFLICT (source_chat_id, source_message_id) DO UPDATE SET
+            item = EXCLUDED.item,
+            valor_total = EXCLUDED.valor_total,
+            parcelas = EXCLUDED.parcelas,
+            data_compra = EXCLUDED.data_compra,
+            first_due_date = EXCLUDED.first_due_date,
+            last_due_date = EXCLUDED.last_due_date,
+            cutoff_day = EXCLUDED.cutoff_day,
+            categoria = EXCLUDED.categoria,
+            transaction_type = EXCLUDED.transaction_type,
+            descricao = EXCLUDED.descricao,
+            updated_at = CURRENT_TIMESTAMP
+        RETURNING {PLAN_COLUMNS}
+    """,
+
+    "upsert_plans_by_source": f"""
+        INSERT INTO installment_plans (
+            item, valor_total, parcelas, data_compra, first_due_date,
+            last_due_date, cutoff_day, categoria, transaction_type, descricao,
+            owner_id, source_chat_id, source_message_id
+        )
+        SELECT t.item, t.valor_total, t.parcelas, t.data_compra, t.first_due_date,
+               t.last_due_date, t.cutoff_day, t.categoria, t.transaction_type, t.descricao,
+               $12, $12, t.message_id
+        FROM unnest(
+            $1::varchar[], $2::numeric[], $3::smallint[], $4::date[], $5::date[],
+            $6::date[], $7::smallint[], $8::varchar[], $9::varchar[], $10::text[],
+            $11::bigint[]
+        ) AS t(
+            item, valor_total, parcelas, data_compra, first_due_date,
+            last_due_date, cutoff_day, categoria, transaction_type, descricao, message_id
+        )
+        ON CONFLICT (source_chat_id, source_message_id) DO UPDATE SET
+            item = EXCLUDED.item,
+            valor_total = EXCLUDED.valor_total,
+            parcelas = EXCLUDED.parcelas,
+            data_compra = EXCLUDED.data_compra,
+            first_due_date = EXCLUDED.first_due_date,
+            last_due_date = EXCLUDED.last_due_date,
+            cutoff_day = EXCLUDED.cutoff_day,
+            categoria = EXCLUDED.categoria,
+            transaction_type = EXCLUDED.transaction_type,
+            descricao = EXCLUDED.descricao,
+            updated_at = CURRENT_TIMESTAMP
+        RETURNING {PLAN_COLUMNS}
+    """,
+
+    # Meses em que a mensagem já tem lançamentos (uma edição pode mudar a data)
+    "source_months": """
+        SELECT data AS first_day, data AS last_day FROM transactions
+        WHERE source_chat_id = $1 AND source_message_id = $2
+        UNION ALL
+        SELECT first_due_date, last_due_date FROM installment_plans
+        WHERE source_chat_id = $1 AND source_message_id = $2
+    """,
+}
+
+class StatementConnection(asyncpg.Connection):
+    """Conexão do pool que guarda os STATEMENTS preparados (hook init do pool)"""
+
+    async def prepare_statements(self):
+        self.statements = {name: await self.prepare(sql) for name, sql in STATEMENTS.items()}
+
+async def init_connection(conn: StatementConnection):
+    """Hook `init` do asyncpg: roda uma vez por conexão nova do pool"""
+    try:
+        await conn.prepare_statements()
+    except Exception as e:
+        # Ex: banco ainda sem as migrations; as chamadas caem para o texto do statement
+        logger.warning(f"⚠️ Statements não preparados nesta conexão: {str(e)}")
+
+@asynccontextmanager
+async def acquire(pool: asyncpg.Pool) -> AsyncIterator[asyncpg.Connection]:
+    """Conexão do pool, registrando a espera por ela em db_pool_acquire_seconds"""
+    started = time.perf_counter()
+    async with pool.acquire() as conn:
+        DB_POOL_ACQUIRE_SECONDS.observe(time.perf_counter() - started)
+        yield conn
+
+async def run_sql(pool: asyncpg.Pool, method: str, query: str, *args: Any) -> Any:
+    """SQL montado em tempo de execução (`fetch`, `fetchrow`...) com a mesma medição de run()"""
+    async with acquire(pool) as conn:
+        return await getattr(conn, method)(query, *args)
+
+async def run(pool: asyncpg.Pool, method: str, name: str, *args: Any) -> Any:
+    """
+    Executa o statement nomeado (`fetch`, `fetchrow` ou `fetchval`) em uma conexão do
+    pool, usando a versão já preparada quando existir
+    """
+    with track_query(name):
+        async with acquire(pool) as conn:
+            prepared = getattr(conn, "statements", {}).get(name)
+            if prepared is not None:
+                return await getattr(prepared, method)(*args)
+            return await getattr(conn, method)(STATEMENTS[name], *args)
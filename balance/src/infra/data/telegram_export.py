@@ -0,0 +1,36 @@
+import ijson
+from datetime import date, datetime
+from typing import Iterator, Optional, Tuple, Any
+
+# (message_id, texto, data de envio, from_id)
+ExportMessage = Tuple[int, str, date, Optional[str]]
+
+def read_chat_id(path: str) -> int:
+    """Lê o id do chat no topo do result.json (sem carregar as mensagens)"""
+    with open(path, "rb") as f:
+        return int(next(ijson.items(f, "id")))
+
+def iter_messages(path: str) -> Iterator[ExportMessage]:
+    """
+    Percorre as mensagens de um export JSON do Telegram Desktop em streaming,
+    ignorando mensagens de serviço e sem texto.
+    """
+    with open(path, "rb") as f:
+        for message in ijson.items(f, "messages.item"):
+            if message.get("type") != "message":
+                continue
+
+            text = flatten_text(message.get("text")).strip()
+            if not text:
+                continue
+
+            sent_on = datetime.fromisoformat(message["date"]).date()
+            yield int(message["id"]), text, sent_on, message.get("from_id")
+
+def flatten_text(text: Any) -> str:
+    """O export guarda textos com formatação como lista de trechos e entidades"""
+    if isinstance(text, str):
+        return text
+    if isinstance(text, list):
+        return "".join(part if isinstance(part, str) else part.get("text", "") for part in text)
+    return ""
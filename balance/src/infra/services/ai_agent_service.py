@@ -1,103 +1,138 @@
 from openai import AsyncOpenAI
 import json
 import os
-from typing import Optional, List
+from typing import Optional, Dict, Any
 from datetime import date
 from decimal import Decimal
 from ...domain.interfaces.services.iagent_service import IAgentService
+from ...domain.models.installment_plan import InstallmentPlanCreate, add_months
+from ...domain.models.parsed_message import ParsedMessage
 from ...domain.models.transaction import TransactionCreate
+from ...infra.core.config import settings
 from ...infra.core.logger import logger
+from ...infra.core.metrics import record_llm_usage, track_llm
+from .llm_batcher import LLMBatcher
+from .parse_cache import ParseCache
+from .prompts import SINGLE_SYSTEM_PROMPT
+from .rate_limiter import RateLimiter
+from .rule_based_parser import RuleBasedParser, rule_based_parser
 
 class AIAgentService(IAgentService):
-    def __init__(self):
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            logger.error("OPENAI_API_KEY não encontrada no ambiente")
-        
-        self.client = AsyncOpenAI(api_key=api_key)
-        self.model = "gpt-4o-mini"
-
-    async def parse_expense(self, text: str) -> List[TransactionCreate]:
+    def __init__(
+        self,
+        client: Optional[AsyncOpenAI] = None,
+        limiter: Optional[RateLimiter] = None,
+        fast_parser: Optional[RuleBasedParser] = None,
+        cache: Optional[ParseCache] = None,
+        batcher: Optional[LLMBatcher] = None,
+    ):
+        if client is None:
+            api_key = os.getenv("OPENAI_API_KEY")
+            if not api_key:
+                logger.error("OPENAI_API_KEY não encontrada no ambiente")
+            client = AsyncOpenAI(api_key=api_key)
+
+        self.client = client
+        self.limiter = limiter
+        self.model = settings.OPENAI_MODEL
+        self.fast_parser = fast_parser or rule_based_parser
+        self.cache = cache
+        self.batcher = batcher
+
+    async def parse_message(self, text: str, today: Optional[date] = None) -> ParsedMessage:
+        """Extrai dados estruturados da mensagem (regras, cache e por último a IA)"""
+        today = today or date.today()
+
+        try:
+            data = None
+            if settings.FAST_PARSER_ENABLED:
+                data = self.fast_parser.parse(text, today)
+
+            if data is None and self.cache:
+                data = await self.cache.get(text, today)
+
+            from_llm = data is None
+            if from_llm:
+                data = await self._parse_with_llm(text, today)
+
+        except Exception as e:
+            logger.error(f"Erro ao interpretar mensagem com IA: {str(e)}")
+            return ParsedMessage(failed=True)
+
+        # Resposta sem os campos de um lançamento (ex: "bom dia"): nada a registrar
+        try:
+            message = self._build_message(data, text)
+        except Exception as e:
+            logger.warning(f"⚠️ Mensagem sem lançamento válido: {str(e)}")
+            return ParsedMessage()
+
+        # Só respostas válidas vão para o cache: uma interpretação malformada não é
+        # repetida para as próximas mensagens iguais
+        if from_llm and self.cache:
+            await self.cache.set(text, today, data)
+
+        return message
+
+    async def _parse_with_llm(self, text: str, today: date) -> Dict[str, Any]:
         """Usa IA para extrair dados estruturados da mensagem"""
-        today = date.today().isoformat()
-        
-        system_prompt = """
-        Você é um assistente de finanças pessoais. Sua tarefa é extrair informações de uma mensagem de transação financeira.
-        Extraia os seguintes campos em formato JSON:
-        - item: O nome do produto, serviço ou origem do dinheiro (ex: "Tênis de corrida", "Salário", "Reembolso")
-        - valor: O valor total numérico (ex: 350.00)
-        - data: A data no formato YYYY-MM-DD (se não houver uma data na mensagem, use a data de hoje)
-        - categoria: Uma categoria curta (ex: "Vestimento", "Lazer", "Alimentação", "Salário", "Investimentos")
-        - transaction_type: "expense" para gastos/despesas, ou "income" para ganhos/entradas de dinheiro.
-        - parcelas: Número de parcelas (inteiro, padrão 1 se não mencionado)
-        - metodo_pagamento: "credito" se for mencionado crédito ou parcelado, caso contrário "debito" ou outros.
-        - descricao: A mensagem original na íntegra.
-        """
+        if self.batcher:
+            try:
+                return await self.batcher.submit(text, today)
+            except Exception as e:
+                logger.warning(f"⚠️ Falha no lote da IA, interpretando mensagem isolada: {str(e)}")
 
         user_prompt = f"""
         Mensagem: "{text}"
-        Data de hoje: {today}
+        Data de hoje: {today.isoformat()}
         """
 
-        try:
-            response = await self.client.chat.completions.create(
+        def call():
+            return self.client.chat.completions.create(
                 model=self.model,
                 messages=[
-                    {"role": "system", "content": system_prompt},
+                    {"role": "system", "content": SINGLE_SYSTEM_PROMPT},
                     {"role": "user", "content": user_prompt}
                 ],
                 response_format={"type": "json_object"}
             )
-            
-            content = response.choices[0].message.content
-            data = json.loads(content)
-            
-            transactions = []
-            base_valor = Decimal(str(data["valor"]))
-            base_date = date.fromisoformat(data["data"])
-            parcelas = int(data.get("parcelas", 1))
-            is_credit = data.get("metodo_pagamento") == "credito" or parcelas > 1
-            
-            if is_credit and base_date.day > 26:
-
-                year = base_date.year + (base_date.month // 12)
-                month = (base_date.month % 12) + 1
-
-                try:
-                    base_date = base_date.replace(year=year, month=month)
-                except ValueError:
-                    import calendar
-                    last_day = calendar.monthrange(year, month)[1]
-                    base_date = base_date.replace(year=year, month=month, day=last_day)
-            
-            installment_value = base_valor / parcelas
-            
-            for i in range(parcelas):
-                year = base_date.year + ((base_date.month + i - 1) // 12)
-                month = ((base_date.month + i - 1) % 12) + 1
-                
-                try:
-                    current_date = base_date.replace(year=year, month=month)
-                except ValueError:
-                    import calendar
-                    last_day = calendar.monthrange(year, month)[1]
-                    current_date = base_date.replace(year=year, month=month, day=last_day)
-                
-                description = text
-                if parcelas > 1:
-                    description = f"{text} (Parcela {i+1}/{parcelas})"
-                
-                transactions.append(TransactionCreate(
-                    item=data["item"],
-                    valor=installment_value,
-                    data=current_date,
-                    categoria=data["categoria"],
-                    transaction_type=data["transaction_type"],
-                    descricao=description
-                ))
-            
-            return transactions
 
-        except Exception as e:
-            logger.error(f"Erro ao interpretar mensagem com IA: {str(e)}")
-            return []
+        with track_llm("single"):
+            response = await (self.limiter.run(call) if self.limiter else call())
+        record_llm_usage("single", response)
+
+        content = response.choices[0].message.content
+        return json.loads(content)
+
+    def _build_message(self, data: Dict[str, Any], text: str) -> ParsedMessage:
+        """Monta a transação avulsa ou o plano de parcelas a partir dos campos interpretados"""
+        valor = Decimal(str(data["valor"]))
+        purchase_date = date.fromisoformat(data["data"])
+        parcelas = int(data.get("parcelas", 1))
+        is_credit = data.get("metodo_pagamento") == "credito" or parcelas > 1
+
+        # Compras no crédito após o fechamento do cartão caem na fatura do mês seguinte
+        first_due_date = purchase_date
+        if is_credit and purchase_date.day > settings.CREDIT_CARD_CUTOFF_DAY:
+            first_due_date = add_months(purchase_date, 1)
+
+        if parcelas > 1:
+            return ParsedMessage(plan=InstallmentPlanCreate(
+                item=data["item"],
+                valor_total=valor,
+                parcelas=parcelas,
+                data_compra=purchase_date,
+                first_due_date=first_due_date,
+                cutoff_day=settings.CREDIT_CARD_CUTOFF_DAY,
+                categoria=data["categoria"],
+                transaction_type=data["transaction_type"],
+                descricao=text
+            ))
+
+        return ParsedMessage(transactions=[TransactionCreate(
+            item=data["item"],
+            valor=valor,
+            data=first_due_date,
+            categoria=data["categoria"],
+            transaction_type=data["transaction_type"],
+            descricao=text
+        )])
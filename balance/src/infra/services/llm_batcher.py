@@ -0,0 +1,113 @@
+import asyncio
+import json
+from openai import AsyncOpenAI
+from datetime import date
+from typing import Optional, List, Dict, Any, Set, Tuple
+from ...infra.core.config import settings
+from ...infra.core.logger import logger
+from ...infra.core.metrics import record_llm_usage, track_llm
+from .prompts import BATCH_SYSTEM_PROMPT
+from .rate_limiter import RateLimiter
+
+PendingMessage = Tuple[str, date, asyncio.Future]
+
+class LLMBatcher:
+    """Agrupa mensagens pendentes (até N ou T ms) em uma única chamada JSON-mode"""
+
+    def __init__(
+        self,
+        client: AsyncOpenAI,
+        model: str = settings.OPENAI_MODEL,
+        max_size: int = settings.LLM_BATCH_MAX_SIZE,
+        window_ms: int = settings.LLM_BATCH_WINDOW_MS,
+        limiter: Optional[RateLimiter] = None,
+    ):
+        self.client = client
+        self.limiter = limiter
+        self.model = model
+        self.max_size = max_size
+        self.window_ms = window_ms
+        self._pending: List[PendingMessage] = []
+        self._timer: Optional[asyncio.Task] = None
+        self._in_flight: Set[asyncio.Task] = set()
+
+    async def submit(self, text: str, today: date) -> Dict[str, Any]:
+        """Entra no próximo lote e aguarda a interpretação desta mensagem"""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((text, today, future))
+
+        if len(self._pending) >= self.max_size:
+            self._flush_now()
+        elif self._timer is None:
+            self._timer = asyncio.create_task(self._flush_after_window())
+
+        return await future
+
+    async def _flush_after_window(self):
+        await asyncio.sleep(self.window_ms / 1000)
+        self._timer = None
+        await self._flush(self._take())
+
+    def _flush_now(self):
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+
+        task = asyncio.create_task(self._flush(self._take()))
+        self._in_flight.add(task)
+        task.add_done_callback(self._in_flight.discard)
+
+    def _take(self) -> List[PendingMessage]:
+        batch, self._pending = self._pending, []
+        return batch
+
+    async def _flush(self, batch: List[PendingMessage]):
+        if not batch:
+            return
+
+        try:
+            results = await self._complete(batch)
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for index, (text, _, future) in enumerate(batch):
+            if future.done():
+                continue
+            if index in results:
+                future.set_result(results[index])
+            else:
+                future.set_exception(ValueError(f"IA não retornou resultado para: {text}"))
+
+    async def _complete(self, batch: List[PendingMessage]) -> Dict[int, Dict[str, Any]]:
+        """Uma chamada para o lote inteiro; devolve os resultados indexados pela posição"""
+        messages = [
+            {"index": index, "mensagem": text, "data_de_hoje": today.isoformat()}
+            for index, (text, today, _) in enumerate(batch)
+        ]
+
+        def call():
+            return self.client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": BATCH_SYSTEM_PROMPT},
+                    {"role": "user", "content": json.dumps(messages, ensure_ascii=False)}
+                ],
+                response_format={"type": "json_object"}
+            )
+
+        with track_llm("batch"):
+            response = await (self.limiter.run(call) if self.limiter else call())
+        record_llm_usage("batch", response)
+
+        content = json.loads(response.choices[0].message.content)
+        results = {
+            int(item["index"]): item
+            for item in content.get("results", [])
+            if isinstance(item, dict) and "index" in item
+        }
+
+        logger.info(f"📦 Lote de {len(batch)} mensagens interpretado em uma chamada ({len(results)} resultados)")
+        return results
@@ -0,0 +1,49 @@
+from openai import AsyncOpenAI
+from typing import Optional
+from ...infra.core.config import settings
+from ...infra.core.logger import logger
+from .llm_batcher import LLMBatcher
+from .rate_limiter import RateLimiter
+
+class OpenAIPool:
+    """Cliente OpenAI único do processo (conexões keep-alive reaproveitadas entre requests)"""
+
+    def __init__(self):
+        self.client: Optional[AsyncOpenAI] = None
+        self.limiter = RateLimiter()
+        self.batcher: Optional[LLMBatcher] = None
+
+    async def connect(self):
+        """Cria o cliente compartilhado e aquece a conexão com a API"""
+        try:
+            self.client = AsyncOpenAI(
+                api_key=settings.OPENAI_API_KEY,
+                timeout=settings.OPENAI_TIMEOUT_SECONDS,
+                max_retries=0  # retries (429, 5xx e rede) ficam a cargo do RateLimiter
+            )
+        except Exception as e:
+            # Sem a IA o serviço ainda atende as consultas de transações
+            logger.error(f"❌ Erro ao criar cliente OpenAI: {str(e)}")
+            return
+
+        if settings.LLM_BATCH_ENABLED:
+            self.batcher = LLMBatcher(self.client, limiter=self.limiter)
+
+        await self.warmup()
+
+    async def warmup(self):
+        """Abre a conexão TLS antes do primeiro webhook"""
+        try:
+            await self.limiter.run(lambda: self.client.models.retrieve(settings.OPENAI_MODEL))
+            logger.info("✅ Conexão com a OpenAI aquecida")
+        except Exception as e:
+            logger.warning(f"⚠️ Falha no warm-up da OpenAI: {str(e)}")
+
+    async def disconnect(self):
+        """Fecha o pool HTTP do cliente"""
+        if self.client:
+            await self.client.close()
+            logger.info("❌ Cliente OpenAI encerrado")
+
+# Instância global do cliente OpenAI
+openai_pool = OpenAIPool()
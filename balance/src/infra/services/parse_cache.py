@@ -0,0 +1,62 @@
+import hashlib
+import json
+import redis.asyncio as redis
+from datetime import date, timedelta
+from typing import Optional, Dict, Any
+from ...infra.core.config import settings
+from ...infra.core.logger import logger
+from .rule_based_parser import normalize, resolve_date, tokenize
+
+CACHED_FIELDS = ("item", "valor", "categoria", "transaction_type", "parcelas", "metodo_pagamento")
+
+class ParseCache:
+    """Cache das interpretações da IA, chaveado pelo texto normalizado da mensagem"""
+
+    def __init__(
+        self,
+        client: redis.Redis,
+        ttl_seconds: int = settings.PARSE_CACHE_TTL_SECONDS,
+        prefix: str = "parse:",
+    ):
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+
+    def key_for(self, text: str) -> str:
+        """Texto sem acentos/caixa/espaços extras; tokens como "ontem" fazem parte da chave"""
+        normalized = " ".join(normalize(t) for t in tokenize(text))
+        return self.prefix + hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+    async def get(self, text: str, today: date) -> Optional[Dict[str, Any]]:
+        """Retorna os campos interpretados com a data resolvida para hoje, sem chamar a IA"""
+        try:
+            raw = await self.client.get(self.key_for(text))
+        except Exception as e:
+            logger.warning(f"⚠️ Cache de interpretação indisponível: {str(e)}")
+            return None
+
+        if not raw:
+            return None
+
+        cached = json.loads(raw)
+        data = {field: cached[field] for field in CACHED_FIELDS}
+
+        # Datas explícitas ("dia 12", "15/01") são resolvidas de novo; o resto usa o deslocamento salvo
+        tokens = [normalize(t) for t in tokenize(text)]
+        resolved = resolve_date(tokens, today) or today + timedelta(days=cached["day_offset"])
+        data["data"] = resolved.isoformat()
+
+        logger.info(f"♻️ Interpretação reaproveitada do cache: {text}")
+        return data
+
+    async def set(self, text: str, today: date, data: Dict[str, Any]):
+        """Guarda a interpretação com TTL (a política volatile-lru do Redis cuida da eviction)"""
+        payload = {field: data.get(field) for field in CACHED_FIELDS}
+        payload["valor"] = str(data["valor"])
+        payload["parcelas"] = int(data.get("parcelas", 1))
+        payload["day_offset"] = (date.fromisoformat(data["data"]) - today).days
+
+        try:
+            await self.client.set(self.key_for(text), json.dumps(payload), ex=self.ttl_seconds)
+        except Exception as e:
+            logger.warning(f"⚠️ Falha ao gravar cache de interpretação: {str(e)}")
@@ -0,0 +1,22 @@
+EXPENSE_FIELDS_PROMPT = """
+        Extraia os seguintes campos em formato JSON:
+        - item: O nome do produto, serviço ou origem do dinheiro (ex: "Tênis de corrida", "Salário", "Reembolso")
+        - valor: O valor total numérico (ex: 350.00)
+        - data: A data no formato YYYY-MM-DD (se não houver uma data na mensagem, use a data de hoje)
+        - categoria: Uma categoria curta (ex: "Vestimento", "Lazer", "Alimentação", "Salário", "Investimentos")
+        - transaction_type: "expense" para gastos/despesas, ou "income" para ganhos/entradas de dinheiro.
+        - parcelas: Número de parcelas (inteiro, padrão 1 se não mencionado)
+        - metodo_pagamento: "credito" se for mencionado crédito ou parcelado, caso contrário "debito" ou outros.
+        - descricao: A mensagem original na íntegra.
+        """
+
+SINGLE_SYSTEM_PROMPT = """
+        Você é um assistente de finanças pessoais. Sua tarefa é extrair informações de uma mensagem de transação financeira.
+        """ + EXPENSE_FIELDS_PROMPT
+
+BATCH_SYSTEM_PROMPT = """
+        Você é um assistente de finanças pessoais. Você receberá uma lista JSON de mensagens de transações financeiras,
+        cada uma com "index", "mensagem" e "data_de_hoje".
+        Responda com um objeto JSON {"results": [...]} contendo exatamente um objeto por mensagem, com o mesmo "index".
+        Para cada mensagem:
+        """ + EXPENSE_FIELDS_PROMPT
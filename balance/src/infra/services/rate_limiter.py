@@ -0,0 +1,73 @@
+import asyncio
+import random
+import time
+from openai import APIConnectionError, InternalServerError, RateLimitError
+from typing import Callable, Awaitable, TypeVar
+from ...infra.core.config import settings
+from ...infra.core.logger import logger
+
+T = TypeVar("T")
+
+# Falhas transitórias repetidas com backoff: 429, 5xx e rede/timeout (APITimeoutError
+# é um APIConnectionError). O cliente da OpenAI é criado sem retries próprios
+RETRYABLE_ERRORS = (RateLimitError, APIConnectionError, InternalServerError)
+
+class RateLimiter:
+    """Limita chamadas simultâneas e requisições por minuto, com backoff com jitter em falhas transitórias"""
+
+    def __init__(
+        self,
+        max_concurrency: int = settings.OPENAI_MAX_CONCURRENCY,
+        requests_per_minute: int = settings.OPENAI_REQUESTS_PER_MINUTE,
+        max_retries: int = settings.OPENAI_MAX_RETRIES,
+        backoff_base_seconds: float = settings.OPENAI_BACKOFF_BASE_SECONDS,
+    ):
+        self.max_retries = max_retries
+        self.backoff_base_seconds = backoff_base_seconds
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._rate = requests_per_minute / 60
+        self._capacity = max(1.0, float(max_concurrency))
+        self._tokens = self._capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def _acquire_token(self):
+        """Token bucket: reabastece na taxa contratada e espera quando vazio"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self._tokens) / self._rate)
+
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        retry_after = getattr(getattr(error, "response", None), "headers", {}).get("retry-after")
+        try:
+            delay = float(retry_after)
+        except (TypeError, ValueError):
+            delay = self.backoff_base_seconds * (2 ** attempt)
+        # Jitter evita que todos os chamadores voltem ao mesmo tempo
+        return delay * random.uniform(0.5, 1.5)
+
+    async def run(self, call: Callable[[], Awaitable[T]]) -> T:
+        """Executa a chamada respeitando os limites, repetindo em 429, 5xx e falhas de rede"""
+        attempt = 0
+        while True:
+            await self._acquire_token()
+            async with self._semaphore:
+                try:
+                    return await call()
+                except RETRYABLE_ERRORS as e:
+                    if attempt >= self.max_retries:
+                        raise
+                    delay = self._backoff(attempt, e)
+                    error = type(e).__name__
+
+            logger.warning(f"⏳ OpenAI falhou ({error}), nova tentativa em {delay:.1f}s")
+            attempt += 1
+            await asyncio.sleep(delay)
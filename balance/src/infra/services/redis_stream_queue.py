@@ -0,0 +1,112 @@
+import json
+import redis.asyncio as redis
+from redis.exceptions import ResponseError
+from typing import Dict, Any, Optional, Tuple
+from ...domain.interfaces.services.imessage_queue import IMessageQueue, QueueFullError
+from ...infra.core.config import settings
+from ...infra.core.logger import logger
+
+StreamEntry = Tuple[str, Dict[str, str]]
+
+class RedisStreamQueue(IMessageQueue):
+    def __init__(
+        self,
+        client: redis.Redis,
+        stream: str = settings.INGESTION_STREAM,
+        group: str = settings.INGESTION_GROUP,
+        dead_letter_stream: str = settings.INGESTION_DEAD_LETTER_STREAM,
+        max_backlog: int = settings.INGESTION_MAX_BACKLOG,
+        dedupe_ttl_seconds: int = settings.INGESTION_DEDUPE_TTL_SECONDS,
+    ):
+        self.client = client
+        self.stream = stream
+        self.group = group
+        self.dead_letter_stream = dead_letter_stream
+        self.max_backlog = max_backlog
+        self.dedupe_ttl_seconds = dedupe_ttl_seconds
+
+    async def enqueue(self, update: Dict[str, Any]) -> Optional[str]:
+        """Publica o update no stream, ignorando reentregas e recusando quando o backlog está cheio"""
+        backlog = await self.depth()
+        if backlog >= self.max_backlog:
+            raise QueueFullError(f"Backlog de ingestão cheio ({backlog} mensagens)")
+
+        dedupe_key = self._dedupe_key(update)
+        if dedupe_key and not await self.client.set(dedupe_key, 1, nx=True, ex=self.dedupe_ttl_seconds):
+            logger.info(f"🔁 Update {update.get('update_id')} já recebido, ignorando reentrega")
+            return None
+
+        try:
+            entry_id = await self.client.xadd(self.stream, {"update": json.dumps(update)})
+        except Exception:
+            # Libera a chave para que a reentrega do Telegram consiga enfileirar
+            if dedupe_key:
+                await self.client.delete(dedupe_key)
+            raise
+
+        logger.info(f"📬 Update enfileirado no stream {self.stream}: {entry_id}")
+        return entry_id
+
+    async def depth(self) -> int:
+        """Backlog atual do stream: o worker remove as entradas processadas, então XLEN é o backlog real"""
+        return await self.client.xlen(self.stream)
+
+    def _dedupe_key(self, update: Dict[str, Any]) -> Optional[str]:
+        update_id = update.get("update_id")
+        return f"{self.stream}:seen:{update_id}" if update_id is not None else None
+
+    async def ensure_group(self):
+        """Cria o consumer group (e o stream) caso ainda não existam"""
+        try:
+            await self.client.xgroup_create(self.stream, self.group, id="0", mkstream=True)
+            logger.info(f"✅ Consumer group {self.group} criado em {self.stream}")
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    async def read(self, consumer: str, block_ms: int = settings.INGESTION_BLOCK_MS) -> Optional[StreamEntry]:
+        """Lê a próxima entrada nova destinada ao consumidor"""
+        response = await self.client.xreadgroup(
+            self.group,
+            consumer,
+            streams={self.stream: ">"},
+            count=1,
+            block=block_ms
+        )
+        for _, entries in response or []:
+            for entry in entries:
+                return entry
+        return None
+
+    async def claim_stale(self, consumer: str, min_idle_ms: int = settings.INGESTION_CLAIM_IDLE_MS) -> Optional[StreamEntry]:
+        """Assume uma entrada pendente abandonada por outro consumidor (ex: worker reiniciado)"""
+        _, entries, *_ = await self.client.xautoclaim(
+            self.stream,
+            self.group,
+            consumer,
+            min_idle_ms,
+            start_id="0-0",
+            count=1
+        )
+        return entries[0] if entries else None
+
+    async def delivery_count(self, entry_id: str) -> int:
+        """Quantas vezes a entrada já foi entregue a algum consumidor"""
+        pending = await self.client.xpending_range(self.stream, self.group, entry_id, entry_id, 1)
+        return pending[0]["times_delivered"] if pending else 0
+
+    async def ack(self, entry_id: str):
+        """Confirma o processamento e remove a entrada do stream"""
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.xack(self.stream, self.group, entry_id)
+            pipe.xdel(self.stream, entry_id)
+            await pipe.execute()
+
+    async def dead_letter(self, entry_id: str, fields: Dict[str, str], reason: str):
+        """Move a entrada para o stream de dead-letter e a confirma no stream principal"""
+        await self.client.xadd(
+            self.dead_letter_stream,
+            {**fields, "source_id": entry_id, "reason": reason}
+        )
+        await self.ack(entry_id)
+        logger.error(f"☠️ Update {entry_id} enviado para {self.dead_letter_stream}: {reason}")
@@ -0,0 +1,113 @@
+import asyncio
+import hashlib
+import redis.asyncio as redis
+from datetime import date
+from typing import Optional, List, Iterable, Tuple
+from ...infra.core.config import settings
+from ...infra.core.logger import logger
+
+def month_count(start: date, end: date) -> int:
+    """Quantidade de meses do intervalo (inclusive), sem montar a lista"""
+    return (end.year - start.year) * 12 + end.month - start.month + 1
+
+def months_between(start: date, end: date) -> List[str]:
+    """Buckets YYYY-MM cobertos pelo intervalo (inclusive)"""
+    months = []
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        months.append(f"{year:04d}-{month:02d}")
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+class ResponseCache:
+    """
+    Respostas já serializadas das consultas de período. Cada mês tem um contador de
+    versão que entra na chave: uma escrita incrementa o contador dos meses que tocou
+    e as respostas que cobrem esses meses deixam de ser encontradas.
+    """
+
+    def __init__(
+        self,
+        client: redis.Redis,
+        ttl_seconds: int = settings.RESPONSE_CACHE_TTL_SECONDS,
+        max_months: int = settings.RESPONSE_CACHE_MAX_MONTHS,
+        prefix: str = "resp:",
+        reinvalidate_after: float = 0,
+    ):
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.max_months = max_months
+        self.prefix = prefix
+        self.reinvalidate_after = reinvalidate_after
+        self._pending: set = set()
+
+    def _version_key(self, month: str) -> str:
+        return f"{self.prefix}month:{month}"
+
+    async def key_for(self, scope: str, params: Iterable[Tuple[str, str]], start: date, end: date) -> Optional[str]:
+        """Chave da resposta: parâmetros normalizados + versão de cada mês do período"""
+        # Testa o tamanho antes de montar os buckets: sem período a busca cobre 1900..9999
+        count = month_count(start, end)
+        if count < 1 or count > self.max_months:
+            return None
+        months = months_between(start, end)
+
+        try:
+            versions = await self.client.mget([self._version_key(m) for m in months])
+        except Exception as e:
+            logger.warning(f"⚠️ Cache de respostas indisponível: {str(e)}")
+            return None
+
+        normalized = "&".join(f"{k}={v}" for k, v in sorted(params))
+        stamp = ",".join(v or "0" for v in versions)
+        digest = hashlib.sha1(f"{normalized}|{stamp}".encode("utf-8")).hexdigest()
+        return f"{self.prefix}{scope}:{digest}"
+
+    async def get(self, key: str) -> Optional[bytes]:
+        try:
+            body = await self.client.get(key)
+            # O cliente compartilhado decodifica respostas (decode_responses=True)
+            return body.encode("utf-8") if isinstance(body, str) else body
+        except Exception as e:
+            logger.warning(f"⚠️ Cache de respostas indisponível: {str(e)}")
+            return None
+
+    async def set(self, key: str, body: bytes):
+        try:
+            await self.client.set(key, body, ex=self.ttl_seconds)
+        except Exception as e:
+            logger.warning(f"⚠️ Falha ao gravar cache de respostas: {str(e)}")
+
+    async def invalidate(self, months: Iterable[str]):
+        """Incrementa a versão dos meses escritos (respostas antigas expiram pelo TTL)"""
+        months = sorted(set(months))
+        if not months:
+            return
+
+        await self._bump(months)
+
+        if self.reinvalidate_after:
+            # Leitura em réplica atrasada logo após a escrita pode ter guardado a resposta
+            # antiga sob a versão nova: passado o atraso máximo tolerado, invalida de novo
+            task = asyncio.create_task(self._bump_later(months))
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
+
+    async def _bump_later(self, months: List[str]):
+        await asyncio.sleep(self.reinvalidate_after)
+        await self._bump(months)
+
+    async def _bump(self, months: List[str]):
+
+        try:
+            async with self.client.pipeline(transaction=False) as pipe:
+                for month in months:
+                    pipe.incr(self._version_key(month))
+                await pipe.execute()
+            logger.debug(f"🧹 Cache de respostas invalidado: {', '.join(months)}")
+        except Exception as e:
+            logger.warning(f"⚠️ Falha ao invalidar cache de respostas: {str(e)}")
+
+    @staticmethod
+    def etag(body: bytes) -> str:
+        return '"' + hashlib.sha1(body).hexdigest() + '"'
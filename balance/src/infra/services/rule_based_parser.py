@@ -0,0 +1,258 @@
+import re
+import unicodedata
+from datetime import date, timedelta
+from decimal import Decimal, InvalidOperation
+from typing import Optional, Dict, Any, List
+from ...infra.core.config import settings
+from ...infra.core.logger import logger
+
+AMOUNT_PATTERN = re.compile(r"^(?:r\$)?(\d{1,3}(?:\.\d{3})+(?:,\d{1,2})?|\d+(?:[.,]\d{1,2})?)$")
+DATE_PATTERN = re.compile(r"^(\d{1,2})/(\d{1,2})(?:/(\d{2}|\d{4}))?$")
+INSTALLMENTS_PATTERN = re.compile(r"^(\d{1,2})x$")
+
+RELATIVE_DAYS = {"hoje": 0, "ontem": 1, "anteontem": 2}
+INSTALLMENT_WORDS = {"x", "vezes"}
+PARCELADO_WORDS = {"parcelado", "parcelada"}
+PAYMENT_WORDS = {
+    "credito": "credito",
+    "cartao": "credito",
+    "debito": "debito",
+    "pix": "pix",
+    "dinheiro": "dinheiro",
+}
+FILLER_WORDS = {
+    "r$", "reais", "no", "na", "de", "do", "da", "em", "com", "por",
+    "pelo", "pela", "e", "o", "a", "gastei", "paguei", "comprei",
+}
+
+# Palavra normalizada -> (categoria, transaction_type)
+KEYWORDS = {
+    "salario": ("Salário", "income"),
+    "recebi": ("Receitas", "income"),
+    "reembolso": ("Reembolso", "income"),
+    "freela": ("Freelance", "income"),
+    "rendimento": ("Investimentos", "income"),
+    "dividendos": ("Investimentos", "income"),
+    "mercado": ("Alimentação", "expense"),
+    "supermercado": ("Alimentação", "expense"),
+    "padaria": ("Alimentação", "expense"),
+    "restaurante": ("Alimentação", "expense"),
+    "lanche": ("Alimentação", "expense"),
+    "ifood": ("Alimentação", "expense"),
+    "almoco": ("Alimentação", "expense"),
+    "jantar": ("Alimentação", "expense"),
+    "cafe": ("Alimentação", "expense"),
+    "pizza": ("Alimentação", "expense"),
+    "feira": ("Alimentação", "expense"),
+    "acougue": ("Alimentação", "expense"),
+    "uber": ("Transporte", "expense"),
+    "taxi": ("Transporte", "expense"),
+    "onibus": ("Transporte", "expense"),
+    "metro": ("Transporte", "expense"),
+    "gasolina": ("Transporte", "expense"),
+    "combustivel": ("Transporte", "expense"),
+    "estacionamento": ("Transporte", "expense"),
+    "pedagio": ("Transporte", "expense"),
+    "netflix": ("Lazer", "expense"),
+    "spotify": ("Lazer", "expense"),
+    "cinema": ("Lazer", "expense"),
+    "bar": ("Lazer", "expense"),
+    "cerveja": ("Lazer", "expense"),
+    "show": ("Lazer", "expense"),
+    "farmacia": ("Saúde", "expense"),
+    "remedio": ("Saúde", "expense"),
+    "medico": ("Saúde", "expense"),
+    "consulta": ("Saúde", "expense"),
+    "dentista": ("Saúde", "expense"),
+    "academia": ("Saúde", "expense"),
+    "aluguel": ("Moradia", "expense"),
+    "condominio": ("Moradia", "expense"),
+    "luz": ("Moradia", "expense"),
+    "energia": ("Moradia", "expense"),
+    "agua": ("Moradia", "expense"),
+    "internet": ("Moradia", "expense"),
+    "curso": ("Educação", "expense"),
+    "livro": ("Educação", "expense"),
+    "faculdade": ("Educação", "expense"),
+}
+
+def normalize(token: str) -> str:
+    """Minúsculas e sem acentos, para comparar com as palavras-chave"""
+    decomposed = unicodedata.normalize("NFKD", token.lower())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+def tokenize(text: str) -> List[str]:
+    """Separa por espaços removendo pontuação nas bordas ("ontem," -> "ontem")"""
+    return [t.strip(".,;:!?") for t in text.split() if t.strip(".,;:!?")]
+
+def parse_amount(token: str) -> Optional[Decimal]:
+    """Converte valores no formato brasileiro (1.234,56 / 23,50 / 180) para Decimal"""
+    match = AMOUNT_PATTERN.match(token)
+    if not match:
+        return None
+
+    raw = match.group(1)
+    if "," in raw:
+        raw = raw.replace(".", "").replace(",", ".")
+    elif re.search(r"\.\d{3}$", raw):
+        # "1.500" é milhar, não decimal
+        raw = raw.replace(".", "")
+
+    try:
+        value = Decimal(raw)
+    except InvalidOperation:
+        return None
+    return value if value > 0 else None
+
+def resolve_date(tokens: List[str], today: date) -> Optional[date]:
+    """Resolve hoje/ontem/anteontem, "dia 12" e dd/mm[/aaaa] para uma data absoluta"""
+    for i, token in enumerate(tokens):
+        if token in RELATIVE_DAYS:
+            return today - timedelta(days=RELATIVE_DAYS[token])
+
+        if token == "dia" and i + 1 < len(tokens) and tokens[i + 1].isdigit():
+            day = int(tokens[i + 1])
+            candidate = _safe_date(today.year, today.month, day)
+            if candidate and candidate > today:
+                # "dia 28" citado no dia 3 se refere ao mês anterior
+                year, month = (today.year - 1, 12) if today.month == 1 else (today.year, today.month - 1)
+                candidate = _safe_date(year, month, day)
+            return candidate
+
+        match = DATE_PATTERN.match(token)
+        if match:
+            day, month, year = match.groups()
+            year = int(year) if year else today.year
+            if year < 100:
+                year += 2000
+            return _safe_date(year, int(month), int(day))
+
+    return None
+
+def _safe_date(year: int, month: int, day: int) -> Optional[date]:
+    try:
+        return date(year, month, day)
+    except ValueError:
+        return None
+
+class RuleBasedParser:
+    """Parser determinístico para mensagens simples ("uber 23,50", "mercado 180 ontem")"""
+
+    def __init__(self, min_confidence: float = settings.FAST_PARSER_MIN_CONFIDENCE):
+        self.min_confidence = min_confidence
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def parse(self, text: str, today: date) -> Optional[Dict[str, Any]]:
+        """Retorna os campos no mesmo formato da IA ou None se a confiança for baixa"""
+        result = self.extract(text, today)
+
+        if result and result["confidence"] >= self.min_confidence:
+            self.hits += 1
+            logger.info(f"⚡ Fast-path interpretou a mensagem (hit rate {self.hit_rate:.0%}): {text}")
+            return result
+
+        self.misses += 1
+        logger.debug(f"Fast-path sem confiança, usando IA (hit rate {self.hit_rate:.0%}): {text}")
+        return None
+
+    def extract(self, text: str, today: date) -> Optional[Dict[str, Any]]:
+        """Extrai os campos e uma nota de confiança entre 0 e 1"""
+        original = tokenize(text)
+        tokens = [normalize(t) for t in original]
+
+        transaction_date = today
+        has_date = any(
+            t in RELATIVE_DAYS
+            or DATE_PATTERN.match(t)
+            or (t == "dia" and i + 1 < len(tokens) and tokens[i + 1].isdigit())
+            for i, t in enumerate(tokens)
+        )
+        if has_date:
+            transaction_date = resolve_date(tokens, today)
+            if transaction_date is None:
+                return None
+
+        amounts: List[Decimal] = []
+        item_words: List[str] = []
+        parcelas = 1
+        parcelado = False
+        metodo_pagamento = "debito"
+        confidence = 1.0
+
+        skip_next = False
+        for i, token in enumerate(tokens):
+            if skip_next:
+                skip_next = False
+                continue
+
+            next_token = tokens[i + 1] if i + 1 < len(tokens) else None
+
+            if token in RELATIVE_DAYS or DATE_PATTERN.match(token):
+                continue
+            if token == "dia" and next_token and next_token.isdigit():
+                skip_next = True
+                continue
+
+            installments = INSTALLMENTS_PATTERN.match(token)
+            if installments or (token.isdigit() and next_token in INSTALLMENT_WORDS):
+                parcelas = int(installments.group(1) if installments else token)
+                skip_next = not installments
+                continue
+
+            if token in PARCELADO_WORDS:
+                parcelado = True
+                continue
+            if token in PAYMENT_WORDS:
+                metodo_pagamento = PAYMENT_WORDS[token]
+                continue
+            if token in FILLER_WORDS:
+                continue
+
+            amount = parse_amount(token)
+            if amount is not None:
+                amounts.append(amount)
+                continue
+
+            item_words.append(original[i])
+
+        # Sem valor único ou sem item não há como adivinhar: fica para a IA
+        if len(amounts) != 1 or not item_words or parcelas < 1:
+            return None
+
+        if parcelas > 1 or parcelado:
+            metodo_pagamento = "credito"
+        if parcelado and parcelas == 1:
+            # "parcelado" sem número de parcelas
+            confidence -= 0.5
+
+        # Palavras-chave que discordam (ex: "reembolso mercado": receita ou despesa?)
+        # também ficam para a IA
+        matches = {KEYWORDS[normalize(w)] for w in item_words if normalize(w) in KEYWORDS}
+        if len(matches) != 1:
+            return None
+
+        categoria, transaction_type = matches.pop()
+        if len(item_words) > 3:
+            # Descrições longas costumam carregar contexto que só a IA entende
+            confidence -= 0.3
+
+        item = " ".join(item_words)
+        return {
+            "item": item[0].upper() + item[1:],
+            "valor": str(amounts[0]),
+            "data": transaction_date.isoformat(),
+            "categoria": categoria,
+            "transaction_type": transaction_type,
+            "parcelas": parcelas,
+            "metodo_pagamento": metodo_pagamento,
+            "confidence": confidence,
+        }
+
+# Instância global (acumula as métricas de hit rate do processo)
+rule_based_parser = RuleBasedParser()
@@ -1,28 +1,24 @@
-from fastapi import APIRouter, Depends
-import asyncpg
+from fastapi import APIRouter
 from datetime import datetime
 
-from ...infra.data.database import get_db
+from ...infra.data.database import db
 from ..viewmodels.schemas import HealthResponse
 from ...infra.core.config import settings
-from ...infra.core.logger import logger
 
 router = APIRouter(prefix="/health", tags=["Health"])
 
 @router.get("", response_model=HealthResponse)
-async def health_check(db: asyncpg.Pool = Depends(get_db)):
-    """Health check do serviço"""
-    try:
-        await db.fetchval("SELECT 1")
-        db_status = "connected"
-    except Exception as e:
-        logger.error(f"❌ Erro na conexão com banco: {str(e)}")
-        db_status = "disconnected"
+async def health_check():
+    """Health check do serviço (primário e cada réplica de leitura)"""
+    pools = await db.pool_status()
+    db_status = pools["primary"]
     
+    # Réplica fora do ar não derruba o serviço: as leituras voltam para o primário
     return HealthResponse(
         status="healthy" if db_status == "connected" else "unhealthy",
         service=settings.APP_NAME,
         version=settings.APP_VERSION,
         timestamp=datetime.now(),
-        database=db_status
-    )
\ No newline at end of file
+        database=db_status,
+        pools=pools
+    )
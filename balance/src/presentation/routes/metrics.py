@@ -0,0 +1,40 @@
+import time
+from fastapi import APIRouter, Depends, Request, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+from ...domain.interfaces.services.imessage_queue import IMessageQueue
+from ...infra.core.config import settings
+from ...infra.core.dependencies import get_message_queue
+from ...infra.core.logger import logger
+from ...infra.core.metrics import HTTP_REQUEST_SECONDS, INGESTION_QUEUE_DEPTH
+from ...infra.data.database import db
+
+router = APIRouter(tags=["Metrics"])
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics(queue: IMessageQueue = Depends(get_message_queue)):
+    """Métricas no formato de exposição do Prometheus"""
+    db.update_pool_metrics()
+
+    try:
+        INGESTION_QUEUE_DEPTH.labels(settings.INGESTION_STREAM).set(await queue.depth())
+    except Exception as e:
+        logger.warning(f"⚠️ Não foi possível medir a fila de ingestão: {str(e)}")
+
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+async def track_request_latency(request: Request, call_next):
+    """Middleware HTTP: latência por rota (template do path, não o path com valores)"""
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        HTTP_REQUEST_SECONDS.labels(
+            request.method,
+            getattr(route, "path", "unmatched"),
+            str(status),
+        ).observe(time.perf_counter() - started)
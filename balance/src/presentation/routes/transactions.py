@@ -1,42 +1,334 @@
-from fastapi import APIRouter, Depends, Query, HTTPException
-from typing import Optional, List
-from ...infra.core.dependencies import get_transaction_repo
+from fastapi import APIRouter, Depends, Query, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+from functools import partial
+from pydantic import BaseModel
+from typing import Optional, List, Literal, Callable, Awaitable, Union
+from decimal import Decimal
+from ...infra.core.config import settings
+from ...infra.core.dependencies import get_transaction_repo, get_response_cache
+from ...infra.services.response_cache import ResponseCache
 from ...domain.interfaces.repositories.itransaction_repository import ITransactionRepository
-from ..viewmodels.schemas import ExpenseListResponse, ExpenseResponse
+from ..viewmodels.cursor import encode_cursor, decode_cursor, encode_search_cursor, decode_search_cursor
+from ..viewmodels.export_writers import ndjson_chunks, csv_chunks
+from ..viewmodels.json_body import dumps
+from ..viewmodels.schemas import ExpenseListResponse, PeriodSummaryResponse, BatchImportResponse, SearchResponse, RunningBalanceResponse
 from ...infra.core.logger import logger
+from ...domain.models.transaction_filter import TransactionFilter
 from datetime import date
-from ...application.usecases.list_transactions_by_period import ListTransactionsByPeriod
+from ...application.usecases.list_transactions_by_period import ListTransactionsByPeriod, PageKey
+from ...application.usecases.summarize_period import SummarizePeriod
+from ...application.usecases.import_transactions import ImportTransactions
+from ...application.usecases.export_transactions import ExportTransactions
+from ...application.usecases.search_transactions import SearchTransactions, SearchKey
+from ...application.usecases.running_balance import RunningBalance
+from ...infra.data.row_readers import read_csv, read_ndjson
+from ...infra.data.arrow_export import stream_table, FORMATS as ARROW_FORMATS, FULL_RANGE
 
 router = APIRouter(prefix="/transactions", tags=["Transactions"])
 
+async def cached_json(
+    request: Request,
+    cache: Optional[ResponseCache],
+    scope: str,
+    start_date: date,
+    end_date: date,
+    build: Callable[[], Awaitable[Union[BaseModel, bytes]]],
+) -> Response:
+    """
+    Serve a resposta serializada do cache (ou monta, serializa e guarda) com ETag;
+    If-None-Match igual ao ETag atual responde 304 sem corpo
+    """
+    key = await cache.key_for(scope, request.query_params.multi_items(), start_date, end_date) if cache else None
+    body = await cache.get(key) if key else None
+
+    if body is None:
+        body = await build()
+        if isinstance(body, BaseModel):
+            body = body.model_dump_json().encode("utf-8")
+        if key:
+            await cache.set(key, body)
+
+    etag = ResponseCache.etag(body)
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+def get_filters(
+    owner_id: Optional[int] = Query(None, description="Dono do ledger (id do chat do Telegram); sem ele, todos os donos"),
+    transaction_type: Optional[Literal["income", "expense"]] = Query(None, description="income ou expense"),
+    categoria: Optional[List[str]] = Query(None, description="Uma ou mais categorias (repita o parâmetro)"),
+    min_valor: Optional[Decimal] = Query(None, ge=0, description="Valor mínimo"),
+    max_valor: Optional[Decimal] = Query(None, ge=0, description="Valor máximo"),
+) -> TransactionFilter:
+    """Filtros comuns às consultas de período"""
+    return TransactionFilter(
+        owner_id=owner_id,
+        transaction_type=transaction_type,
+        categorias=categoria,
+        min_valor=min_valor,
+        max_valor=max_valor,
+    )
+
 @router.get("/period", response_model=ExpenseListResponse)
 async def list_by_period(
+    request: Request,
     start_date: date = Query(..., description="Data inicial YYYY-MM-DD"),
     end_date: date = Query(..., description="Data final YYYY-MM-DD"),
+    limit: int = Query(100, ge=1, le=1000, description="Máximo de transações por página"),
+    cursor: Optional[str] = Query(None, description="next_cursor da página anterior"),
+    fields: Literal["full", "slim"] = Query("full", description="slim omite a descricao de cada transação"),
+    filters: TransactionFilter = Depends(get_filters),
     transaction_repo: ITransactionRepository = Depends(get_transaction_repo),
+    cache: Optional[ResponseCache] = Depends(get_response_cache),
 ):
-    """Lista transações por período e retorna o montante"""
+    """
+    Lista transações por período, paginadas (mais recentes primeiro).
+    `total` e `balance` são do período inteiro; siga `next_cursor` até ser null.
+    """
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
+    return await cached_json(request, cache, "period", start_date, end_date, lambda: build_period_page(
+        transaction_repo, start_date, end_date, limit, after, filters, fields == "slim"
+    ))
+
+async def build_period_page(
+    transaction_repo: ITransactionRepository,
+    start_date: date,
+    end_date: date,
+    limit: int,
+    after: Optional[PageKey],
+    filters: TransactionFilter,
+    slim: bool = False,
+) -> bytes:
+    """
+    Monta o corpo de ExpenseListResponse direto das linhas do banco: as linhas já
+    vêm só com os campos de ExpenseResponse, então não há modelo por linha
+    """
     use_case = ListTransactionsByPeriod(transaction_repo)
 
-    transactions, total = await use_case.execute(
+    rows, summary, next_key = await use_case.execute_rows(
+        start_date=start_date,
+        end_date=end_date,
+        limit=limit,
+        after=after,
+        filters=filters,
+        slim=slim,
+    )
+
+    if summary is None:
+        raise HTTPException(status_code=503, detail="Não foi possível totalizar o período")
+
+    return dumps({
+        "total": summary.count,
+        "balance": summary.net,
+        "transactions": rows,
+        "next_cursor": encode_cursor(next_key) if next_key else None,
+    })
+
+@router.get("/summary", response_model=PeriodSummaryResponse)
+async def summarize_period(
+    request: Request,
+    start_date: date = Query(..., description="Data inicial YYYY-MM-DD"),
+    end_date: date = Query(..., description="Data final YYYY-MM-DD"),
+    filters: TransactionFilter = Depends(get_filters),
+    transaction_repo: ITransactionRepository = Depends(get_transaction_repo),
+    cache: Optional[ResponseCache] = Depends(get_response_cache),
+):
+    """Receitas, despesas, saldo e quantidade de transações do período (sem a lista)"""
+
+    return await cached_json(request, cache, "summary", start_date, end_date, lambda: build_summary(
+        transaction_repo, start_date, end_date, filters
+    ))
+
+async def build_summary(
+    transaction_repo: ITransactionRepository,
+    start_date: date,
+    end_date: date,
+    filters: TransactionFilter,
+) -> PeriodSummaryResponse:
+    use_case = SummarizePeriod(transaction_repo)
+
+    summary = await use_case.execute(
         start_date=start_date,
         end_date=end_date,
+        filters=filters,
     )
 
-    return ExpenseListResponse(
-        total=len(transactions),
-        balance=total,
-        transactions=[
-            ExpenseResponse(
-                id=t.id,
-                item=t.item,
-                valor=t.valor,
-                data=t.data,
-                categoria=t.categoria,
-                descricao=t.descricao,
-                transaction_type=t.transaction_type,
-                created_at=t.created_at
-            ) for t in transactions
-        ]
+    if summary is None:
+        raise HTTPException(status_code=503, detail="Não foi possível totalizar o período")
+
+    return PeriodSummaryResponse(
+        start_date=start_date,
+        end_date=end_date,
+        income=summary.income,
+        expense=summary.expense,
+        balance=summary.net,
+        total=summary.count,
     )
+
+@router.get("/search", response_model=SearchResponse)
+async def search(
+    request: Request,
+    q: str = Query(..., min_length=2, max_length=100, description="Texto buscado no item e na mensagem (ex: ifood)"),
+    start_date: Optional[date] = Query(None, description="Data inicial YYYY-MM-DD (padrão: todo o ledger)"),
+    end_date: Optional[date] = Query(None, description="Data final YYYY-MM-DD (padrão: todo o ledger)"),
+    limit: int = Query(50, ge=1, le=500, description="Máximo de transações por página"),
+    cursor: Optional[str] = Query(None, description="next_cursor da página anterior"),
+    filters: TransactionFilter = Depends(get_filters),
+    transaction_repo: ITransactionRepository = Depends(get_transaction_repo),
+    cache: Optional[ResponseCache] = Depends(get_response_cache),
+):
+    """
+    Busca transações por texto (item com tolerância a erros de digitação e termos da
+    mensagem original), das mais relevantes para as menos. `total`, `income`,
+    `expense` e `balance` somam todos os resultados; siga `next_cursor` até ser null.
+    """
+    try:
+        after = decode_search_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    start_date = start_date or FULL_RANGE[0]
+    end_date = end_date or FULL_RANGE[1]
+
+    return await cached_json(request, cache, "search", start_date, end_date, lambda: build_search_page(
+        transaction_repo, q, start_date, end_date, limit, after, filters
+    ))
+
+async def build_search_page(
+    transaction_repo: ITransactionRepository,
+    text: str,
+    start_date: date,
+    end_date: date,
+    limit: int,
+    after: Optional[SearchKey],
+    filters: TransactionFilter,
+) -> bytes:
+    """Corpo de SearchResponse serializado direto das linhas (como build_period_page)"""
+    use_case = SearchTransactions(transaction_repo)
+
+    rows, summary, next_key = await use_case.execute(
+        text=text,
+        start_date=start_date,
+        end_date=end_date,
+        limit=limit,
+        after=after,
+        filters=filters,
+    )
+
+    if summary is None:
+        raise HTTPException(status_code=503, detail="Não foi possível totalizar a busca")
+
+    return dumps({
+        "total": summary.count,
+        "income": summary.income,
+        "expense": summary.expense,
+        "balance": summary.net,
+        "transactions": rows,
+        "next_cursor": encode_search_cursor(next_key) if next_key else None,
+    })
+
+@router.get("/running-balance", response_model=RunningBalanceResponse)
+async def running_balance(
+    start_date: date = Query(..., description="Data inicial YYYY-MM-DD"),
+    end_date: date = Query(..., description="Data final YYYY-MM-DD"),
+    owner_id: Optional[int] = Query(None, description="Dono do ledger (id do chat do Telegram); sem ele, todos os donos"),
+    transaction_repo: ITransactionRepository = Depends(get_transaction_repo),
+):
+    """
+    Saldo acumulado dia a dia: `balance` de cada dia é o saldo desde o início do
+    histórico até o fim daquele dia; `opening_balance` é o saldo antes de `start_date`.
+    A abertura vem dos snapshots mensais (comando `snapshots` da CLI), então o custo
+    depende só dos dias do período.
+    """
+    if end_date < start_date:
+        raise HTTPException(status_code=400, detail="end_date deve ser maior ou igual a start_date")
+    if (end_date - start_date).days >= settings.RUNNING_BALANCE_MAX_DAYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Período máximo de {settings.RUNNING_BALANCE_MAX_DAYS} dias",
+        )
+
+    result = await RunningBalance(transaction_repo).execute(
+        start_date=start_date,
+        end_date=end_date,
+        owner_id=owner_id,
+    )
+
+    if result is None:
+        raise HTTPException(status_code=503, detail="Não foi possível calcular o saldo acumulado")
+
+    opening_balance, days = result
+    # Sem cache de resposta: o saldo depende de meses anteriores ao período, fora das
+    # versões por mês usadas na chave do cache
+    return Response(content=dumps({
+        "start_date": start_date,
+        "end_date": end_date,
+        "opening_balance": opening_balance,
+        "days": days,
+    }), media_type="application/json")
+
+EXPORT_FORMATS = {
+    "ndjson": (ndjson_chunks, "application/x-ndjson", "ndjson"),
+    "csv": (csv_chunks, "text/csv; charset=utf-8", "csv"),
+    "arrow": (partial(stream_table, fmt="arrow"), ARROW_FORMATS["arrow"][1], ARROW_FORMATS["arrow"][0]),
+    "parquet": (partial(stream_table, fmt="parquet"), ARROW_FORMATS["parquet"][1], ARROW_FORMATS["parquet"][0]),
+}
+
+@router.get("/export")
+async def export_period(
+    start_date: date = Query(..., description="Data inicial YYYY-MM-DD"),
+    end_date: date = Query(..., description="Data final YYYY-MM-DD"),
+    format: Literal["ndjson", "csv", "arrow", "parquet"] = Query("ndjson", description="ndjson, csv, arrow (IPC stream) ou parquet"),
+    filters: TransactionFilter = Depends(get_filters),
+    transaction_repo: ITransactionRepository = Depends(get_transaction_repo),
+):
+    """
+    Exporta todas as transações do período (ordem cronológica) em streaming:
+    as linhas vêm de um cursor no banco e saem em blocos de tamanho fixo,
+    com memória constante independente do tamanho do período.
+    `arrow`/`parquet` saem colunares, em record batches de EXPORT_ARROW_BATCH_ROWS linhas.
+    """
+    chunks, media_type, extension = EXPORT_FORMATS[format]
+    rows = ExportTransactions(transaction_repo).execute(
+        start_date=start_date,
+        end_date=end_date,
+        filters=filters,
+    )
+
+    filename = f"transactions_{start_date.isoformat()}_{end_date.isoformat()}.{extension}"
+    return StreamingResponse(
+        chunks(rows),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+@router.post("/batch", response_model=BatchImportResponse)
+async def import_batch(
+    request: Request,
+    owner_id: int = Query(0, description="Dono do ledger (id do chat do Telegram) das linhas importadas"),
+    transaction_repo: ITransactionRepository = Depends(get_transaction_repo),
+):
+    """
+    Importa transações já estruturadas (NDJSON ou CSV com cabeçalho, conforme o Content-Type)
+    sem passar pela IA, todas no ledger de `owner_id`. Linhas inválidas são devolvidas em
+    `errors` com o número da linha.
+    """
+    content_type = request.headers.get("content-type", "")
+
+    if "csv" in content_type:
+        rows = read_csv(request.stream())
+    elif "json" in content_type or not content_type:
+        rows = read_ndjson(request.stream())
+    else:
+        raise HTTPException(status_code=415, detail="Use application/x-ndjson ou text/csv")
+
+    use_case = ImportTransactions(transaction_repo)
+    imported, rejected, errors = await use_case.execute(rows, owner_id)
+
+    return BatchImportResponse(imported=imported, rejected=rejected, errors=errors)
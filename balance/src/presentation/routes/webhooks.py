@@ -1,7 +1,8 @@
-from fastapi import APIRouter, Request, BackgroundTasks, Depends
+from fastapi import APIRouter, Request, Depends
+from fastapi.responses import JSONResponse
 from typing import Dict, Any
-from ...application.usecases.process_telegram_message import ProcessTelegramMessage
-from ...infra.core.dependencies import get_process_telegram_message
+from ...domain.interfaces.services.imessage_queue import IMessageQueue
+from ...infra.core.dependencies import get_message_queue
 from ...infra.core.logger import logger
 
 router = APIRouter(prefix="/webhooks", tags=["Webhooks"])
@@ -9,24 +10,31 @@ router = APIRouter(prefix="/webhooks", tags=["Webhooks"])
 @router.post("/telegram")
 async def handle_telegram_webhook(
     request: Request,
-    background_tasks: BackgroundTasks,
-    use_case: ProcessTelegramMessage = Depends(get_process_telegram_message)
+    queue: IMessageQueue = Depends(get_message_queue)
 ):
     """Endpoint para receber mensagens do Bot do Telegram"""
     try:
         payload = await request.json()
         message = payload.get("message") or payload.get("edited_message")
-        
+
         if not message or "text" not in message:
             return {"status": "ignored", "message": "No text message found"}
 
         text = message["text"]
         logger.info(f"📩 Nova mensagem do Telegram: {text}")
 
-        background_tasks.add_task(use_case.execute, text)
-        
-        return {"status": "ok"}
-        
     except Exception as e:
         logger.error(f"❌ Erro no webhook do Telegram: {str(e)}")
-        return {"status": "error", "message": str(e)}
\ No newline at end of file
+        return {"status": "error", "message": str(e)}
+
+    try:
+        # O processamento (IA + banco) acontece no worker de ingestão
+        entry_id = await queue.enqueue(payload)
+        if entry_id is None:
+            return {"status": "duplicate"}
+        return {"status": "ok"}
+
+    except Exception as e:
+        # Responder com erro faz o Telegram reenviar o update mais tarde
+        logger.error(f"❌ Erro ao enfileirar update do Telegram: {str(e)}")
+        return JSONResponse(status_code=503, content={"status": "error", "message": str(e)})
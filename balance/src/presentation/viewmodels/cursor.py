@@ -0,0 +1,35 @@
+import base64
+import json
+from datetime import date, datetime
+from ...application.usecases.list_transactions_by_period import PageKey
+from ...application.usecases.search_transactions import SearchKey
+
+def encode_cursor(key: PageKey) -> str:
+    """Cursor opaco para o cliente: a chave (data, created_at, id) da última linha da página"""
+    data, created_at, id = key
+    raw = json.dumps([data.isoformat(), created_at.isoformat(), id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> PageKey:
+    """Lança ValueError se o cursor não foi gerado por encode_cursor"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data, created_at, id = json.loads(raw)
+        return date.fromisoformat(data), datetime.fromisoformat(created_at), int(id)
+    except Exception as e:
+        raise ValueError(f"cursor inválido: {cursor}") from e
+
+def encode_search_cursor(key: SearchKey) -> str:
+    """Cursor da busca: a chave (rank, data, created_at, id) da última linha da página"""
+    rank, data, created_at, id = key
+    raw = json.dumps([rank, data.isoformat(), created_at.isoformat(), id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_search_cursor(cursor: str) -> SearchKey:
+    """Lança ValueError se o cursor não foi gerado por encode_search_cursor"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        rank, data, created_at, id = json.loads(raw)
+        return float(rank), date.fromisoformat(data), datetime.fromisoformat(created_at), int(id)
+    except Exception as e:
+        raise ValueError(f"cursor inválido: {cursor}") from e
@@ -0,0 +1,45 @@
+import csv
+import io
+from typing import Any, AsyncIterator, Mapping, Sequence
+from .json_body import dumps
+from ...infra.core.config import settings
+
+# Campos de ExpenseResponse, na ordem das colunas do CSV
+EXPORT_COLUMNS: Sequence[str] = (
+    "id", "item", "valor", "data", "categoria", "descricao", "transaction_type", "created_at", "parcela",
+)
+
+async def ndjson_chunks(
+    rows: AsyncIterator[Mapping[str, Any]],
+    chunk_bytes: int = settings.EXPORT_CHUNK_BYTES,
+) -> AsyncIterator[bytes]:
+    """Uma transação JSON por linha, agrupadas em blocos de ~`chunk_bytes`"""
+    buffer = bytearray()
+    async for row in rows:
+        buffer += dumps(dict(row))
+        buffer += b"\n"
+        if len(buffer) >= chunk_bytes:
+            yield bytes(buffer)
+            buffer.clear()
+
+    if buffer:
+        yield bytes(buffer)
+
+async def csv_chunks(
+    rows: AsyncIterator[Mapping[str, Any]],
+    chunk_bytes: int = settings.EXPORT_CHUNK_BYTES,
+) -> AsyncIterator[bytes]:
+    """CSV com cabeçalho, agrupado em blocos de ~`chunk_bytes`"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+
+    async for row in rows:
+        writer.writerow([row[column] for column in EXPORT_COLUMNS])
+        if buffer.tell() >= chunk_bytes:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
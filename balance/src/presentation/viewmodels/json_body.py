@@ -0,0 +1,16 @@
+import orjson
+from decimal import Decimal
+from typing import Any
+
+def _default(value: Any) -> Any:
+    # Decimal como string, no mesmo formato do model_dump_json do Pydantic ("10.00")
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Tipo não serializável: {type(value).__name__}")
+
+def dumps(obj: Any) -> bytes:
+    """
+    Serializa dicts/listas direto para bytes JSON (date/datetime em ISO 8601 pelo
+    próprio orjson), sem passar por modelos Pydantic
+    """
+    return orjson.dumps(obj, default=_default)
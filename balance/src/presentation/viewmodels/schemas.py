@@ -1,7 +1,7 @@
 from pydantic import BaseModel
 from datetime import datetime, date
 from decimal import Decimal
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 class ExpenseResponse(BaseModel):
     id: int
@@ -9,18 +9,60 @@ class ExpenseResponse(BaseModel):
     valor: Decimal
     data: date
     categoria: str
-    descricao: str
+    descricao: Optional[str] = None  # Ausente com fields=slim
     transaction_type: str
     created_at: datetime
+    parcela: Optional[int] = None  # Nº da parcela; com o id, identifica a linha (None em avulsas)
 
 class ExpenseListResponse(BaseModel):
     total: int
     balance: Decimal
     transactions: List[ExpenseResponse]
+    next_cursor: Optional[str] = None
+
+class SearchResultResponse(ExpenseResponse):
+    rank: float
+
+class SearchResponse(BaseModel):
+    total: int
+    income: Decimal
+    expense: Decimal
+    balance: Decimal
+    transactions: List[SearchResultResponse]
+    next_cursor: Optional[str] = None
+
+class PeriodSummaryResponse(BaseModel):
+    start_date: date
+    end_date: date
+    income: Decimal
+    expense: Decimal
+    balance: Decimal
+    total: int
+
+class BalanceDayResponse(BaseModel):
+    data: date
+    net: Decimal
+    balance: Decimal
+
+class RunningBalanceResponse(BaseModel):
+    start_date: date
+    end_date: date
+    opening_balance: Decimal
+    days: List[BalanceDayResponse]
+
+class BatchRowError(BaseModel):
+    line: int
+    error: str
+
+class BatchImportResponse(BaseModel):
+    imported: int
+    rejected: int
+    errors: List[BatchRowError]
 
 class HealthResponse(BaseModel):
     status: str
     service: str
     version: str
     timestamp: datetime
-    database: str
\ No newline at end of file
+    database: str
+    pools: Dict[str, str] = {}
\ No newline at end of file
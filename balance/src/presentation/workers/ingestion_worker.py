@@ -0,0 +1,134 @@
+import asyncio
+import json
+import signal
+import socket
+from typing import Dict, Optional
+from prometheus_client import start_http_server
+
+from ...application.usecases.process_telegram_message import ProcessOutcome, ProcessTelegramMessage
+from ...infra.core.config import settings
+from ...infra.core.dependencies import get_ai_agent, get_response_cache
+from ...infra.core.logger import logger
+from ...infra.data.database import db
+from ...infra.data.redis_client import redis_client
+from ...infra.data.repositories.transaction_repository import TransactionRepository
+from ...infra.services.openai_pool import openai_pool
+from ...infra.services.redis_stream_queue import RedisStreamQueue
+
+class IngestionWorker:
+    """Pool de consumidores do stream de updates do Telegram"""
+
+    def __init__(
+        self,
+        queue: RedisStreamQueue,
+        use_case: ProcessTelegramMessage,
+        concurrency: int = settings.INGESTION_CONCURRENCY,
+        max_deliveries: int = settings.INGESTION_MAX_DELIVERIES,
+        name: Optional[str] = None,
+    ):
+        self.queue = queue
+        self.use_case = use_case
+        self.concurrency = concurrency
+        self.max_deliveries = max_deliveries
+        self.name = name or socket.gethostname()
+        self._stopping = asyncio.Event()
+
+    def stop(self):
+        """Sinaliza para os consumidores encerrarem após a mensagem atual"""
+        logger.info("🛑 Encerrando worker de ingestão...")
+        self._stopping.set()
+
+    async def run(self):
+        """Inicia N consumidores no mesmo consumer group"""
+        await self.queue.ensure_group()
+        logger.info(f"👷 Worker {self.name} consumindo {self.queue.stream} com {self.concurrency} consumidores")
+
+        await asyncio.gather(*(
+            self._consume(f"{self.name}-{i}") for i in range(self.concurrency)
+        ))
+
+    async def _consume(self, consumer: str):
+        while not self._stopping.is_set():
+            try:
+                # Entradas abandonadas por consumidores mortos têm prioridade sobre as novas
+                entry = await self.queue.claim_stale(consumer)
+                if entry:
+                    await self.handle(*entry, reclaimed=True)
+                    continue
+
+                entry = await self.queue.read(consumer)
+                if entry:
+                    await self.handle(*entry)
+
+            except Exception as e:
+                logger.error(f"❌ Erro no consumidor {consumer}: {str(e)}")
+                await asyncio.sleep(1)
+
+    async def handle(self, entry_id: str, fields: Dict[str, str], reclaimed: bool = False):
+        """
+        Processa uma entrada do stream: ack quando gravou ou não havia o que gravar,
+        retry ou dead-letter quando a IA ou o banco falharam
+        """
+        if reclaimed and await self.queue.delivery_count(entry_id) > self.max_deliveries:
+            await self.queue.dead_letter(entry_id, fields, "limite de entregas excedido")
+            return
+
+        try:
+            update = json.loads(fields["update"])
+        except (KeyError, ValueError) as e:
+            await self.queue.dead_letter(entry_id, fields, f"payload inválido: {str(e)}")
+            return
+
+        message = update.get("message") or update.get("edited_message") or {}
+        text = message.get("text")
+
+        if not text:
+            await self.queue.ack(entry_id)
+            return
+
+        try:
+            outcome = await self.use_case.execute(
+                text,
+                chat_id=message.get("chat", {}).get("id"),
+                message_id=message.get("message_id")
+            )
+        except Exception as e:
+            logger.error(f"❌ Erro ao processar update {entry_id}: {str(e)}")
+            outcome = ProcessOutcome.FAILED
+
+        # Mensagem sem lançamento não melhora com nova entrega (só gastaria chamadas à IA)
+        if outcome in (ProcessOutcome.RECORDED, ProcessOutcome.NOTHING_TO_RECORD):
+            await self.queue.ack(entry_id)
+        elif await self.queue.delivery_count(entry_id) >= self.max_deliveries:
+            await self.queue.dead_letter(entry_id, fields, "processamento falhou")
+        else:
+            # Fica pendente no group e é reassumida por claim_stale após o tempo ocioso
+            logger.warning(f"⚠️ Update {entry_id} falhou, será reprocessado")
+
+async def main():
+    await db.connect()
+    await redis_client.connect()
+    await openai_pool.connect()
+
+    # As chamadas à IA e as escritas acontecem aqui, não na API: o worker expõe as próprias métricas
+    if settings.WORKER_METRICS_PORT:
+        start_http_server(settings.WORKER_METRICS_PORT)
+        logger.info(f"📈 Métricas do worker em :{settings.WORKER_METRICS_PORT}/metrics")
+
+    repo = TransactionRepository(db.pool, get_response_cache(redis_client.client))
+    use_case = ProcessTelegramMessage(repo, get_ai_agent(redis_client.client))
+    worker = IngestionWorker(RedisStreamQueue(redis_client.client), use_case)
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.stop)
+
+    try:
+        await worker.run()
+    finally:
+        await openai_pool.disconnect()
+        await redis_client.disconnect()
+        await db.disconnect()
+
+if __name__ == "__main__":
+    asyncio.run(main())
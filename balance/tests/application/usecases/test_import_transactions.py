@@ -0,0 +1,68 @@
+import pytest
+from unittest.mock import AsyncMock
+
+from src.application.usecases.import_transactions import ImportTransactions
+
+def _row(item="Uber", valor="25.00"):
+    return {
+        "item": item,
+        "valor": valor,
+        "data": "2023-01-02",
+        "categoria": "Transporte",
+        "descricao": "extrato do banco"
+    }
+
+async def _rows(*rows):
+    for row in rows:
+        yield row
+
+@pytest.mark.asyncio
+async def test_import_transactions_copies_in_chunks():
+    # Arrange
+    mock_repo = AsyncMock()
+    mock_repo.copy_many.side_effect = lambda chunk, owner_id: len(chunk)
+    
+    use_case = ImportTransactions(mock_repo, chunk_size=2)
+    
+    # Act
+    imported, rejected, errors = await use_case.execute(_rows(
+        (2, _row("Uber")), (3, _row("Mercado")), (4, _row("Padaria"))
+    ), owner_id=42)
+    
+    # Assert
+    assert (imported, rejected, errors) == (3, 0, [])
+    assert [len(call.args[0]) for call in mock_repo.copy_many.await_args_list] == [2, 1]
+    assert {call.args[1] for call in mock_repo.copy_many.await_args_list} == {42}
+
+@pytest.mark.asyncio
+async def test_import_transactions_reports_invalid_rows():
+    # Arrange
+    mock_repo = AsyncMock()
+    mock_repo.copy_many.side_effect = lambda chunk, owner_id: len(chunk)
+    
+    use_case = ImportTransactions(mock_repo, chunk_size=10, max_errors=1)
+    
+    # Act
+    imported, rejected, errors = await use_case.execute(_rows(
+        (1, _row(valor="-5")), (2, ValueError("JSON inválido")), (3, _row())
+    ))
+    
+    # Assert
+    assert (imported, rejected) == (1, 2)
+    assert errors[0]["line"] == 1
+    assert errors[0]["error"].startswith("valor:")
+
+@pytest.mark.asyncio
+async def test_import_transactions_copy_failure_rejects_chunk():
+    # Arrange
+    mock_repo = AsyncMock()
+    mock_repo.copy_many.return_value = 0
+    
+    use_case = ImportTransactions(mock_repo)
+    
+    # Act
+    imported, rejected, errors = await use_case.execute(_rows((2, _row()), (3, _row())))
+    
+    # Assert
+    assert (imported, rejected) == (0, 2)
+    assert [e["line"] for e in errors] == [2, 3]
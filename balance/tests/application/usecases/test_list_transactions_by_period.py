@@ -1,10 +1,12 @@
 import pytest
 from decimal import Decimal
-from datetime import datetime
+from datetime import datetime, date
 from unittest.mock import AsyncMock, Mock
 
 from src.application.usecases.list_transactions_by_period import ListTransactionsByPeriod
 from src.domain.models.transaction import Transaction
+from src.domain.models.period_summary import PeriodSummary
+from src.domain.models.transaction_filter import TransactionFilter
 
 @pytest.mark.asyncio
 async def test_list_transactions_by_period_execute():
@@ -20,15 +22,92 @@ async def test_list_transactions_by_period_execute():
     t2.transaction_type = "expense"
     
     mock_repo.list_by_period.return_value = [t1, t2]
+    mock_repo.summarize_period.return_value = PeriodSummary(
+        income=Decimal("100.00"), expense=Decimal("50.00"), net=Decimal("50.00"), count=2
+    )
     
     use_case = ListTransactionsByPeriod(mock_repo)
     start_date = datetime(2023, 1, 1)
     end_date = datetime(2023, 1, 31)
     
     # Act
-    transactions, total = await use_case.execute(start_date, end_date)
+    transactions, summary, next_key = await use_case.execute(start_date, end_date)
     
     # Assert
     assert len(transactions) == 2
-    assert total == Decimal("50.00") # 100 - 50
-    mock_repo.list_by_period.assert_awaited_once_with(start_date=start_date, end_date=end_date)
+    assert summary.net == Decimal("50.00") # 100 - 50
+    assert next_key is None
+    mock_repo.summarize_period.assert_awaited_once_with(start_date=start_date, end_date=end_date, filters=None)
+    mock_repo.list_by_period.assert_awaited_once_with(
+        start_date=start_date, end_date=end_date, limit=None, after=None, filters=None
+    )
+
+@pytest.mark.asyncio
+async def test_list_transactions_by_period_next_page():
+    # Arrange
+    mock_repo = AsyncMock()
+    
+    rows = []
+    for i in range(3):
+        t = Mock(spec=Transaction)
+        t.id = 10 - i
+        t.valor = Decimal("10.00")
+        t.transaction_type = "expense"
+        t.data = date(2023, 1, 20 - i)
+        t.created_at = datetime(2023, 1, 20 - i, 12, 0)
+        rows.append(t)
+    
+    mock_repo.list_by_period.return_value = rows
+    
+    use_case = ListTransactionsByPeriod(mock_repo)
+    after = (date(2023, 1, 21), datetime(2023, 1, 21, 8, 0), 11)
+    
+    # Act
+    transactions, _, next_key = await use_case.execute(
+        datetime(2023, 1, 1), datetime(2023, 1, 31), limit=2, after=after
+    )
+    
+    # Assert
+    assert len(transactions) == 2
+    assert next_key == (date(2023, 1, 19), datetime(2023, 1, 19, 12, 0), 9)
+    assert mock_repo.list_by_period.await_args.kwargs["limit"] == 3
+    assert mock_repo.list_by_period.await_args.kwargs["after"] == after
+
+@pytest.mark.asyncio
+async def test_list_transactions_by_period_filters():
+    # Arrange
+    mock_repo = AsyncMock()
+    mock_repo.list_by_period.return_value = []
+    mock_repo.summarize_period.return_value = PeriodSummary()
+    
+    use_case = ListTransactionsByPeriod(mock_repo)
+    filters = TransactionFilter(transaction_type="income", categorias=["Salário"])
+    
+    # Act
+    await use_case.execute(datetime(2023, 1, 1), datetime(2023, 1, 31), limit=50, filters=filters)
+    
+    # Assert
+    assert mock_repo.list_by_period.await_args.kwargs["filters"] == filters
+    assert mock_repo.summarize_period.await_args.kwargs["filters"] == filters
+
+@pytest.mark.asyncio
+async def test_list_transactions_by_period_rows_next_page():
+    # Arrange
+    mock_repo = AsyncMock()
+    mock_repo.list_by_period_rows.return_value = [
+        {"id": 10 - i, "data": date(2023, 1, 20 - i), "created_at": datetime(2023, 1, 20 - i, 12, 0)}
+        for i in range(3)
+    ]
+    mock_repo.summarize_period.return_value = PeriodSummary(count=3)
+    
+    use_case = ListTransactionsByPeriod(mock_repo)
+    
+    # Act
+    rows, summary, next_key = await use_case.execute_rows(datetime(2023, 1, 1), datetime(2023, 1, 31), limit=2)
+    
+    # Assert
+    assert len(rows) == 2
+    assert summary.count == 3
+    assert next_key == (date(2023, 1, 19), datetime(2023, 1, 19, 12, 0), 9)
+    assert mock_repo.list_by_period_rows.await_args.kwargs["limit"] == 3
+    mock_repo.list_by_period.assert_not_called()
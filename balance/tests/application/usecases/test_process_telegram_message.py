@@ -1,8 +1,11 @@
 import pytest
 from unittest.mock import AsyncMock, Mock
+from datetime import date
 
-from src.application.usecases.process_telegram_message import ProcessTelegramMessage
-from src.domain.models.transaction import TransactionCreate
+from src.application.usecases.process_telegram_message import ProcessOutcome, ProcessTelegramMessage
+from src.domain.models.transaction import TransactionCreate, Transaction
+from src.domain.models.installment_plan import InstallmentPlanCreate, InstallmentPlan
+from src.domain.models.parsed_message import ParsedMessage
 
 @pytest.mark.asyncio
 async def test_process_telegram_message_success():
@@ -14,8 +17,12 @@ async def test_process_telegram_message_success():
     mock_transaction.item = "Coffee"
     mock_transaction.data = "2024-01-15"
     
-    mock_agent.parse_expense.return_value = [mock_transaction]
-    mock_repo.create.return_value = True
+    mock_saved = Mock(spec=Transaction)
+    mock_saved.item = "Coffee"
+    mock_saved.data = "2024-01-15"
+    
+    mock_agent.parse_message.return_value = ParsedMessage.model_construct(transactions=[mock_transaction], plan=None)
+    mock_repo.create_many.return_value = [mock_saved]
     
     use_case = ProcessTelegramMessage(mock_repo, mock_agent)
     
@@ -23,9 +30,10 @@ async def test_process_telegram_message_success():
     result = await use_case.execute("Buy coffee 10")
     
     # Assert
-    assert result is True
-    mock_agent.parse_expense.assert_awaited_once_with("Buy coffee 10")
-    mock_repo.create.assert_awaited_once_with(mock_transaction)
+    assert result is ProcessOutcome.RECORDED
+    mock_agent.parse_message.assert_awaited_once_with("Buy coffee 10")
+    mock_repo.create_many.assert_awaited_once_with([mock_transaction], 0)
+    mock_repo.create.assert_not_called()
 
 @pytest.mark.asyncio
 async def test_process_telegram_message_parse_fail():
@@ -33,7 +41,7 @@ async def test_process_telegram_message_parse_fail():
     mock_repo = AsyncMock()
     mock_agent = AsyncMock()
     
-    mock_agent.parse_expense.return_value = []
+    mock_agent.parse_message.return_value = ParsedMessage()
     
     use_case = ProcessTelegramMessage(mock_repo, mock_agent)
     
@@ -41,9 +49,26 @@ async def test_process_telegram_message_parse_fail():
     result = await use_case.execute("Invalid message")
     
     # Assert
-    assert result is False
-    mock_agent.parse_expense.assert_awaited_once_with("Invalid message")
-    mock_repo.create.assert_not_called()
+    assert result is ProcessOutcome.NOTHING_TO_RECORD
+    mock_agent.parse_message.assert_awaited_once_with("Invalid message")
+    mock_repo.create_many.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_process_telegram_message_parse_error_is_failure():
+    # Arrange (timeout/5xx da IA: diferente de mensagem sem lançamento)
+    mock_repo = AsyncMock()
+    mock_agent = AsyncMock()
+    
+    mock_agent.parse_message.return_value = ParsedMessage(failed=True)
+    
+    use_case = ProcessTelegramMessage(mock_repo, mock_agent)
+    
+    # Act
+    result = await use_case.execute("uber 25")
+    
+    # Assert
+    assert result is ProcessOutcome.FAILED
+    mock_repo.create_many.assert_not_called()
 
 @pytest.mark.asyncio
 async def test_process_telegram_message_save_fail():
@@ -55,8 +80,8 @@ async def test_process_telegram_message_save_fail():
     mock_transaction.item = "Coffee"
     mock_transaction.data = "2024-01-15"
     
-    mock_agent.parse_expense.return_value = [mock_transaction]
-    mock_repo.create.return_value = False
+    mock_agent.parse_message.return_value = ParsedMessage.model_construct(transactions=[mock_transaction], plan=None)
+    mock_repo.create_many.return_value = []
     
     use_case = ProcessTelegramMessage(mock_repo, mock_agent)
     
@@ -64,12 +89,12 @@ async def test_process_telegram_message_save_fail():
     result = await use_case.execute("Buy coffee 10")
     
     # Assert
-    assert result is False
-    mock_repo.create.assert_awaited_once_with(mock_transaction)
+    assert result is ProcessOutcome.FAILED
+    mock_repo.create_many.assert_awaited_once_with([mock_transaction], 0)
 
 @pytest.mark.asyncio
 async def test_process_telegram_message_multiple_transactions():
-    """Test processing message that generates multiple transactions (installments)"""
+    """Test that several transactions are persisted in a single batched call"""
     # Arrange
     mock_repo = AsyncMock()
     mock_agent = AsyncMock()
@@ -82,8 +107,8 @@ async def test_process_telegram_message_multiple_transactions():
     mock_tx2.item = "Tenis"
     mock_tx2.data = "2024-02-20"
     
-    mock_agent.parse_expense.return_value = [mock_tx1, mock_tx2]
-    mock_repo.create.return_value = True
+    mock_agent.parse_message.return_value = ParsedMessage.model_construct(transactions=[mock_tx1, mock_tx2], plan=None)
+    mock_repo.create_many.return_value = [mock_tx1, mock_tx2]
     
     use_case = ProcessTelegramMessage(mock_repo, mock_agent)
     
@@ -91,38 +116,157 @@ async def test_process_telegram_message_multiple_transactions():
     result = await use_case.execute("Tenis parcelado 2x")
     
     # Assert
-    assert result is True
-    mock_agent.parse_expense.assert_awaited_once_with("Tenis parcelado 2x")
-    assert mock_repo.create.await_count == 2
-    mock_repo.create.assert_any_await(mock_tx1)
-    mock_repo.create.assert_any_await(mock_tx2)
+    assert result is ProcessOutcome.RECORDED
+    mock_agent.parse_message.assert_awaited_once_with("Tenis parcelado 2x")
+    mock_repo.create_many.assert_awaited_once_with([mock_tx1, mock_tx2], 0)
+    mock_repo.create.assert_not_called()
+
 
 @pytest.mark.asyncio
-async def test_process_telegram_message_partial_save():
-    """Test when some transactions save successfully and others fail"""
+async def test_process_telegram_message_with_source_upserts():
+    """Test that identified Telegram messages are saved idempotently"""
     # Arrange
     mock_repo = AsyncMock()
     mock_agent = AsyncMock()
     
-    mock_tx1 = Mock(spec=TransactionCreate)
-    mock_tx1.item = "Tenis"
-    mock_tx1.data = "2024-01-20"
+    mock_transaction = Mock(spec=TransactionCreate)
+    mock_saved = Mock(spec=Transaction)
+    mock_saved.item = "Coffee"
+    mock_saved.data = "2024-01-15"
     
-    mock_tx2 = Mock(spec=TransactionCreate)
-    mock_tx2.item = "Tenis"
-    mock_tx2.data = "2024-02-20"
+    mock_agent.parse_message.return_value = ParsedMessage.model_construct(transactions=[mock_transaction], plan=None)
+    mock_repo.upsert_by_source.return_value = [mock_saved]
+    
+    use_case = ProcessTelegramMessage(mock_repo, mock_agent)
     
-    mock_agent.parse_expense.return_value = [mock_tx1, mock_tx2]
-    # First save succeeds, second fails
-    mock_repo.create.side_effect = [True, False]
+    # Act
+    result = await use_case.execute("Buy coffee 10", chat_id=42, message_id=7)
+    
+    # Assert
+    assert result is ProcessOutcome.RECORDED
+    mock_repo.upsert_by_source.assert_awaited_once_with(42, 7, [mock_transaction])
+    mock_repo.create_many.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_process_telegram_message_without_message_id_uses_chat_owner():
+    # Arrange
+    mock_repo = AsyncMock()
+    mock_agent = AsyncMock()
+    
+    mock_transaction = Mock(spec=TransactionCreate)
+    mock_agent.parse_message.return_value = ParsedMessage.model_construct(transactions=[mock_transaction], plan=None)
+    mock_saved = Mock(spec=Transaction)
+    mock_saved.item = "Coffee"
+    mock_saved.data = "2024-01-15"
+    mock_repo.create_many.return_value = [mock_saved]
     
     use_case = ProcessTelegramMessage(mock_repo, mock_agent)
     
     # Act
-    result = await use_case.execute("Tenis parcelado 2x")
+    result = await use_case.execute("Buy coffee 10", chat_id=42)
+    
+    # Assert (sem message_id não há upsert, mas o lançamento é do dono do chat)
+    assert result is ProcessOutcome.RECORDED
+    mock_repo.create_many.assert_awaited_once_with([mock_transaction], 42)
+    mock_repo.upsert_by_source.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_process_telegram_message_installment_plan():
+    """Test that installment purchases are stored as a single plan row"""
+    # Arrange
+    mock_repo = AsyncMock()
+    mock_agent = AsyncMock()
+    
+    mock_plan = Mock(spec=InstallmentPlanCreate)
+    mock_saved = Mock(spec=InstallmentPlan)
+    mock_saved.item = "Tenis"
+    mock_saved.parcelas = 10
+    mock_saved.first_due_date = "2024-02-20"
+    
+    mock_agent.parse_message.return_value = ParsedMessage.model_construct(transactions=[], plan=mock_plan)
+    mock_repo.create_plan.return_value = mock_saved
+    
+    use_case = ProcessTelegramMessage(mock_repo, mock_agent)
+    
+    # Act
+    result = await use_case.execute("Tenis 1000 em 10x")
     
     # Assert
-    # Should return True if at least one saved successfully
-    assert result is True
-    assert mock_repo.create.await_count == 2
+    assert result is ProcessOutcome.RECORDED
+    mock_repo.create_plan.assert_awaited_once_with(mock_plan, 0)
+    mock_repo.create_many.assert_not_called()
 
+@pytest.mark.asyncio
+async def test_process_telegram_message_installment_plan_with_source():
+    # Arrange
+    mock_repo = AsyncMock()
+    mock_agent = AsyncMock()
+    
+    mock_plan = Mock(spec=InstallmentPlanCreate)
+    mock_agent.parse_message.return_value = ParsedMessage.model_construct(transactions=[], plan=mock_plan)
+    mock_repo.upsert_plan_by_source.return_value = None
+    
+    use_case = ProcessTelegramMessage(mock_repo, mock_agent)
+    
+    # Act
+    result = await use_case.execute("Tenis 1000 em 10x", chat_id=42, message_id=7)
+    
+    # Assert
+    assert result is ProcessOutcome.FAILED
+    mock_repo.upsert_plan_by_source.assert_awaited_once_with(42, 7, mock_plan)
+    mock_repo.create_plan.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_process_telegram_message_execute_many():
+    """Test that a history chunk is parsed per message date and saved in batched writes"""
+    # Arrange
+    mock_repo = AsyncMock()
+    mock_agent = AsyncMock()
+    
+    mock_transaction = Mock(spec=TransactionCreate)
+    mock_plan = Mock(spec=InstallmentPlanCreate)
+    parsed = {
+        "uber 25": ParsedMessage.model_construct(transactions=[mock_transaction], plan=None),
+        "tenis 1000 em 10x": ParsedMessage.model_construct(transactions=[], plan=mock_plan),
+        "bom dia": ParsedMessage(),
+        "mercado 80": ParsedMessage(failed=True),
+    }
+    mock_agent.parse_message.side_effect = lambda text, today: parsed[text]
+    mock_repo.upsert_many_by_source.return_value = [Mock(spec=Transaction)]
+    mock_repo.upsert_plans_by_source.return_value = [Mock(spec=InstallmentPlan)]
+    
+    use_case = ProcessTelegramMessage(mock_repo, mock_agent)
+    
+    # Act
+    result = await use_case.execute_many(42, [
+        (1, "uber 25", date(2023, 1, 2)),
+        (2, "tenis 1000 em 10x", date(2023, 1, 3)),
+        (3, "bom dia", date(2023, 1, 3)),
+        (4, "mercado 80", date(2023, 1, 4)),
+    ], concurrency=2)
+    
+    # Assert (a 4 falhou na IA e volta separada da 3, que só não tinha lançamento)
+    assert result == (2, [4])
+    mock_agent.parse_message.assert_any_await("uber 25", date(2023, 1, 2))
+    mock_repo.upsert_many_by_source.assert_awaited_once_with(42, {1: [mock_transaction]})
+    mock_repo.upsert_plans_by_source.assert_awaited_once_with(42, {2: mock_plan})
+
+@pytest.mark.asyncio
+async def test_process_telegram_message_execute_many_save_fail():
+    # Arrange
+    mock_repo = AsyncMock()
+    mock_agent = AsyncMock()
+    
+    mock_agent.parse_message.return_value = ParsedMessage.model_construct(
+        transactions=[Mock(spec=TransactionCreate)], plan=None
+    )
+    mock_repo.upsert_many_by_source.return_value = []
+    
+    use_case = ProcessTelegramMessage(mock_repo, mock_agent)
+    
+    # Act
+    result = await use_case.execute_many(42, [(1, "uber 25", date(2023, 1, 2))])
+    
+    # Assert
+    assert result is None
+    mock_repo.upsert_plans_by_source.assert_not_called()
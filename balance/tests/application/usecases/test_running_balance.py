@@ -0,0 +1,41 @@
+import pytest
+from decimal import Decimal
+from datetime import date
+from unittest.mock import AsyncMock
+
+from src.application.usecases.running_balance import RunningBalance
+
+@pytest.mark.asyncio
+async def test_running_balance_opening_from_first_day():
+    # Arrange
+    mock_repo = AsyncMock()
+    mock_repo.running_balance.return_value = [
+        {"data": date(2024, 3, 10), "net": Decimal("-20.00"), "balance": Decimal("980.00")},
+        {"data": date(2024, 3, 11), "net": Decimal("50.00"), "balance": Decimal("1030.00")},
+    ]
+    
+    use_case = RunningBalance(mock_repo)
+    
+    # Act
+    opening, days = await use_case.execute(date(2024, 3, 10), date(2024, 3, 11), owner_id=42)
+    
+    # Assert
+    assert opening == Decimal("1000.00")
+    assert len(days) == 2
+    mock_repo.running_balance.assert_awaited_once_with(
+        start_date=date(2024, 3, 10), end_date=date(2024, 3, 11), owner_id=42
+    )
+
+@pytest.mark.asyncio
+async def test_running_balance_failure():
+    # Arrange
+    mock_repo = AsyncMock()
+    mock_repo.running_balance.return_value = None
+    
+    use_case = RunningBalance(mock_repo)
+    
+    # Act
+    result = await use_case.execute(date(2024, 3, 10), date(2024, 3, 11))
+    
+    # Assert
+    assert result is None
@@ -0,0 +1,52 @@
+import pytest
+from decimal import Decimal
+from datetime import datetime, date
+from unittest.mock import AsyncMock
+
+from src.application.usecases.search_transactions import SearchTransactions
+from src.domain.models.period_summary import PeriodSummary
+
+@pytest.mark.asyncio
+async def test_search_transactions_next_page():
+    # Arrange
+    mock_repo = AsyncMock()
+    rows = [
+        {"id": 10 - i, "rank": 0.9 - i / 10, "data": date(2023, 1, 20 - i), "created_at": datetime(2023, 1, 20 - i, 12, 0)}
+        for i in range(3)
+    ]
+    mock_repo.search_rows.return_value = rows
+    mock_repo.summarize_search.return_value = PeriodSummary(
+        income=Decimal("0"), expense=Decimal("120.00"), net=Decimal("-120.00"), count=7
+    )
+    
+    use_case = SearchTransactions(mock_repo)
+    
+    # Act
+    page, summary, next_key = await use_case.execute("  ifood ", date(2023, 1, 1), date(2023, 12, 31), limit=2)
+    
+    # Assert
+    assert [r["id"] for r in page] == [10, 9]
+    assert next_key == (0.8, date(2023, 1, 19), datetime(2023, 1, 19, 12, 0), 9)
+    assert summary.count == 7
+    mock_repo.search_rows.assert_awaited_once_with(
+        text="ifood", start_date=date(2023, 1, 1), end_date=date(2023, 12, 31), limit=3, after=None, filters=None
+    )
+    mock_repo.summarize_search.assert_awaited_once_with(
+        text="ifood", start_date=date(2023, 1, 1), end_date=date(2023, 12, 31), filters=None
+    )
+
+@pytest.mark.asyncio
+async def test_search_transactions_last_page():
+    # Arrange
+    mock_repo = AsyncMock()
+    mock_repo.search_rows.return_value = [{"id": 1, "rank": 0.4, "data": date(2023, 1, 1), "created_at": datetime(2023, 1, 1)}]
+    mock_repo.summarize_search.return_value = None
+    
+    use_case = SearchTransactions(mock_repo)
+    
+    # Act
+    page, summary, next_key = await use_case.execute("uber", date(2023, 1, 1), date(2023, 1, 31), limit=2)
+    
+    # Assert
+    assert len(page) == 1
+    assert next_key is None
@@ -0,0 +1,26 @@
+import pytest
+from decimal import Decimal
+from datetime import date
+from unittest.mock import AsyncMock
+
+from src.application.usecases.summarize_period import SummarizePeriod
+from src.domain.models.period_summary import PeriodSummary
+
+@pytest.mark.asyncio
+async def test_summarize_period_execute():
+    # Arrange
+    mock_repo = AsyncMock()
+    summary = PeriodSummary(income=Decimal("100.00"), expense=Decimal("30.00"), net=Decimal("70.00"), count=3)
+    mock_repo.summarize_period.return_value = summary
+    
+    use_case = SummarizePeriod(mock_repo)
+    
+    # Act
+    result = await use_case.execute(date(2023, 1, 1), date(2023, 1, 31))
+    
+    # Assert
+    assert result == summary
+    mock_repo.summarize_period.assert_awaited_once_with(
+        start_date=date(2023, 1, 1), end_date=date(2023, 1, 31), filters=None
+    )
+    mock_repo.list_by_period.assert_not_called()
@@ -0,0 +1,36 @@
+from decimal import Decimal
+from datetime import date
+import pytest
+from pydantic import ValidationError
+from src.domain.models.installment_plan import InstallmentPlanCreate, add_months
+
+def _plan(**overrides):
+    data = dict(
+        item="Tenis",
+        valor_total=Decimal("100.00"),
+        parcelas=3,
+        data_compra=date(2023, 1, 31),
+        first_due_date=date(2023, 1, 31),
+        categoria="Vestuário",
+        descricao="tenis 100 em 3x"
+    )
+    data.update(overrides)
+    return InstallmentPlanCreate(**data)
+
+def test_add_months_clamps_to_last_day():
+    assert add_months(date(2023, 1, 31), 1) == date(2023, 2, 28)
+    assert add_months(date(2023, 11, 15), 2) == date(2024, 1, 15)
+
+def test_installment_plan_last_due_date():
+    assert _plan().last_due_date == date(2023, 3, 31)
+
+def test_installment_plan_expand():
+    installments = _plan().expand()
+
+    assert [t.data for t in installments] == [date(2023, 1, 31), date(2023, 2, 28), date(2023, 3, 31)]
+    assert all(t.valor == Decimal("33.33") for t in installments)
+    assert installments[-1].descricao == "tenis 100 em 3x (Parcela 3/3)"
+
+def test_installment_plan_requires_more_than_one_installment():
+    with pytest.raises(ValidationError):
+        _plan(parcelas=1)
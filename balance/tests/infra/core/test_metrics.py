@@ -0,0 +1,50 @@
+import pytest
+from types import SimpleNamespace
+from prometheus_client import REGISTRY
+
+from src.infra.core.metrics import track_query, track_llm, record_llm_usage
+
+def _value(name, labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+def test_track_query_counts_errors_and_time():
+    # Arrange
+    errors_before = _value("db_query_errors_total", {"query": "test_query"})
+    count_before = _value("db_query_duration_seconds_count", {"query": "test_query"})
+
+    # Act
+    with track_query("test_query"):
+        pass
+    with pytest.raises(RuntimeError):
+        with track_query("test_query"):
+            raise RuntimeError("boom")
+
+    # Assert
+    assert _value("db_query_duration_seconds_count", {"query": "test_query"}) == count_before + 2
+    assert _value("db_query_errors_total", {"query": "test_query"}) == errors_before + 1
+
+def test_track_llm_counts_errors():
+    # Arrange
+    before = _value("llm_errors_total", {"kind": "test"})
+
+    # Act
+    with pytest.raises(TimeoutError):
+        with track_llm("test"):
+            raise TimeoutError()
+
+    # Assert
+    assert _value("llm_errors_total", {"kind": "test"}) == before + 1
+
+def test_record_llm_usage():
+    # Arrange
+    prompt_before = _value("llm_tokens_total", {"kind": "test", "type": "prompt"})
+    completion_before = _value("llm_tokens_total", {"kind": "test", "type": "completion"})
+    response = SimpleNamespace(usage=SimpleNamespace(prompt_tokens=120, completion_tokens=30))
+
+    # Act
+    record_llm_usage("test", response)
+    record_llm_usage("test", SimpleNamespace(usage=None))
+
+    # Assert
+    assert _value("llm_tokens_total", {"kind": "test", "type": "prompt"}) == prompt_before + 120
+    assert _value("llm_tokens_total", {"kind": "test", "type": "completion"}) == completion_before + 30
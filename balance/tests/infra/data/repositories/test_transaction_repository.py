@@ -5,11 +5,30 @@ from decimal import Decimal
 
 from src.infra.data.repositories.transaction_repository import TransactionRepository
 from src.domain.models.transaction import TransactionCreate, Transaction
+from src.domain.models.installment_plan import InstallmentPlanCreate, InstallmentPlan
+from src.domain.models.transaction_filter import TransactionFilter
+
+class _FakeContext:
+    def __init__(self, value=None):
+        self.value = value
+
+    async def __aenter__(self):
+        return self.value
+
+    async def __aexit__(self, *exc):
+        return False
+
+def pool_mock():
+    """Pool cujo acquire() entrega o próprio mock como conexão, sem statements preparados"""
+    pool = AsyncMock()
+    pool.acquire = Mock(side_effect=lambda: _FakeContext(pool))
+    pool.statements = {}
+    return pool
 
 @pytest.mark.asyncio
 async def test_create_transaction_success():
     # Arrange
-    mock_pool = AsyncMock()
+    mock_pool = pool_mock()
     mock_row = {
         "id": 1,
         "item": "Test Item",
@@ -47,7 +66,7 @@ async def test_create_transaction_success():
 @pytest.mark.asyncio
 async def test_create_transaction_failure():
     # Arrange
-    mock_pool = AsyncMock()
+    mock_pool = pool_mock()
     mock_pool.fetchrow.side_effect = Exception("Database error")
     
     repo = TransactionRepository(mock_pool)
@@ -71,7 +90,7 @@ async def test_create_transaction_failure():
 @pytest.mark.asyncio
 async def test_list_by_period_success():
     # Arrange
-    mock_pool = AsyncMock()
+    mock_pool = pool_mock()
     mock_row1 = {
         "id": 1,
         "item": "Test Item 1",
@@ -111,10 +130,213 @@ async def test_list_by_period_success():
     assert result[1].id == 2
     mock_pool.fetch.assert_called_once()
 
+@pytest.mark.asyncio
+async def test_list_by_period_keyset_page():
+    # Arrange
+    mock_pool = pool_mock()
+    mock_pool.fetch.return_value = []
+    
+    repo = TransactionRepository(mock_pool)
+    after = (date(2023, 1, 15), datetime(2023, 1, 15, 10, 0), 42)
+    
+    # Act
+    await repo.list_by_period(date(2023, 1, 1), date(2023, 1, 31), limit=51, after=after)
+    
+    # Assert
+    query, *args = mock_pool.fetch.call_args.args
+    assert "(data, created_at, id) < ($3, $4, $5)" in query
+    assert "LIMIT $6" in query
+    assert args == [date(2023, 1, 1), date(2023, 1, 31), *after, 51]
+
+@pytest.mark.asyncio
+async def test_list_by_period_rows_projects_response_columns():
+    # Arrange
+    mock_pool = pool_mock()
+    row = {"id": 1, "item": "Test Item", "valor": Decimal("10.00"), "data": date(2023, 1, 1)}
+    mock_pool.fetch.return_value = [row]
+    
+    repo = TransactionRepository(mock_pool)
+    
+    # Act
+    result = await repo.list_by_period_rows(date(2023, 1, 1), date(2023, 1, 31), limit=11)
+    
+    # Assert
+    query = mock_pool.fetch.call_args.args[0]
+    assert "SELECT id, item, valor, data, categoria, descricao, transaction_type, created_at, parcela FROM ledger($1, $2)" in query
+    assert "LIMIT $3" in query
+    assert result == [row]
+
+class _FakeConnection:
+    def __init__(self, rows):
+        self.rows = rows
+        self.cursor_call = None
+        self.transaction_kwargs = None
+
+    def transaction(self, **kwargs):
+        self.transaction_kwargs = kwargs
+        return _FakeContext()
+
+    def cursor(self, query, *args, prefetch=None):
+        self.cursor_call = (query, args, prefetch)
+
+        async def rows():
+            for row in self.rows:
+                yield row
+        return rows()
+
+@pytest.mark.asyncio
+async def test_list_by_period_rows_slim_projection():
+    # Arrange
+    mock_pool = pool_mock()
+    mock_pool.fetch.return_value = []
+    
+    repo = TransactionRepository(mock_pool)
+    
+    # Act
+    await repo.list_by_period_rows(date(2023, 1, 1), date(2023, 1, 31), limit=11, slim=True)
+    
+    # Assert
+    query = mock_pool.fetch.call_args.args[0]
+    assert "SELECT id, item, valor, data, categoria, transaction_type, created_at, parcela FROM ledger($1, $2)" in query
+
+@pytest.mark.asyncio
+async def test_search_rows_ranks_and_paginates():
+    # Arrange
+    mock_pool = pool_mock()
+    mock_pool.fetch.return_value = []
+    after = (0.5, date(2023, 3, 1), datetime(2023, 3, 1, 12, 0), 7)
+    
+    repo = TransactionRepository(mock_pool)
+    
+    # Act
+    await repo.search_rows("50%_off", date(2023, 1, 1), date(2023, 12, 31), limit=21, after=after)
+    
+    # Assert
+    query, *args = mock_pool.fetch.call_args.args
+    assert "item ILIKE $4" in query
+    assert "$3 <% item" in query
+    assert "to_tsvector('portuguese', descricao) @@ websearch_to_tsquery('portuguese', $3)" in query
+    assert "(rank, data, created_at, id) < ($5, $6, $7, $8)" in query
+    assert "ORDER BY rank DESC, data DESC, created_at DESC, id DESC" in query
+    assert args == [date(2023, 1, 1), date(2023, 12, 31), "50%_off", "%50\\%\\_off%", *after, 21]
+
+@pytest.mark.asyncio
+async def test_summarize_search_failure():
+    # Arrange
+    mock_pool = pool_mock()
+    mock_pool.fetchrow.side_effect = Exception("function word_similarity does not exist")
+    
+    repo = TransactionRepository(mock_pool)
+    
+    # Act
+    result = await repo.summarize_search("ifood", date(2023, 1, 1), date(2023, 12, 31))
+    
+    # Assert
+    assert result is None
+
+@pytest.mark.asyncio
+async def test_running_balance_reads_only_from_start_month():
+    # Arrange
+    mock_pool = pool_mock()
+    mock_pool.fetch.return_value = [{"data": date(2024, 3, 10), "net": Decimal("0"), "balance": Decimal("10.00")}]
+    
+    repo = TransactionRepository(mock_pool)
+    
+    # Act
+    result = await repo.running_balance(date(2024, 3, 10), date(2024, 4, 2), owner_id=42)
+    
+    # Assert (ledger desde o dia 1º do mês inicial; antes disso, snapshot + rollups)
+    query, *args = mock_pool.fetch.call_args.args
+    assert "FROM balance_snapshots" in query
+    assert "FROM ledger($1, $2)" in query
+    assert "OVER (ORDER BY d.day)" in query
+    assert "WHERE owner_id = $4" in query
+    assert args == [date(2024, 3, 1), date(2024, 4, 2), date(2024, 3, 10), 42]
+    assert result == [{"data": date(2024, 3, 10), "net": Decimal("0"), "balance": Decimal("10.00")}]
+
+@pytest.mark.asyncio
+async def test_refresh_balance_snapshots_locks_rollups_in_transaction():
+    # Arrange
+    mock_pool = pool_mock()
+    mock_pool.transaction = Mock(return_value=_FakeContext())
+    mock_pool.fetchval.return_value = 3
+    
+    repo = TransactionRepository(mock_pool)
+    
+    # Act
+    result = await repo.refresh_balance_snapshots()
+    
+    # Assert (o lock vem antes do recálculo, na mesma transação)
+    mock_pool.transaction.assert_called_once_with()
+    mock_pool.execute.assert_awaited_once_with("LOCK TABLE monthly_rollups IN SHARE MODE")
+    assert "INSERT INTO balance_snapshots" in mock_pool.fetchval.call_args.args[0]
+    assert result == 3
+
+@pytest.mark.asyncio
+async def test_refresh_balance_snapshots_failure():
+    # Arrange
+    mock_pool = pool_mock()
+    mock_pool.transaction = Mock(return_value=_FakeContext())
+    mock_pool.fetchval.side_effect = Exception('relation "balance_snapshots" does not exist')
+    
+    repo = TransactionRepository(mock_pool)
+    
+    # Act
+    result = await repo.refresh_balance_snapshots()
+    
+    # Assert
+    assert result is None
+
+@pytest.mark.asyncio
+async def test_iter_by_period_uses_server_cursor():
+    # Arrange
+    conn = _FakeConnection([{"id": 1}, {"id": 2}])
+    mock_pool = Mock()
+    mock_pool.acquire.return_value = _FakeContext(conn)
+    
+    repo = TransactionRepository(mock_pool)
+    
+    # Act
+    rows = [row async for row in repo.iter_by_period(date(2023, 1, 1), date(2023, 12, 31), prefetch=500)]
+    
+    # Assert
+    query, args, prefetch = conn.cursor_call
+    assert rows == [{"id": 1}, {"id": 2}]
+    assert "ORDER BY data ASC, created_at ASC, id ASC" in query
+    assert "LIMIT" not in query
+    assert args == (date(2023, 1, 1), date(2023, 12, 31))
+    assert prefetch == 500
+    assert conn.transaction_kwargs == {"readonly": True}
+
+@pytest.mark.asyncio
+async def test_reads_use_read_pool_and_writes_use_primary():
+    # Arrange
+    primary = pool_mock()
+    replica = pool_mock()
+    replica.fetch.return_value = []
+    replica.fetchrow.return_value = {"income": Decimal("0"), "expense": Decimal("0"), "net": Decimal("0"), "count": 0}
+    primary.fetchrow.return_value = None
+    
+    repo = TransactionRepository(primary, read_pool=replica)
+    
+    # Act
+    await repo.list_by_period_rows(date(2023, 1, 1), date(2023, 1, 31))
+    await repo.summarize_period(date(2023, 1, 1), date(2023, 1, 31))
+    await repo.create(TransactionCreate(
+        item="Test", valor=Decimal("10.00"), data=date(2023, 1, 1),
+        categoria="Food", descricao="Test", transaction_type="expense"
+    ))
+    
+    # Assert
+    replica.fetch.assert_awaited_once()
+    replica.fetchrow.assert_awaited_once()
+    primary.fetch.assert_not_called()
+    primary.fetchrow.assert_awaited_once()
+
 @pytest.mark.asyncio
 async def test_list_by_period_failure():
     # Arrange
-    mock_pool = AsyncMock()
+    mock_pool = pool_mock()
     mock_pool.fetch.side_effect = Exception("Database error")
     
     repo = TransactionRepository(mock_pool)
@@ -127,3 +349,523 @@ async def test_list_by_period_failure():
     # Assert
     assert result == []
     mock_pool.fetch.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_create_many_success():
+    # Arrange
+    mock_pool = pool_mock()
+    mock_rows = [
+        {
+            "id": i,
+            "item": "Tenis",
+            "valor": Decimal("50.00"),
+            "data": date(2023, i, 10),
+            "categoria": "Vestuario",
+            "transaction_type": "expense",
+            "descricao": f"Tenis 2x (Parcela {i}/2)",
+            "created_at": datetime.now(),
+            "updated_at": datetime.now()
+        }
+        for i in (1, 2)
+    ]
+    mock_pool.fetch.return_value = mock_rows
+    
+    repo = TransactionRepository(mock_pool)
+    
+    transactions = [
+        TransactionCreate(
+            item="Tenis",
+            valor=Decimal("50.00"),
+            data=date(2023, i, 10),
+            categoria="Vestuario",
+            descricao=f"Tenis 2x (Parcela {i}/2)"
+        )
+        for i in (1, 2)
+    ]
+    
+    # Act
+    result = await repo.create_many(transactions)
+    
+    # Assert
+    assert [t.id for t in result] == [1, 2]
+    mock_pool.fetch.assert_called_once()
+    args = mock_pool.fetch.call_args.args
+    assert "unnest" in args[0]
+    assert args[3] == [date(2023, 1, 10), date(2023, 2, 10)]
+    assert args[-1] == 0  # owner_id padrão
+
+@pytest.mark.asyncio
+async def test_create_many_empty_skips_database():
+    # Arrange
+    mock_pool = pool_mock()
+    repo = TransactionRepository(mock_pool)
+    
+    # Act
+    result = await repo.create_many([])
+    
+    # Assert
+    assert result == []
+    mock_pool.fetch.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_create_many_failure():
+    # Arrange
+    mock_pool = pool_mock()
+    mock_pool.fetch.side_effect = Exception("Database error")
+    
+    repo = TransactionRepository(mock_pool)
+    
+    transaction_create = TransactionCreate(
+        item="Test Item",
+        valor=Decimal("10.00"),
+        data=date(2023, 1, 1),
+        categoria="Food",
+        descricao="Test Desc"
+    )
+    
+    # Act
+    result = await repo.create_many([transaction_create])
+    
+    # Assert
+    assert result == []
+
+
+@pytest.mark.asyncio
+async def test_upsert_by_source_success():
+    # Arrange
+    mock_pool = pool_mock()
+    mock_pool.fetch.return_value = [{
+        "id": 1,
+        "item": "Uber",
+        "valor": Decimal("25.00"),
+        "data": date(2023, 1, 1),
+        "categoria": "Transporte",
+        "transaction_type": "expense",
+        "descricao": "uber 25,00",
+        "created_at": datetime.now(),
+        "updated_at": datetime.now(),
+        "source_chat_id": 42,
+        "source_message_id": 7,
+        "source_seq": 1
+    }]
+    
+    repo = TransactionRepository(mock_pool)
+    
+    transaction_create = TransactionCreate(
+        item="Uber",
+        valor=Decimal("25.00"),
+        data=date(2023, 1, 1),
+        categoria="Transporte",
+        descricao="uber 25,00"
+    )
+    
+    # Act
+    result = await repo.upsert_by_source(42, 7, [transaction_create])
+    
+    # Assert
+    assert [t.id for t in result] == [1]
+    query, *args = mock_pool.fetch.call_args.args
+    assert "ON CONFLICT (source_chat_id, source_message_id, source_seq, data)" in query
+    assert args[-3:] == [42, 7, 1]
+
+@pytest.mark.asyncio
+async def test_upsert_by_source_failure():
+    # Arrange
+    mock_pool = pool_mock()
+    mock_pool.fetch.side_effect = Exception("Database error")
+    
+    repo = TransactionRepository(mock_pool)
+    
+    transaction_create = TransactionCreate(
+        item="Uber",
+        valor=Decimal("25.00"),
+        data=date(2023, 1, 1),
+        categoria="Transporte",
+        descricao="uber 25,00"
+    )
+    
+    # Act
+    result = await repo.upsert_by_source(42, 7, [transaction_create])
+    
+    # Assert
+    assert result == []
+
+
+def _plan_create():
+    return InstallmentPlanCreate(
+        item="Tenis",
+        valor_total=Decimal("1000.00"),
+        parcelas=10,
+        data_compra=date(2023, 1, 27),
+        first_due_date=date(2023, 2, 27),
+        cutoff_day=26,
+        categoria="Vestuário",
+        descricao="tenis 1000 em 10x no crédito"
+    )
+
+def _plan_row():
+    return {
+        "id": 5,
+        "item": "Tenis",
+        "valor_total": Decimal("1000.00"),
+        "parcelas": 10,
+        "data_compra": date(2023, 1, 27),
+        "first_due_date": date(2023, 2, 27),
+        "last_due_date": date(2023, 11, 27),
+        "cutoff_day": 26,
+        "categoria": "Vestuário",
+        "transaction_type": "expense",
+        "descricao": "tenis 1000 em 10x no crédito",
+        "source_chat_id": None,
+        "source_message_id": None,
+        "created_at": datetime.now(),
+        "updated_at": datetime.now()
+    }
+
+@pytest.mark.asyncio
+async def test_create_plan_success():
+    # Arrange
+    mock_pool = pool_mock()
+    mock_pool.fetchrow.return_value = _plan_row()
+    
+    repo = TransactionRepository(mock_pool)
+    
+    # Act
+    result = await repo.create_plan(_plan_create(), owner_id=42)
+    
+    # Assert
+    assert isinstance(result, InstallmentPlan)
+    assert result.id == 5
+    query, *args = mock_pool.fetchrow.call_args.args
+    assert "INSERT INTO installment_plans" in query
+    assert args[5] == date(2023, 11, 27)  # last_due_date
+    assert args[-1] == 42  # owner_id
+
+@pytest.mark.asyncio
+async def test_create_plan_failure():
+    # Arrange
+    mock_pool = pool_mock()
+    mock_pool.fetchrow.side_effect = Exception("Database error")
+    
+    repo = TransactionRepository(mock_pool)
+    
+    # Act
+    result = await repo.create_plan(_plan_create())
+    
+    # Assert
+    assert result is None
+
+@pytest.mark.asyncio
+async def test_upsert_plan_by_source_success():
+    # Arrange
+    mock_pool = pool_mock()
+    mock_pool.fetchrow.return_value = _plan_row()
+    
+    repo = TransactionRepository(mock_pool)
+    
+    # Act
+    result = await repo.upsert_plan_by_source(42, 7, _plan_create())
+    
+    # Assert
+    assert result.id == 5
+    query, *args = mock_pool.fetchrow.call_args.args
+    assert "ON CONFLICT (source_chat_id, source_message_id)" in query
+    assert args[-2:] == [42, 7]
+
+@pytest.mark.asyncio
+async def test_upsert_many_by_source_success():
+    # Arrange
+    mock_pool = pool_mock()
+    mock_pool.fetch.return_value = []
+    
+    repo = TransactionRepository(mock_pool)
+    
+    uber = TransactionCreate(
+        item="Uber", valor=Decimal("25.00"), data=date(2023, 1, 2),
+        categoria="Transporte", descricao="uber 25"
+    )
+    mercado = TransactionCreate(
+        item="Mercado", valor=Decimal("150.90"), data=date(2023, 1, 3),
+        categoria="Alimentação", descricao="mercado 150,90 e padaria 12"
+    )
+    padaria = mercado.model_copy(update={"item": "Padaria", "valor": Decimal("12.00")})
+    
+    # Act
+    await repo.upsert_many_by_source(42, {2: [uber], 4: [mercado, padaria]})
+    
+    # Assert
+    query, *args = mock_pool.fetch.call_args.args
+    assert "ON CONFLICT (source_chat_id, source_message_id, source_seq, data)" in query
+    assert args[0] == ["Uber", "Mercado", "Padaria"]
+    assert args[-3:] == [[2, 4, 4], [1, 1, 2], 42]
+
+@pytest.mark.asyncio
+async def test_upsert_plans_by_source_success():
+    # Arrange
+    mock_pool = pool_mock()
+    mock_pool.fetch.return_value = [_plan_row()]
+    
+    repo = TransactionRepository(mock_pool)
+    
+    # Act
+    result = await repo.upsert_plans_by_source(42, {7: _plan_create()})
+    
+    # Assert
+    assert [p.id for p in result] == [5]
+    query, *args = mock_pool.fetch.call_args.args
+    assert args[2] == [10]  # parcelas
+    assert args[-2:] == [[7], 42]
+
+@pytest.mark.asyncio
+async def test_upsert_plans_by_source_failure():
+    # Arrange
+    mock_pool = pool_mock()
+    mock_pool.fetch.side_effect = Exception("Database error")
+    
+    repo = TransactionRepository(mock_pool)
+    
+    # Act
+    result = await repo.upsert_plans_by_source(42, {7: _plan_create()})
+    
+    # Assert
+    assert result == []
+
+@pytest.mark.asyncio
+async def test_copy_many_success():
+    # Arrange
+    mock_pool = pool_mock()
+    
+    repo = TransactionRepository(mock_pool)
+    
+    transaction_create = TransactionCreate(
+        item="Uber", valor=Decimal("25.00"), data=date(2023, 1, 2),
+        categoria="Transporte", descricao="extrato"
+    )
+    
+    # Act
+    result = await repo.copy_many([transaction_create, transaction_create], owner_id=42)
+    
+    # Assert
+    assert result == 2
+    table = mock_pool.copy_records_to_table.call_args.args[0]
+    records = mock_pool.copy_records_to_table.call_args.kwargs["records"]
+    columns = mock_pool.copy_records_to_table.call_args.kwargs["columns"]
+    assert table == "transactions"
+    assert records[0] == ("Uber", Decimal("25.00"), date(2023, 1, 2), "Transporte", "expense", "extrato", 42)
+    assert columns[-1] == "owner_id"
+
+@pytest.mark.asyncio
+async def test_copy_many_failure():
+    # Arrange
+    mock_pool = pool_mock()
+    mock_pool.copy_records_to_table.side_effect = Exception("Database error")
+    
+    repo = TransactionRepository(mock_pool)
+    
+    transaction_create = TransactionCreate(
+        item="Uber", valor=Decimal("25.00"), data=date(2023, 1, 2),
+        categoria="Transporte", descricao="extrato"
+    )
+    
+    # Act
+    result = await repo.copy_many([transaction_create])
+    
+    # Assert
+    assert result == 0
+
+@pytest.mark.asyncio
+async def test_summarize_period_success():
+    # Arrange
+    mock_pool = pool_mock()
+    mock_pool.fetchrow.return_value = {
+        "income": Decimal("100.00"),
+        "expense": Decimal("30.00"),
+        "net": Decimal("70.00"),
+        "count": 3
+    }
+    
+    repo = TransactionRepository(mock_pool)
+    
+    # Act
+    result = await repo.summarize_period(date(2023, 1, 1), date(2023, 1, 31))
+    
+    # Assert
+    assert result.net == Decimal("70.00")
+    assert result.count == 3
+    query = mock_pool.fetchrow.call_args.args[0]
+    assert "FILTER (WHERE transaction_type = 'income')" in query
+    mock_pool.fetch.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_summarize_period_failure():
+    # Arrange
+    mock_pool = pool_mock()
+    mock_pool.fetchrow.side_effect = Exception("Database error")
+    
+    repo = TransactionRepository(mock_pool)
+    
+    # Act
+    result = await repo.summarize_period(date(2023, 1, 1), date(2023, 1, 31))
+    
+    # Assert
+    assert result is None
+
+@pytest.mark.asyncio
+async def test_list_by_period_with_filters():
+    # Arrange
+    mock_pool = pool_mock()
+    mock_pool.fetch.return_value = []
+    
+    repo = TransactionRepository(mock_pool)
+    filters = TransactionFilter(
+        transaction_type="expense",
+        categorias=["Transporte", "Lazer"],
+        min_valor=Decimal("10.00"),
+        max_valor=Decimal("100.00")
+    )
+    
+    # Act
+    await repo.list_by_period(date(2023, 1, 1), date(2023, 1, 31), limit=11, filters=filters)
+    
+    # Assert
+    query, *args = mock_pool.fetch.call_args.args
+    assert "transaction_type = 'expense'" in query
+    assert "categoria = ANY($3::varchar[])" in query
+    assert "valor >= $4 AND valor <= $5" in query
+    assert "LIMIT $6" in query
+    assert args[2:] == [["Transporte", "Lazer"], Decimal("10.00"), Decimal("100.00"), 11]
+
+@pytest.mark.asyncio
+async def test_summarize_period_with_filters():
+    # Arrange
+    mock_pool = pool_mock()
+    mock_pool.fetchrow.return_value = {"income": 0, "expense": Decimal("30.00"), "net": Decimal("-30.00"), "count": 1}
+    
+    repo = TransactionRepository(mock_pool)
+    
+    # Act
+    await repo.summarize_period(date(2023, 1, 1), date(2023, 1, 31), TransactionFilter(categorias=["Lazer"]))
+    
+    # Assert
+    query, *args = mock_pool.fetchrow.call_args.args
+    assert "WHERE categoria = ANY($3::varchar[])" in query
+    assert args[2] == ["Lazer"]
+
+@pytest.mark.asyncio
+async def test_summarize_period_scoped_to_owner():
+    # Arrange
+    mock_pool = pool_mock()
+    mock_pool.fetchrow.return_value = {"income": 0, "expense": Decimal("30.00"), "net": Decimal("-30.00"), "count": 1}
+    
+    repo = TransactionRepository(mock_pool)
+    
+    # Act
+    await repo.summarize_period(date(2023, 1, 1), date(2023, 3, 31), TransactionFilter(owner_id=42))
+    
+    # Assert (rollup dos meses completos e ledger das pontas filtram pelo dono)
+    query, *args = mock_pool.fetchrow.call_args.args
+    assert "FROM monthly_rollups" in query
+    assert query.count("owner_id = $3") == 3
+    assert args[2] == 42
+
+@pytest.mark.asyncio
+async def test_summarize_period_uses_rollups_for_full_months():
+    # Arrange
+    mock_pool = pool_mock()
+    mock_pool.fetchrow.return_value = {"income": 0, "expense": 0, "net": 0, "count": 0}
+    
+    repo = TransactionRepository(mock_pool)
+    
+    # Act
+    await repo.summarize_period(date(2023, 1, 15), date(2023, 6, 10))
+    
+    # Assert: fev-mai pelo rollup, 15-31/jan e 01-10/jun pelo ledger
+    query, *args = mock_pool.fetchrow.call_args.args
+    assert "FROM monthly_rollups" in query
+    assert "ledger($1, $5::date)" in query
+    assert "ledger($4::date, $2)" in query
+    assert args == [date(2023, 1, 15), date(2023, 6, 10), date(2023, 2, 1), date(2023, 6, 1), date(2023, 1, 31)]
+
+@pytest.mark.asyncio
+async def test_summarize_period_without_full_month():
+    # Arrange
+    mock_pool = pool_mock()
+    mock_pool.fetchrow.return_value = {"income": 0, "expense": 0, "net": 0, "count": 0}
+    
+    repo = TransactionRepository(mock_pool)
+    
+    # Act
+    await repo.summarize_period(date(2023, 1, 5), date(2023, 1, 20))
+    
+    # Assert: faixa do rollup vazia e o período inteiro somado pelo ledger
+    _, *args = mock_pool.fetchrow.call_args.args
+    assert args[2] == args[3]
+    assert args[4] == date(2023, 1, 20)
+
+@pytest.mark.asyncio
+async def test_summarize_period_valor_filter_skips_rollups():
+    # Arrange
+    mock_pool = pool_mock()
+    mock_pool.fetchrow.return_value = {"income": 0, "expense": 0, "net": 0, "count": 0}
+    
+    repo = TransactionRepository(mock_pool)
+    
+    # Act
+    await repo.summarize_period(date(2023, 1, 1), date(2023, 12, 31), TransactionFilter(min_valor=Decimal("100")))
+    
+    # Assert
+    query, *args = mock_pool.fetchrow.call_args.args
+    assert "monthly_rollups" not in query
+    assert args == [date(2023, 1, 1), date(2023, 12, 31), Decimal("100")]
+
+@pytest.mark.asyncio
+async def test_writes_invalidate_response_cache_by_month():
+    # Arrange
+    mock_pool = pool_mock()
+    mock_pool.fetchrow.return_value = _plan_row()
+    mock_cache = AsyncMock()
+    
+    repo = TransactionRepository(mock_pool, mock_cache)
+    
+    transactions = [
+        TransactionCreate(
+            item="Uber", valor=Decimal("25.00"), data=date(2023, 1, 31),
+            categoria="Transporte", descricao="uber"
+        ),
+        TransactionCreate(
+            item="Mercado", valor=Decimal("90.00"), data=date(2023, 2, 1),
+            categoria="Alimentação", descricao="mercado"
+        ),
+    ]
+    
+    # Act
+    await repo.copy_many(transactions)
+    await repo.create_plan(_plan_create())
+    
+    # Assert
+    assert mock_cache.invalidate.await_args_list[0].args[0] == {"2023-01", "2023-02"}
+    plan_months = mock_cache.invalidate.await_args_list[1].args[0]
+    assert min(plan_months) == "2023-02" and max(plan_months) == "2023-11"
+
+@pytest.mark.asyncio
+async def test_upsert_by_source_invalidates_previous_months():
+    # Arrange
+    mock_pool = pool_mock()
+    mock_pool.fetch.side_effect = [
+        [{"first_day": date(2022, 12, 30), "last_day": date(2022, 12, 30)}],  # linha antes da edição
+        [],
+    ]
+    mock_cache = AsyncMock()
+    
+    repo = TransactionRepository(mock_pool, mock_cache)
+    
+    transaction_create = TransactionCreate(
+        item="Uber", valor=Decimal("25.00"), data=date(2023, 1, 2),
+        categoria="Transporte", descricao="uber 25 dia 02/01"
+    )
+    
+    # Act
+    await repo.upsert_by_source(42, 7, [transaction_create])
+    
+    # Assert
+    mock_cache.invalidate.assert_awaited_once_with({"2022-12", "2023-01"})
@@ -0,0 +1,71 @@
+import io
+import pytest
+import pyarrow as pa
+import pyarrow.parquet as pq
+from datetime import date, datetime
+from decimal import Decimal
+
+from src.infra.data.arrow_export import record_batches, stream_table, write_files, SCHEMA
+
+def _row(i, day):
+    return {
+        "id": i,
+        "item": f"Item {i}",
+        "valor": Decimal("10.50"),
+        "data": day,
+        "categoria": "Alimentação" if i % 2 else "Transporte",
+        "descricao": f"gastei 10,50 no item {i}",
+        "transaction_type": "expense",
+        "created_at": datetime(2023, 1, 1, 9, 0),
+        "parcela": None,
+    }
+
+async def _rows(days):
+    for i, day in enumerate(days):
+        yield _row(i, day)
+
+DAYS = [date(2023, 1, 10), date(2023, 1, 20), date(2023, 1, 30), date(2023, 2, 5), date(2023, 3, 1)]
+
+@pytest.mark.asyncio
+async def test_record_batches_split_by_size_and_month():
+    # Act
+    by_size = [(m, b.num_rows) async for m, b in record_batches(_rows(DAYS), batch_rows=2)]
+    by_month = [(m, b.num_rows) async for m, b in record_batches(_rows(DAYS), batch_rows=2, by_month=True)]
+
+    # Assert
+    assert by_size == [(None, 2), (None, 2), (None, 1)]
+    assert by_month == [("2023-01", 2), ("2023-01", 1), ("2023-02", 1), ("2023-03", 1)]
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("fmt", ["arrow", "parquet"])
+async def test_stream_table_round_trip(fmt):
+    # Act
+    data = b"".join([chunk async for chunk in stream_table(_rows(DAYS), fmt, batch_rows=2)])
+
+    # Assert
+    table = pa.ipc.open_stream(data).read_all() if fmt == "arrow" else pq.read_table(io.BytesIO(data))
+    assert table.num_rows == 5
+    assert table.schema.field("categoria").type == SCHEMA.field("categoria").type
+    assert table.column("valor").to_pylist()[0] == Decimal("10.50")
+    assert table.column("data").to_pylist() == DAYS
+
+@pytest.mark.asyncio
+async def test_write_files_partitioned_by_month(tmp_path):
+    # Act
+    total = await write_files(_rows(DAYS), str(tmp_path), "parquet", partition_by_month=True, batch_rows=2)
+
+    # Assert
+    assert total == 5
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["month=2023-01", "month=2023-02", "month=2023-03"]
+    january = pq.read_table(tmp_path / "month=2023-01" / "part-0.parquet")
+    assert january.num_rows == 3
+
+@pytest.mark.asyncio
+async def test_write_files_single_file_without_rows(tmp_path):
+    # Act
+    target = tmp_path / "ledger.arrows"
+    total = await write_files(_rows([]), str(target), "arrow")
+
+    # Assert
+    assert total == 0
+    assert pa.ipc.open_stream(target.read_bytes()).schema == SCHEMA
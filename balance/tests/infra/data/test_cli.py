@@ -0,0 +1,143 @@
+import json
+import pytest
+from datetime import date
+from unittest.mock import AsyncMock, Mock, patch
+
+from src.infra.data.cli import (
+    run_backfill, run_export, run_migrate, run_partitions, run_rollback, run_setup, run_snapshots,
+    load_checkpoint, save_checkpoint,
+)
+
+def _write_export(tmp_path, ids):
+    path = tmp_path / "result.json"
+    messages = [
+        {"id": i, "type": "message", "date": "2023-01-02T10:00:00", "from_id": "user1", "text": f"uber {i}"}
+        for i in ids
+    ]
+    path.write_text(json.dumps({"name": "Gastos", "type": "personal_chat", "id": 42, "messages": messages}))
+    return str(path)
+
+async def _backfill(export_path, results):
+    use_case = Mock()
+    use_case.execute_many = AsyncMock(side_effect=results)
+    with patch("src.infra.data.cli.db", AsyncMock()), \
+            patch("src.infra.data.cli.redis_client", AsyncMock()), \
+            patch("src.infra.data.cli.openai_pool", AsyncMock()), \
+            patch("src.infra.data.cli.TransactionRepository"), \
+            patch("src.infra.data.cli.get_ai_agent"), \
+            patch("src.infra.data.cli.get_response_cache"), \
+            patch("src.infra.data.cli.ProcessTelegramMessage", return_value=use_case):
+        await run_backfill(export_path, batch_size=2)
+    return use_case
+
+@pytest.mark.asyncio
+async def test_backfill_checkpoints_each_chunk(tmp_path):
+    # Arrange
+    export_path = _write_export(tmp_path, [1, 2, 3])
+
+    # Act
+    use_case = await _backfill(export_path, [(2, []), (0, [])])
+
+    # Assert
+    assert use_case.execute_many.await_count == 2
+    assert load_checkpoint(f"{export_path}.checkpoint.json") == 3
+
+@pytest.mark.asyncio
+async def test_backfill_stops_checkpoint_before_failed_message(tmp_path):
+    # Arrange (a IA falhou na mensagem 4: o checkpoint não pode passar dela)
+    export_path = _write_export(tmp_path, [1, 2, 3, 4, 5, 6])
+
+    # Act
+    with pytest.raises(RuntimeError, match="não foram interpretadas"):
+        await _backfill(export_path, [(2, []), (0, [4])])
+
+    # Assert
+    assert load_checkpoint(f"{export_path}.checkpoint.json") == 3
+
+@pytest.mark.asyncio
+async def test_backfill_resumes_after_checkpoint(tmp_path):
+    # Arrange
+    export_path = _write_export(tmp_path, [1, 2, 3])
+    save_checkpoint(f"{export_path}.checkpoint.json", 42, 2)
+
+    # Act
+    use_case = await _backfill(export_path, [(1, [])])
+
+    # Assert (1 e 2 já importadas: só a 3 vai para a IA)
+    use_case.execute_many.assert_awaited_once()
+    assert load_checkpoint(f"{export_path}.checkpoint.json") == 3
+
+@pytest.mark.asyncio
+async def test_backfill_write_failure_keeps_checkpoint(tmp_path):
+    # Arrange
+    export_path = _write_export(tmp_path, [1, 2])
+
+    # Act
+    with pytest.raises(RuntimeError, match="Falha ao gravar lote"):
+        await _backfill(export_path, [None])
+
+    # Assert
+    assert load_checkpoint(f"{export_path}.checkpoint.json") == 0
+
+def test_migrate_and_rollback():
+    # Arrange
+    with patch("src.infra.data.cli.command") as command, patch("src.infra.data.cli.Config"):
+        # Act
+        run_migrate()
+        run_rollback()
+
+    # Assert
+    assert command.upgrade.call_args.args[1] == "head"
+    assert command.downgrade.call_args.args[1] == "-1"
+
+@pytest.mark.asyncio
+async def test_setup_runs_migrations():
+    # Arrange
+    with patch("src.infra.data.cli.run_migrate") as migrate:
+        # Act
+        await run_setup()
+
+    # Assert
+    migrate.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_export_filters_by_owner():
+    # Arrange
+    repo = Mock()
+    with patch("src.infra.data.cli.db", Mock(connect=AsyncMock(), disconnect=AsyncMock())) as db, \
+            patch("src.infra.data.cli.TransactionRepository", return_value=repo), \
+            patch("src.infra.data.cli.write_files", AsyncMock(return_value=3)) as write_files:
+        # Act
+        await run_export("out.parquet", owner_id=42)
+
+    # Assert
+    start, end, filters = repo.iter_by_period.call_args.args
+    assert filters.owner_id == 42
+    assert write_files.await_args.args[1:] == ("out.parquet", "parquet", False)
+    db.disconnect.assert_awaited_once()
+
+@pytest.mark.asyncio
+async def test_partitions_creates_and_detaches():
+    # Arrange
+    with patch("src.infra.data.cli.db", AsyncMock()), \
+            patch("src.infra.data.cli.ensure_partitions", AsyncMock(return_value=["transactions_2024_02"])), \
+            patch("src.infra.data.cli.detach_partitions_before", AsyncMock(return_value=[])) as detach:
+        # Act
+        await run_partitions(3, detach_before=date(2023, 5, 17))
+
+    # Assert (desanexa a partir do primeiro dia do mês)
+    assert detach.await_args.args[1] == date(2023, 5, 1)
+
+@pytest.mark.asyncio
+async def test_snapshots_failure_raises():
+    # Arrange
+    repo = Mock(refresh_balance_snapshots=AsyncMock(side_effect=[12, None]))
+    with patch("src.infra.data.cli.db", AsyncMock()), \
+            patch("src.infra.data.cli.TransactionRepository", return_value=repo):
+        # Act
+        await run_snapshots()
+        with pytest.raises(RuntimeError, match="snapshots"):
+            await run_snapshots()
+
+    # Assert
+    assert repo.refresh_balance_snapshots.await_count == 2
@@ -0,0 +1,168 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+from prometheus_client import REGISTRY
+
+from src.infra.data.database import Database
+
+def _database(lags):
+    database = Database()
+    database.pool = AsyncMock()
+    for name, lag in lags.items():
+        database.replicas.append((name, AsyncMock(name=name)))
+        database.replica_lag[name] = lag
+    return database
+
+@patch("src.infra.data.database.settings.DB_REPLICA_MAX_LAG_SECONDS", 5)
+def test_read_pool_round_robin_between_fresh_replicas():
+    # Arrange
+    database = _database({"replica_1": 0.2, "replica_2": 1.0, "replica_3": 30.0})
+    fresh = {database.replicas[0][1], database.replicas[1][1]}
+    
+    # Act
+    chosen = [database.read_pool() for _ in range(4)]
+    
+    # Assert
+    assert set(chosen) == fresh
+    assert chosen[0] is not chosen[1]
+
+@patch("src.infra.data.database.settings.DB_REPLICA_MAX_LAG_SECONDS", 5)
+def test_read_pool_falls_back_to_primary():
+    # Arrange (réplica atrasada demais e réplica que não respondeu)
+    database = _database({"replica_1": 30.0, "replica_2": None})
+    
+    # Act / Assert
+    assert database.read_pool() is database.pool
+    assert _database({}).read_pool() is not None
+
+@pytest.mark.asyncio
+@patch("src.infra.data.database.settings.DB_REPLICA_MAX_LAG_SECONDS", 5)
+async def test_pool_status_per_pool():
+    # Arrange
+    database = _database({"replica_1": 0, "replica_2": 0, "replica_3": 0})
+    database.replicas[0][1].fetchval.return_value = 0.5
+    database.replicas[1][1].fetchval.return_value = 60
+    database.replicas[2][1].fetchval.side_effect = Exception("connection refused")
+    
+    # Act
+    status = await database.pool_status()
+    
+    # Assert
+    assert status == {
+        "primary": "connected",
+        "replica_1": "connected",
+        "replica_2": "stale",
+        "replica_3": "disconnected",
+    }
+
+@pytest.mark.asyncio
+async def test_pool_status_primary_down():
+    # Arrange
+    database = _database({})
+    database.pool.fetchval.side_effect = Exception("connection refused")
+    
+    # Act
+    status = await database.pool_status()
+    
+    # Assert
+    assert status == {"primary": "disconnected"}
+
+def test_update_pool_metrics():
+    # Arrange
+    database = _database({"replica_1": 0.5})
+    for pool, (size, idle) in ((database.pool, (4, 1)), (database.replicas[0][1], (2, 2))):
+        pool.get_size = Mock(return_value=size)
+        pool.get_idle_size = Mock(return_value=idle)
+        pool.get_max_size = Mock(return_value=10)
+    
+    # Act
+    database.update_pool_metrics()
+    
+    # Assert
+    assert REGISTRY.get_sample_value("db_pool_size", {"pool": "primary"}) == 4
+    assert REGISTRY.get_sample_value("db_pool_idle", {"pool": "primary"}) == 1
+    assert REGISTRY.get_sample_value("db_pool_max_size", {"pool": "replica_1"}) == 10
+    assert REGISTRY.get_sample_value("db_replica_lag_seconds", {"pool": "replica_1"}) == 0.5
+
+@pytest.mark.asyncio
+@patch("src.infra.data.database.settings.DATABASE_REPLICA_URLS", "postgresql://r1, ,postgresql://r2")
+async def test_connect_creates_replica_pools_and_skips_unavailable():
+    # Arrange
+    primary, replica = AsyncMock(), AsyncMock()
+    create_pool = AsyncMock(side_effect=[primary, replica, Exception("connection refused")])
+    database = Database()
+
+    # Act
+    with patch("src.infra.data.database.asyncpg.create_pool", create_pool), \
+            patch.object(Database, "_monitor_replicas", new=AsyncMock()):
+        await database.connect()
+        monitor = database._monitor
+        await monitor
+
+    # Assert
+    assert database.pool is primary
+    assert database.replicas == [("replica_1", replica)]
+    assert [c.kwargs["dsn"] for c in create_pool.await_args_list][1:] == ["postgresql://r1", "postgresql://r2"]
+    assert monitor is not None
+
+@pytest.mark.asyncio
+@patch("src.infra.data.database.settings.DATABASE_REPLICA_URLS", "")
+async def test_connect_without_replicas_skips_monitor():
+    # Arrange
+    database = Database()
+
+    # Act
+    with patch("src.infra.data.database.asyncpg.create_pool", AsyncMock()) as create_pool:
+        await database.connect()
+
+    # Assert
+    create_pool.assert_awaited_once()
+    assert database.replicas == []
+    assert database._monitor is None
+
+@pytest.mark.asyncio
+async def test_connect_primary_failure_raises():
+    # Arrange
+    database = Database()
+
+    # Act / Assert
+    with patch("src.infra.data.database.asyncpg.create_pool", AsyncMock(side_effect=Exception("boom"))):
+        with pytest.raises(Exception, match="boom"):
+            await database.connect()
+
+@pytest.mark.asyncio
+async def test_monitor_replicas_records_lag_each_cycle():
+    # Arrange (o segundo sleep interrompe o loop)
+    database = _database({"replica_1": None, "replica_2": None})
+    database.replicas[0][1].fetchval.return_value = 0.5
+    database.replicas[1][1].fetchval.side_effect = Exception("connection refused")
+    sleep = AsyncMock(side_effect=[None, asyncio.CancelledError()])
+
+    # Act
+    with patch("src.infra.data.database.asyncio.sleep", sleep):
+        with pytest.raises(asyncio.CancelledError):
+            await database._monitor_replicas()
+
+    # Assert
+    assert database.replica_lag == {"replica_1": 0.5, "replica_2": None}
+    assert sleep.await_count == 2
+    assert database.replicas[0][1].fetchval.await_count == 2
+
+@pytest.mark.asyncio
+async def test_disconnect_closes_replicas_and_stops_monitor():
+    # Arrange
+    database = _database({"replica_1": 0.5})
+    replica = database.replicas[0][1]
+    monitor = Mock()
+    database._monitor = monitor
+
+    # Act
+    await database.disconnect()
+
+    # Assert
+    monitor.cancel.assert_called_once()
+    replica.close.assert_awaited_once()
+    database.pool.close.assert_awaited_once()
+    assert database._monitor is None
+    assert database.replicas == []
+    assert database.replica_lag == {}
@@ -0,0 +1,62 @@
+import pytest
+from datetime import date
+from unittest.mock import AsyncMock
+
+from src.infra.data.partitions import add_months, partition_month, ensure_partitions, detach_partitions_before
+
+def test_add_months_crosses_year():
+    assert add_months(date(2024, 11, 15), 0) == date(2024, 11, 1)
+    assert add_months(date(2024, 11, 15), 3) == date(2025, 2, 1)
+    assert add_months(date(2024, 1, 31), -1) == date(2023, 12, 1)
+
+def test_partition_month():
+    assert partition_month("transactions_2024_03") == date(2024, 3, 1)
+
+@pytest.mark.asyncio
+async def test_ensure_partitions_creates_current_and_next_months():
+    # Arrange (o mês atual já existe)
+    pool = AsyncMock()
+    pool.fetch.return_value = []
+    pool.fetchval.side_effect = [False, True, True]
+    
+    # Act
+    created = await ensure_partitions(pool, 2, today=date(2024, 12, 10))
+    
+    # Assert
+    assert created == [date(2025, 1, 1), date(2025, 2, 1)]
+    assert [c.args[1] for c in pool.fetchval.call_args_list] == [
+        date(2024, 12, 1), date(2025, 1, 1), date(2025, 2, 1)
+    ]
+
+@pytest.mark.asyncio
+async def test_ensure_partitions_moves_months_stuck_in_default():
+    # Arrange (linhas de 2023 na default e uma de janeiro, que também é mês à frente)
+    pool = AsyncMock()
+    pool.fetch.return_value = [{"month": date(2023, 3, 1)}, {"month": date(2025, 1, 1)}]
+    pool.fetchval.return_value = True
+    
+    # Act
+    created = await ensure_partitions(pool, 1, today=date(2024, 12, 10))
+    
+    # Assert
+    assert "transactions_default" in pool.fetch.call_args.args[0]
+    assert created == [date(2023, 3, 1), date(2024, 12, 1), date(2025, 1, 1)]
+    assert pool.fetchval.await_count == 3
+
+@pytest.mark.asyncio
+async def test_detach_only_months_before_cutoff():
+    # Arrange
+    pool = AsyncMock()
+    pool.fetch.return_value = [
+        {"relname": "transactions_2023_11"},
+        {"relname": "transactions_2023_12"},
+        {"relname": "transactions_2024_01"},
+    ]
+    pool.fetchval.side_effect = ["transactions_2023_11", "transactions_2023_12"]
+    
+    # Act
+    detached = await detach_partitions_before(pool, date(2024, 1, 1))
+    
+    # Assert
+    assert detached == ["transactions_2023_11", "transactions_2023_12"]
+    assert [c.args[1] for c in pool.fetchval.call_args_list] == [date(2023, 11, 1), date(2023, 12, 1)]
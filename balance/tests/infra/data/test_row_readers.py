@@ -0,0 +1,67 @@
+import pytest
+
+from src.infra.data.row_readers import iter_lines, read_ndjson, read_csv
+
+async def _chunks(*parts: bytes):
+    for part in parts:
+        yield part
+
+async def _collect(rows):
+    return [row async for row in rows]
+
+@pytest.mark.asyncio
+async def test_iter_lines_joins_split_chunks():
+    lines = await _collect(iter_lines(_chunks(b"ab", b"c\r\nde", b"f\n", b"gh")))
+
+    assert lines == ["abc", "def", "gh"]
+
+@pytest.mark.asyncio
+async def test_read_ndjson_reports_invalid_lines():
+    # Act
+    rows = await _collect(read_ndjson(_chunks(b'{"item": "Uber"}\n\n{invalid\n')))
+
+    # Assert
+    assert rows[0] == (1, {"item": "Uber"})
+    assert rows[1][0] == 3
+    assert isinstance(rows[1][1], ValueError)
+
+@pytest.mark.asyncio
+async def test_read_csv_uses_header():
+    # Arrange
+    body = b'item,valor,data\nUber,25.00,2023-01-02\n"Mercado, feira",150.90,2023-01-03\nsem,colunas\n'
+
+    # Act
+    rows = await _collect(read_csv(_chunks(body)))
+
+    # Assert
+    assert rows[0] == (2, {"item": "Uber", "valor": "25.00", "data": "2023-01-02"})
+    assert rows[1] == (3, {"item": "Mercado, feira", "valor": "150.90", "data": "2023-01-03"})
+    assert rows[2][0] == 4
+    assert isinstance(rows[2][1], ValueError)
+
+@pytest.mark.asyncio
+async def test_read_csv_quoted_field_with_newlines():
+    # Arrange (descricao com quebras de linha, dividida entre os chunks)
+    body = (
+        b'item,valor,descricao\r\n'
+        b'Mercado,150.90,"compras do m\xc3\xaas\r\nfeira, a\xc3\xa7ougue'
+        b'\npadaria"\r\n'
+        b'Uber,25.00,corrida\r\n'
+        b'sem,colunas\r\n'
+    )
+
+    # Act
+    rows = await _collect(read_csv(_chunks(body[:40], body[40:70], body[70:])))
+
+    # Assert (números das linhas físicas do arquivo)
+    assert rows[0] == (4, {"item": "Mercado", "valor": "150.90", "descricao": "compras do mês\r\nfeira, açougue\npadaria"})
+    assert rows[1] == (5, {"item": "Uber", "valor": "25.00", "descricao": "corrida"})
+    assert rows[2][0] == 6
+    assert isinstance(rows[2][1], ValueError)
+
+@pytest.mark.asyncio
+async def test_read_csv_unclosed_quote_is_reported():
+    rows = await _collect(read_csv(_chunks(b'item,valor\nUber,"25.00\n')))
+
+    assert rows[0][0] == 2
+    assert isinstance(rows[0][1], ValueError)
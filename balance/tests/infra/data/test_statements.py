@@ -0,0 +1,101 @@
+import pytest
+from unittest.mock import AsyncMock, Mock
+from prometheus_client import REGISTRY
+
+from src.infra.data.statements import STATEMENTS, StatementConnection, init_connection, run, run_sql
+
+class _Acquire:
+    def __init__(self, conn):
+        self.conn = conn
+
+    async def __aenter__(self):
+        return self.conn
+
+    async def __aexit__(self, *exc):
+        return False
+
+def _pool(conn):
+    pool = Mock()
+    pool.acquire.return_value = _Acquire(conn)
+    return pool
+
+def test_statements_have_explicit_projections():
+    for sql in STATEMENTS.values():
+        assert "RETURNING *" not in sql
+
+def test_source_statements_record_owner():
+    for name in ("upsert_transactions_by_source", "upsert_many_transactions_by_source",
+                 "upsert_plan_by_source", "upsert_plans_by_source"):
+        assert "owner_id, source_chat_id, source_message_id" in STATEMENTS[name]
+
+def test_create_statements_record_owner():
+    for name in ("create_transaction", "create_transactions", "create_plan"):
+        assert "owner_id" in STATEMENTS[name]
+
+@pytest.mark.asyncio
+async def test_run_uses_prepared_statement():
+    # Arrange
+    prepared = AsyncMock()
+    prepared.fetchrow.return_value = {"id": 1}
+    conn = AsyncMock()
+    conn.statements = {"create_plan": prepared}
+    
+    # Act
+    row = await run(_pool(conn), "fetchrow", "create_plan", "a", "b")
+    
+    # Assert
+    assert row == {"id": 1}
+    prepared.fetchrow.assert_awaited_once_with("a", "b")
+    conn.fetchrow.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_run_falls_back_to_statement_text():
+    # Arrange
+    conn = AsyncMock()
+    conn.statements = {}
+    
+    # Act
+    await run(_pool(conn), "fetch", "source_months", 1, 2)
+    
+    # Assert
+    conn.fetch.assert_awaited_once_with(STATEMENTS["source_months"], 1, 2)
+
+@pytest.mark.asyncio
+async def test_run_sql_observes_pool_acquire():
+    # Arrange
+    conn = AsyncMock()
+    conn.fetch.return_value = [{"id": 1}]
+    before = REGISTRY.get_sample_value("db_pool_acquire_seconds_count") or 0
+    
+    # Act
+    rows = await run_sql(_pool(conn), "fetch", "SELECT id FROM ledger($1, $2)", 1, 2)
+    
+    # Assert
+    assert rows == [{"id": 1}]
+    conn.fetch.assert_awaited_once_with("SELECT id FROM ledger($1, $2)", 1, 2)
+    assert REGISTRY.get_sample_value("db_pool_acquire_seconds_count") == before + 1
+
+@pytest.mark.asyncio
+async def test_prepare_statements_once_per_connection():
+    # Arrange
+    conn = Mock()
+    conn.prepare = AsyncMock(side_effect=lambda sql: f"prepared:{len(sql)}")
+    
+    # Act
+    await StatementConnection.prepare_statements(conn)
+    
+    # Assert
+    assert set(conn.statements) == set(STATEMENTS)
+    assert conn.prepare.await_count == len(STATEMENTS)
+
+@pytest.mark.asyncio
+async def test_init_connection_tolerates_prepare_failure():
+    # Arrange
+    conn = Mock()
+    conn.prepare_statements = AsyncMock(side_effect=Exception("relation does not exist"))
+    
+    # Act (falha ao preparar não derruba a criação do pool)
+    await init_connection(conn)
+    
+    # Assert
+    conn.prepare_statements.assert_awaited_once()
@@ -0,0 +1,36 @@
+import json
+from datetime import date
+
+from src.infra.data.telegram_export import read_chat_id, iter_messages, flatten_text
+
+def _write_export(tmp_path, messages):
+    path = tmp_path / "result.json"
+    path.write_text(json.dumps({"name": "Gastos", "type": "personal_chat", "id": 42, "messages": messages}))
+    return str(path)
+
+def test_read_chat_id(tmp_path):
+    path = _write_export(tmp_path, [])
+
+    assert read_chat_id(path) == 42
+
+def test_iter_messages_skips_service_and_empty_messages(tmp_path):
+    # Arrange
+    path = _write_export(tmp_path, [
+        {"id": 1, "type": "service", "date": "2023-01-01T09:00:00", "action": "create_group"},
+        {"id": 2, "type": "message", "date": "2023-01-02T10:30:00", "from_id": "user1", "text": "uber 25"},
+        {"id": 3, "type": "message", "date": "2023-01-02T10:31:00", "from_id": "user1", "text": ""},
+        {"id": 4, "type": "message", "date": "2023-01-03T08:00:00", "from_id": "user1",
+         "text": ["mercado ", {"type": "bold", "text": "150,90"}]},
+    ])
+
+    # Act
+    messages = list(iter_messages(path))
+
+    # Assert
+    assert messages == [
+        (2, "uber 25", date(2023, 1, 2), "user1"),
+        (4, "mercado 150,90", date(2023, 1, 3), "user1"),
+    ]
+
+def test_flatten_text_unknown_format():
+    assert flatten_text(None) == ""
@@ -182,9 +182,11 @@ async def test_error_handling_returns_empty_list(ai_service):
     
     # Act
     transactions = await ai_service.parse_expense("Some message")
+    parsed = await ai_service.parse_message("Some message")
     
-    # Assert
+    # Assert (falha da IA fica marcada para nova tentativa)
     assert transactions == []
+    assert parsed.failed is True
 
 
 @pytest.mark.asyncio
@@ -212,3 +214,140 @@ async def test_debit_card_after_26th_no_shift(ai_service):
     assert len(transactions) == 1
     # Date should NOT be shifted for debit
     assert transactions[0].data == date(2024, 1, 28)
+
+
+@pytest.mark.asyncio
+async def test_fast_path_skips_llm(ai_service):
+    """Test that simple messages are parsed locally without calling OpenAI"""
+    ai_service.client.chat.completions.create = AsyncMock()
+    
+    # Act
+    transactions = await ai_service.parse_expense("uber 23,50")
+    
+    # Assert
+    assert len(transactions) == 1
+    assert transactions[0].item == "Uber"
+    assert transactions[0].valor == Decimal("23.50")
+    assert transactions[0].descricao == "uber 23,50"
+    ai_service.client.chat.completions.create.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_fast_path_installments_are_expanded(ai_service):
+    """Test that installments parsed by the fast path are expanded like the LLM ones"""
+    ai_service.client.chat.completions.create = AsyncMock()
+    
+    # Act
+    transactions = await ai_service.parse_expense("academia 300 em 3x")
+    
+    # Assert
+    assert len(transactions) == 3
+    assert all(tx.valor == Decimal("100") for tx in transactions)
+    assert "Parcela 3/3" in transactions[2].descricao
+    ai_service.client.chat.completions.create.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_cache_hit_skips_llm():
+    """Test that cached interpretations are expanded locally without calling OpenAI"""
+    cache = AsyncMock()
+    cache.get.return_value = {
+        "item": "Streaming",
+        "valor": "60",
+        "data": "2024-01-20",
+        "categoria": "Lazer",
+        "transaction_type": "expense",
+        "parcelas": 2,
+        "metodo_pagamento": "credito",
+    }
+    with patch.dict('os.environ', {'OPENAI_API_KEY': 'test-key'}):
+        service = AIAgentService(cache=cache)
+    service.client.chat.completions.create = AsyncMock()
+    
+    # Act
+    transactions = await service.parse_expense("assinatura streaming anual")
+    
+    # Assert
+    assert [tx.data for tx in transactions] == [date(2024, 1, 20), date(2024, 2, 20)]
+    assert transactions[0].valor == Decimal("30")
+    service.client.chat.completions.create.assert_not_called()
+    cache.set.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_cache_miss_stores_llm_result():
+    """Test that LLM answers are written to the cache"""
+    cache = AsyncMock()
+    cache.get.return_value = None
+    mock_response = MagicMock()
+    mock_response.choices = [MagicMock(message=MagicMock(content='''{
+        "item": "Streaming",
+        "valor": 30.00,
+        "data": "2024-01-20",
+        "categoria": "Lazer",
+        "transaction_type": "expense",
+        "parcelas": 1,
+        "metodo_pagamento": "credito"
+    }'''))]
+    with patch.dict('os.environ', {'OPENAI_API_KEY': 'test-key'}):
+        service = AIAgentService(cache=cache)
+    service.client.chat.completions.create = AsyncMock(return_value=mock_response)
+    
+    # Act
+    transactions = await service.parse_expense("assinatura streaming")
+    
+    # Assert
+    assert len(transactions) == 1
+    cache.set.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_invalid_llm_result_is_not_cached():
+    """Test that a malformed interpretation is not replayed from the cache"""
+    cache = AsyncMock()
+    cache.get.return_value = None
+    mock_response = MagicMock()
+    mock_response.choices = [MagicMock(message=MagicMock(content='''{
+        "item": "Streaming",
+        "valor": "trinta",
+        "data": "2024-01-20",
+        "categoria": "Lazer"
+    }'''))]
+    with patch.dict('os.environ', {'OPENAI_API_KEY': 'test-key'}):
+        service = AIAgentService(cache=cache)
+    service.client.chat.completions.create = AsyncMock(return_value=mock_response)
+    
+    # Act
+    parsed = await service.parse_message("assinatura streaming")
+    
+    # Assert (sem lançamento válido, mas não é falha da IA)
+    assert parsed.is_empty and not parsed.failed
+    cache.set.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_batcher_failure_falls_back_to_single_call():
+    """Test that a failed batch falls back to a dedicated completion"""
+    batcher = AsyncMock()
+    batcher.submit.side_effect = ValueError("sem resultado")
+    mock_response = MagicMock()
+    mock_response.choices = [MagicMock(message=MagicMock(content='''{
+        "item": "Streaming",
+        "valor": 30.00,
+        "data": "2024-01-20",
+        "categoria": "Lazer",
+        "transaction_type": "expense",
+        "parcelas": 1,
+        "metodo_pagamento": "credito"
+    }'''))]
+    with patch.dict('os.environ', {'OPENAI_API_KEY': 'test-key'}):
+        service = AIAgentService(batcher=batcher)
+    service.client.chat.completions.create = AsyncMock(return_value=mock_response)
+    
+    # Act
+    transactions = await service.parse_expense("assinatura streaming")
+    
+    # Assert
+    assert len(transactions) == 1
+    batcher.submit.assert_awaited_once()
+    service.client.chat.completions.create.assert_awaited_once()
@@ -0,0 +1,93 @@
+import asyncio
+import json
+import pytest
+from datetime import date
+from unittest.mock import AsyncMock, MagicMock
+
+from src.infra.services.llm_batcher import LLMBatcher
+
+TODAY = date(2024, 3, 10)
+
+
+def make_response(results):
+    response = MagicMock()
+    response.choices = [MagicMock(message=MagicMock(content=json.dumps({"results": results})))]
+    return response
+
+
+def make_client(*responses):
+    client = MagicMock()
+    client.chat.completions.create = AsyncMock(side_effect=list(responses))
+    return client
+
+
+@pytest.mark.asyncio
+async def test_flushes_when_batch_is_full():
+    # Arrange
+    client = make_client(make_response([
+        {"index": 1, "item": "B"},
+        {"index": 0, "item": "A"},
+    ]))
+    batcher = LLMBatcher(client, max_size=2, window_ms=10_000)
+
+    # Act
+    first, second = await asyncio.gather(
+        batcher.submit("mensagem a", TODAY),
+        batcher.submit("mensagem b", TODAY),
+    )
+
+    # Assert
+    assert first["item"] == "A"
+    assert second["item"] == "B"
+    client.chat.completions.create.assert_awaited_once()
+    payload = json.loads(client.chat.completions.create.call_args.kwargs["messages"][1]["content"])
+    assert [m["mensagem"] for m in payload] == ["mensagem a", "mensagem b"]
+
+
+@pytest.mark.asyncio
+async def test_flushes_after_window():
+    # Arrange
+    client = make_client(make_response([{"index": 0, "item": "A"}]))
+    batcher = LLMBatcher(client, max_size=10, window_ms=10)
+
+    # Act
+    result = await batcher.submit("mensagem a", TODAY)
+
+    # Assert
+    assert result["item"] == "A"
+    client.chat.completions.create.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_missing_result_raises_for_that_caller_only():
+    # Arrange
+    client = make_client(make_response([{"index": 0, "item": "A"}]))
+    batcher = LLMBatcher(client, max_size=2, window_ms=10_000)
+
+    # Act
+    first, second = await asyncio.gather(
+        batcher.submit("mensagem a", TODAY),
+        batcher.submit("mensagem b", TODAY),
+        return_exceptions=True,
+    )
+
+    # Assert
+    assert first["item"] == "A"
+    assert isinstance(second, ValueError)
+
+
+@pytest.mark.asyncio
+async def test_api_error_propagates_to_all_callers():
+    # Arrange
+    client = make_client(Exception("API Error"))
+    batcher = LLMBatcher(client, max_size=2, window_ms=10_000)
+
+    # Act
+    results = await asyncio.gather(
+        batcher.submit("mensagem a", TODAY),
+        batcher.submit("mensagem b", TODAY),
+        return_exceptions=True,
+    )
+
+    # Assert
+    assert all(isinstance(r, Exception) for r in results)
@@ -0,0 +1,86 @@
+import json
+import pytest
+from datetime import date
+from unittest.mock import AsyncMock
+
+from src.infra.services.parse_cache import ParseCache
+
+TODAY = date(2024, 3, 10)
+
+LLM_DATA = {
+    "item": "Netflix",
+    "valor": 55.9,
+    "data": "2024-03-10",
+    "categoria": "Lazer",
+    "transaction_type": "expense",
+    "parcelas": 1,
+    "metodo_pagamento": "credito",
+    "descricao": "netflix 55,90",
+}
+
+
+def test_key_is_normalized():
+    cache = ParseCache(AsyncMock())
+
+    assert cache.key_for("Netflix  55,90") == cache.key_for("netflix 55,90")
+    assert cache.key_for("Salário 5000") == cache.key_for("salario 5000")
+    assert cache.key_for("mercado 180 ontem") != cache.key_for("mercado 180")
+
+
+@pytest.mark.asyncio
+async def test_set_stores_fields_with_ttl():
+    client = AsyncMock()
+    cache = ParseCache(client, ttl_seconds=60)
+
+    await cache.set("netflix 55,90", TODAY, LLM_DATA)
+
+    key, raw = client.set.call_args.args
+    payload = json.loads(raw)
+    assert key == cache.key_for("netflix 55,90")
+    assert client.set.call_args.kwargs == {"ex": 60}
+    assert payload["valor"] == "55.9"
+    assert payload["day_offset"] == 0
+    assert "descricao" not in payload
+
+
+@pytest.mark.asyncio
+async def test_get_rebases_relative_date_on_today():
+    client = AsyncMock()
+    client.get.return_value = json.dumps({
+        "item": "Mercado", "valor": "180", "categoria": "Alimentação",
+        "transaction_type": "expense", "parcelas": 1, "metodo_pagamento": "debito",
+        "day_offset": -1,
+    })
+    cache = ParseCache(client)
+
+    data = await cache.get("compras mercado 180 sem cartão", date(2024, 4, 1))
+
+    assert data["data"] == "2024-03-31"
+    assert data["item"] == "Mercado"
+
+
+@pytest.mark.asyncio
+async def test_get_resolves_explicit_day_again():
+    client = AsyncMock()
+    client.get.return_value = json.dumps({
+        "item": "Aluguel", "valor": "1500", "categoria": "Moradia",
+        "transaction_type": "expense", "parcelas": 1, "metodo_pagamento": "debito",
+        "day_offset": -5,
+    })
+    cache = ParseCache(client)
+
+    data = await cache.get("boleto aluguel dia 5", TODAY)
+
+    assert data["data"] == "2024-03-05"
+
+
+@pytest.mark.asyncio
+async def test_get_miss_and_errors_return_none():
+    client = AsyncMock()
+    client.get.return_value = None
+    cache = ParseCache(client)
+
+    assert await cache.get("netflix 55,90", TODAY) is None
+
+    client.get.side_effect = Exception("Redis fora do ar")
+    assert await cache.get("netflix 55,90", TODAY) is None
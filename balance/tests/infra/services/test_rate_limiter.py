@@ -0,0 +1,102 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from openai import APIConnectionError, InternalServerError, RateLimitError
+
+from src.infra.services.rate_limiter import RateLimiter
+
+
+def make_rate_limit_error(retry_after=None):
+    error = RateLimitError.__new__(RateLimitError)
+    error.response = MagicMock(headers={"retry-after": retry_after} if retry_after else {})
+    return error
+
+
+@pytest.mark.asyncio
+async def test_run_returns_result():
+    limiter = RateLimiter(max_concurrency=2, requests_per_minute=6000)
+
+    result = await limiter.run(AsyncMock(return_value="ok"))
+
+    assert result == "ok"
+
+
+@pytest.mark.asyncio
+async def test_run_limits_concurrency():
+    limiter = RateLimiter(max_concurrency=2, requests_per_minute=60000)
+    running = 0
+    peak = 0
+
+    async def call():
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    await asyncio.gather(*(limiter.run(call) for _ in range(6)))
+
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_run_retries_on_rate_limit_with_backoff():
+    limiter = RateLimiter(max_concurrency=1, requests_per_minute=60000, max_retries=3)
+    call = AsyncMock(side_effect=[make_rate_limit_error(), make_rate_limit_error("2"), "ok"])
+
+    # Só o backoff de run() deve passar pelo sleep; o token bucket fica fora da conta
+    with patch.object(limiter, "_acquire_token", new=AsyncMock()), \
+            patch("src.infra.services.rate_limiter.asyncio.sleep", new=AsyncMock()) as sleep:
+        result = await limiter.run(call)
+
+    assert result == "ok"
+    assert call.await_count == 3
+    delays = [c.args[0] for c in sleep.await_args_list]
+    assert len(delays) == 2
+    assert 0.5 <= delays[0] <= 1.5   # base 1s com jitter
+    assert 1.0 <= delays[1] <= 3.0   # retry-after 2s com jitter
+
+
+@pytest.mark.asyncio
+async def test_run_gives_up_after_max_retries():
+    limiter = RateLimiter(max_concurrency=1, requests_per_minute=60000, max_retries=1)
+    call = AsyncMock(side_effect=make_rate_limit_error())
+
+    with patch.object(limiter, "_acquire_token", new=AsyncMock()), \
+            patch("src.infra.services.rate_limiter.asyncio.sleep", new=AsyncMock()):
+        with pytest.raises(RateLimitError):
+            await limiter.run(call)
+
+    assert call.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_run_retries_server_and_connection_errors():
+    # Arrange (um 5xx e uma queda de conexão antes do sucesso)
+    limiter = RateLimiter(max_concurrency=1, requests_per_minute=60000, max_retries=3)
+    server_error = InternalServerError.__new__(InternalServerError)
+    server_error.response = MagicMock(headers={})
+    connection_error = APIConnectionError(request=MagicMock())
+    call = AsyncMock(side_effect=[server_error, connection_error, "ok"])
+
+    # Act
+    with patch.object(limiter, "_acquire_token", new=AsyncMock()), \
+            patch("src.infra.services.rate_limiter.asyncio.sleep", new=AsyncMock()) as sleep:
+        result = await limiter.run(call)
+
+    # Assert
+    assert result == "ok"
+    assert call.await_count == 3
+    assert sleep.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_run_does_not_retry_other_errors():
+    limiter = RateLimiter(max_concurrency=1, requests_per_minute=60000, max_retries=3)
+    call = AsyncMock(side_effect=ValueError("resposta inválida"))
+
+    with patch.object(limiter, "_acquire_token", new=AsyncMock()):
+        with pytest.raises(ValueError):
+            await limiter.run(call)
+
+    assert call.await_count == 1
@@ -0,0 +1,152 @@
+import json
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from redis.exceptions import ResponseError
+
+from src.infra.services.redis_stream_queue import RedisStreamQueue
+from src.domain.interfaces.services.imessage_queue import QueueFullError
+
+
+@pytest.fixture
+def mock_client():
+    client = AsyncMock()
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(return_value=[1, 1])
+    client.pipeline = MagicMock()
+    client.pipeline.return_value.__aenter__ = AsyncMock(return_value=pipe)
+    client.pipeline.return_value.__aexit__ = AsyncMock(return_value=False)
+    client.pipe = pipe
+    return client
+
+
+@pytest.mark.asyncio
+async def test_enqueue_adds_raw_update(mock_client):
+    # Arrange
+    mock_client.xlen.return_value = 0
+    mock_client.xadd.return_value = "1-0"
+    queue = RedisStreamQueue(mock_client, stream="updates", max_backlog=10)
+    update = {"update_id": 1, "message": {"text": "uber 23,50"}}
+
+    # Act
+    entry_id = await queue.enqueue(update)
+
+    # Assert
+    assert entry_id == "1-0"
+    mock_client.xadd.assert_awaited_once_with("updates", {"update": json.dumps(update)})
+    mock_client.set.assert_awaited_once_with("updates:seen:1", 1, nx=True, ex=queue.dedupe_ttl_seconds)
+
+
+@pytest.mark.asyncio
+async def test_enqueue_ignores_redelivered_update(mock_client):
+    # Arrange
+    mock_client.xlen.return_value = 0
+    mock_client.set.return_value = None  # SET NX não gravou: update_id já visto
+    queue = RedisStreamQueue(mock_client, stream="updates")
+
+    # Act
+    entry_id = await queue.enqueue({"update_id": 1, "message": {"text": "uber 23,50"}})
+
+    # Assert
+    assert entry_id is None
+    mock_client.xadd.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_enqueue_failure_releases_dedupe_key(mock_client):
+    # Arrange
+    mock_client.xlen.return_value = 0
+    mock_client.xadd.side_effect = Exception("Redis fora do ar")
+    queue = RedisStreamQueue(mock_client, stream="updates")
+
+    # Act / Assert
+    with pytest.raises(Exception):
+        await queue.enqueue({"update_id": 1})
+    mock_client.delete.assert_awaited_once_with("updates:seen:1")
+
+
+@pytest.mark.asyncio
+async def test_enqueue_rejects_when_backlog_full(mock_client):
+    # Arrange
+    mock_client.xlen.return_value = 10
+    queue = RedisStreamQueue(mock_client, max_backlog=10)
+
+    # Act / Assert
+    with pytest.raises(QueueFullError):
+        await queue.enqueue({"update_id": 1})
+    mock_client.xadd.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_ensure_group_ignores_existing_group(mock_client):
+    # Arrange
+    mock_client.xgroup_create.side_effect = ResponseError("BUSYGROUP Consumer Group name already exists")
+    queue = RedisStreamQueue(mock_client)
+
+    # Act / Assert (não deve lançar)
+    await queue.ensure_group()
+
+
+@pytest.mark.asyncio
+async def test_read_returns_first_entry(mock_client):
+    # Arrange
+    mock_client.xreadgroup.return_value = [["updates", [("1-0", {"update": "{}"})]]]
+    queue = RedisStreamQueue(mock_client, stream="updates")
+
+    # Act
+    entry = await queue.read("worker-0", block_ms=10)
+
+    # Assert
+    assert entry == ("1-0", {"update": "{}"})
+
+
+@pytest.mark.asyncio
+async def test_read_timeout_returns_none(mock_client):
+    # Arrange
+    mock_client.xreadgroup.return_value = []
+    queue = RedisStreamQueue(mock_client)
+
+    # Act / Assert
+    assert await queue.read("worker-0", block_ms=10) is None
+
+
+@pytest.mark.asyncio
+async def test_ack_acknowledges_and_deletes(mock_client):
+    # Arrange
+    queue = RedisStreamQueue(mock_client, stream="updates", group="ingestion")
+
+    # Act
+    await queue.ack("1-0")
+
+    # Assert
+    mock_client.pipe.xack.assert_called_once_with("updates", "ingestion", "1-0")
+    mock_client.pipe.xdel.assert_called_once_with("updates", "1-0")
+    mock_client.pipe.execute.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_dead_letter_moves_entry(mock_client):
+    # Arrange
+    queue = RedisStreamQueue(mock_client, stream="updates", dead_letter_stream="updates:dead")
+
+    # Act
+    await queue.dead_letter("1-0", {"update": "{}"}, "falhou")
+
+    # Assert
+    mock_client.xadd.assert_awaited_once_with(
+        "updates:dead", {"update": "{}", "source_id": "1-0", "reason": "falhou"}
+    )
+    mock_client.pipe.xdel.assert_called_once_with("updates", "1-0")
+
+
+@pytest.mark.asyncio
+async def test_depth_is_stream_length(mock_client):
+    # Arrange
+    mock_client.xlen.return_value = 42
+    queue = RedisStreamQueue(mock_client, stream="telegram:updates")
+
+    # Act
+    depth = await queue.depth()
+
+    # Assert
+    assert depth == 42
+    mock_client.xlen.assert_awaited_once_with("telegram:updates")
@@ -0,0 +1,92 @@
+import asyncio
+import pytest
+from datetime import date
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.infra.services.response_cache import ResponseCache, months_between
+
+
+def test_months_between():
+    assert months_between(date(2023, 11, 15), date(2024, 2, 1)) == ["2023-11", "2023-12", "2024-01", "2024-02"]
+    assert months_between(date(2024, 2, 1), date(2024, 1, 1)) == []
+
+
+@pytest.mark.asyncio
+async def test_key_changes_with_month_version():
+    client = AsyncMock()
+    cache = ResponseCache(client)
+    params = [("start_date", "2024-01-01"), ("end_date", "2024-02-29")]
+
+    client.mget.return_value = [None, None]
+    before = await cache.key_for("period", params, date(2024, 1, 1), date(2024, 2, 29))
+
+    client.mget.return_value = [None, "1"]
+    after = await cache.key_for("period", list(reversed(params)), date(2024, 1, 1), date(2024, 2, 29))
+
+    assert before.startswith("resp:period:")
+    assert before != after
+    assert client.mget.call_args.args[0] == ["resp:month:2024-01", "resp:month:2024-02"]
+
+
+@pytest.mark.asyncio
+async def test_key_skips_long_ranges():
+    client = AsyncMock()
+    cache = ResponseCache(client, max_months=12)
+
+    key = await cache.key_for("period", [], date(2020, 1, 1), date(2024, 1, 1))
+
+    assert key is None
+    client.mget.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_key_skips_full_range_without_building_months():
+    client = AsyncMock()
+    cache = ResponseCache(client, max_months=12)
+
+    with patch("src.infra.services.response_cache.months_between") as months:
+        key = await cache.key_for("search", [], date(1900, 1, 1), date(9999, 12, 31))
+        empty = await cache.key_for("search", [], date(2024, 2, 1), date(2024, 1, 1))
+
+    assert key is None and empty is None
+    months.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_invalidate_increments_each_month_once():
+    pipe = MagicMock()
+    pipe.execute = AsyncMock()
+    client = MagicMock()
+    client.pipeline.return_value.__aenter__ = AsyncMock(return_value=pipe)
+    client.pipeline.return_value.__aexit__ = AsyncMock(return_value=False)
+    cache = ResponseCache(client)
+
+    await cache.invalidate(["2024-02", "2024-01", "2024-02"])
+
+    assert [c.args[0] for c in pipe.incr.call_args_list] == ["resp:month:2024-01", "resp:month:2024-02"]
+    pipe.execute.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_invalidate_again_after_replica_staleness():
+    pipe = MagicMock()
+    pipe.execute = AsyncMock()
+    client = MagicMock()
+    client.pipeline.return_value.__aenter__ = AsyncMock(return_value=pipe)
+    client.pipeline.return_value.__aexit__ = AsyncMock(return_value=False)
+    cache = ResponseCache(client, reinvalidate_after=0.01)
+
+    await cache.invalidate(["2024-01"])
+    assert pipe.execute.await_count == 1
+
+    await asyncio.gather(*cache._pending)
+    assert pipe.execute.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_redis_errors_do_not_break_reads():
+    client = AsyncMock()
+    client.get.side_effect = ConnectionError("redis down")
+    cache = ResponseCache(client)
+
+    assert await cache.get("resp:period:abc") is None
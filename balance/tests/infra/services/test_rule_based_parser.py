@@ -0,0 +1,103 @@
+import pytest
+from datetime import date
+from decimal import Decimal
+
+from src.infra.services.rule_based_parser import RuleBasedParser, parse_amount, resolve_date
+
+TODAY = date(2024, 3, 10)
+
+
+@pytest.mark.parametrize("token, expected", [
+    ("23,50", Decimal("23.50")),
+    ("180", Decimal("180")),
+    ("1.234,56", Decimal("1234.56")),
+    ("1.500", Decimal("1500")),
+    ("23.5", Decimal("23.5")),
+    ("r$55,90", Decimal("55.90")),
+    ("uber", None),
+    ("0", None),
+])
+def test_parse_amount_br_formats(token, expected):
+    assert parse_amount(token) == expected
+
+
+@pytest.mark.parametrize("tokens, expected", [
+    (["hoje"], date(2024, 3, 10)),
+    (["ontem"], date(2024, 3, 9)),
+    (["anteontem"], date(2024, 3, 8)),
+    (["dia", "5"], date(2024, 3, 5)),
+    (["dia", "28"], date(2024, 2, 28)),
+    (["15/01"], date(2024, 1, 15)),
+    (["15/01/23"], date(2023, 1, 15)),
+    (["31/02"], None),
+])
+def test_resolve_date(tokens, expected):
+    assert resolve_date(tokens, TODAY) == expected
+
+
+def test_parse_simple_expense():
+    parser = RuleBasedParser(min_confidence=0.8)
+
+    result = parser.parse("uber 23,50", TODAY)
+
+    assert result["item"] == "Uber"
+    assert result["valor"] == "23.50"
+    assert result["data"] == "2024-03-10"
+    assert result["categoria"] == "Transporte"
+    assert result["transaction_type"] == "expense"
+    assert result["parcelas"] == 1
+
+
+def test_parse_relative_date():
+    parser = RuleBasedParser(min_confidence=0.8)
+
+    result = parser.parse("mercado 180 ontem", TODAY)
+
+    assert result["item"] == "Mercado"
+    assert result["valor"] == "180"
+    assert result["data"] == "2024-03-09"
+
+
+def test_parse_income_keyword():
+    parser = RuleBasedParser(min_confidence=0.8)
+
+    result = parser.parse("salário 5000", TODAY)
+
+    assert result["item"] == "Salário"
+    assert result["transaction_type"] == "income"
+    assert result["categoria"] == "Salário"
+
+
+@pytest.mark.parametrize("text", ["netflix 55,90 em 3x", "netflix 55,90 3 vezes no cartão"])
+def test_parse_installments_marks_credit(text):
+    parser = RuleBasedParser(min_confidence=0.8)
+
+    result = parser.parse(text, TODAY)
+
+    assert result["parcelas"] == 3
+    assert result["metodo_pagamento"] == "credito"
+
+
+@pytest.mark.parametrize("text", [
+    "tenis de corrida 350",          # categoria desconhecida
+    "uber 23,50 e 99 de gorjeta",    # mais de um valor
+    "mercado parcelado 180",         # parcelado sem número de parcelas
+    "almoço com o pessoal",          # sem valor
+    "reembolso mercado 50",          # palavras-chave de receita e de despesa
+    "uber ifood 30",                 # palavras-chave de categorias diferentes
+])
+def test_low_confidence_falls_back(text):
+    parser = RuleBasedParser(min_confidence=0.8)
+
+    assert parser.parse(text, TODAY) is None
+
+
+def test_hit_rate_metrics():
+    parser = RuleBasedParser(min_confidence=0.8)
+
+    parser.parse("uber 23,50", TODAY)
+    parser.parse("tenis de corrida 350", TODAY)
+
+    assert parser.hits == 1
+    assert parser.misses == 1
+    assert parser.hit_rate == 0.5
@@ -0,0 +1,209 @@
+from datetime import date, datetime
+from decimal import Decimal
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.domain.models.period_summary import PeriodSummary
+from src.infra.core.dependencies import get_response_cache, get_transaction_repo
+from src.presentation.routes import transactions
+
+class _MemoryRepository:
+    """Ledger em memória com as operações usadas pela importação e por /period"""
+
+    def __init__(self):
+        self.rows = []
+
+    async def copy_many(self, chunk, owner_id=0):
+        for t in chunk:
+            self.rows.append({
+                "owner_id": owner_id,
+                "id": len(self.rows) + 1,
+                "item": t.item,
+                "valor": t.valor,
+                "data": t.data,
+                "categoria": t.categoria,
+                "descricao": t.descricao,
+                "transaction_type": t.transaction_type,
+                "created_at": datetime(2024, 1, 1),
+                "parcela": None,
+            })
+        return len(chunk)
+
+    def _matching(self, start_date, end_date, filters):
+        return [
+            row for row in self.rows
+            if start_date <= row["data"] <= end_date
+            and (filters.owner_id is None or row["owner_id"] == filters.owner_id)
+        ]
+
+    async def list_by_period_rows(self, start_date, end_date, limit=None, after=None, filters=None, slim=False):
+        return [{k: v for k, v in row.items() if k != "owner_id"} for row in self._matching(start_date, end_date, filters)]
+
+    async def summarize_period(self, start_date, end_date, filters=None):
+        rows = self._matching(start_date, end_date, filters)
+        expense = sum((row["valor"] for row in rows), Decimal("0.00"))
+        return PeriodSummary(expense=expense, net=-expense, count=len(rows))
+
+    async def search_rows(self, text, start_date, end_date, limit=None, after=None, filters=None):
+        rows = await self.list_by_period_rows(start_date, end_date, filters=filters)
+        return [{**row, "rank": 1.0} for row in rows if text.lower() in row["item"].lower()]
+
+    async def summarize_search(self, text, start_date, end_date, filters=None):
+        rows = await self.search_rows(text, start_date, end_date, filters=filters)
+        expense = sum((row["valor"] for row in rows), Decimal("0.00"))
+        return PeriodSummary(expense=expense, net=-expense, count=len(rows))
+
+    async def running_balance(self, start_date, end_date, owner_id=None):
+        return [{"data": start_date, "net": Decimal("-25.00"), "balance": Decimal("75.00")}] if self.rows else None
+
+    async def iter_by_period(self, start_date, end_date, filters=None):
+        for row in await self.list_by_period_rows(start_date, end_date, filters=filters):
+            yield row
+
+def _client(repo):
+    app = FastAPI()
+    app.include_router(transactions.router)
+    app.dependency_overrides[get_transaction_repo] = lambda: repo
+    app.dependency_overrides[get_response_cache] = lambda: None
+    return TestClient(app)
+
+def _imported(owner_id=42):
+    """Repositório com duas linhas importadas via CSV para `owner_id`"""
+    repo = _MemoryRepository()
+    client = _client(repo)
+    body = (
+        "item,valor,data,categoria,descricao\n"
+        "Uber,25.00,2024-01-02,Transporte,extrato\n"
+        "iFood,80.00,2024-01-03,Alimentação,extrato\n"
+    )
+    response = client.post(
+        "/transactions/batch", params={"owner_id": owner_id}, content=body,
+        headers={"content-type": "text/csv"},
+    )
+    assert response.json()["imported"] == 2
+    return repo, client
+
+def test_import_batch_is_read_back_by_owner():
+    # Arrange
+    repo = _MemoryRepository()
+    client = _client(repo)
+    body = (
+        '{"item": "Uber", "valor": "25.00", "data": "2024-01-02", "categoria": "Transporte", "descricao": "extrato"}\n'
+        '{"item": "Mercado", "valor": "80.00", "data": "2024-01-03", "categoria": "Alimentação", "descricao": "extrato"}\n'
+    )
+    period = {"start_date": "2024-01-01", "end_date": "2024-01-31"}
+    
+    # Act
+    imported = client.post(
+        "/transactions/batch", params={"owner_id": 42}, content=body,
+        headers={"content-type": "application/x-ndjson"},
+    )
+    own = client.get("/transactions/period", params={**period, "owner_id": 42})
+    other = client.get("/transactions/period", params={**period, "owner_id": 7})
+    
+    # Assert
+    assert imported.json()["imported"] == 2
+    assert [t["item"] for t in own.json()["transactions"]] == ["Uber", "Mercado"]
+    assert own.json()["total"] == 2
+    assert other.json()["transactions"] == []
+    assert {row["owner_id"] for row in repo.rows} == {42}
+
+def test_import_batch_rejects_unknown_content_type():
+    # Arrange
+    client = _client(_MemoryRepository())
+    
+    # Act
+    response = client.post("/transactions/batch", content="x", headers={"content-type": "text/plain"})
+    
+    # Assert
+    assert response.status_code == 415
+
+def test_summary_is_scoped_by_owner():
+    # Arrange
+    repo, client = _imported(owner_id=42)
+    period = {"start_date": "2024-01-01", "end_date": "2024-01-31"}
+    
+    # Act
+    own = client.get("/transactions/summary", params={**period, "owner_id": 42})
+    other = client.get("/transactions/summary", params={**period, "owner_id": 7})
+    
+    # Assert
+    assert (own.json()["total"], own.json()["expense"]) == (2, "105.00")
+    assert other.json()["total"] == 0
+
+def test_period_answers_304_for_current_etag():
+    # Arrange
+    repo, client = _imported()
+    params = {"start_date": "2024-01-01", "end_date": "2024-01-31", "owner_id": 42}
+    etag = client.get("/transactions/period", params=params).headers["etag"]
+    
+    # Act
+    response = client.get("/transactions/period", params=params, headers={"if-none-match": etag})
+    
+    # Assert
+    assert response.status_code == 304
+
+def test_period_rejects_invalid_cursor():
+    # Arrange
+    client = _client(_MemoryRepository())
+    
+    # Act
+    response = client.get("/transactions/period", params={
+        "start_date": "2024-01-01", "end_date": "2024-01-31", "cursor": "inválido",
+    })
+    
+    # Assert
+    assert response.status_code == 400
+
+def test_search_by_owner():
+    # Arrange
+    repo, client = _imported(owner_id=42)
+    
+    # Act
+    response = client.get("/transactions/search", params={"q": "ifood", "owner_id": 42})
+    
+    # Assert
+    assert [t["item"] for t in response.json()["transactions"]] == ["iFood"]
+    assert response.json()["expense"] == "80.00"
+
+def test_running_balance():
+    # Arrange
+    repo, client = _imported()
+    
+    # Act
+    response = client.get("/transactions/running-balance", params={
+        "start_date": "2024-01-01", "end_date": "2024-01-31", "owner_id": 42,
+    })
+    invalid = client.get("/transactions/running-balance", params={
+        "start_date": "2024-01-31", "end_date": "2024-01-01",
+    })
+    
+    # Assert
+    assert response.json()["opening_balance"] == "100.00"
+    assert invalid.status_code == 400
+
+def test_running_balance_unavailable():
+    # Arrange
+    client = _client(_MemoryRepository())
+    
+    # Act
+    response = client.get("/transactions/running-balance", params={
+        "start_date": "2024-01-01", "end_date": "2024-01-31",
+    })
+    
+    # Assert
+    assert response.status_code == 503
+
+def test_export_csv_by_owner():
+    # Arrange
+    repo, client = _imported(owner_id=42)
+    
+    # Act
+    response = client.get("/transactions/export", params={
+        "start_date": "2024-01-01", "end_date": "2024-01-31", "format": "csv", "owner_id": 42,
+    })
+    
+    # Assert
+    assert "transactions_2024-01-01_2024-01-31.csv" in response.headers["content-disposition"]
+    assert "Uber" in response.text and "iFood" in response.text
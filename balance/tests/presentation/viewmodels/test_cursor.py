@@ -0,0 +1,25 @@
+import pytest
+from datetime import date, datetime
+
+from src.presentation.viewmodels.cursor import encode_cursor, decode_cursor, encode_search_cursor, decode_search_cursor
+
+def test_cursor_round_trip():
+    key = (date(2023, 1, 15), datetime(2023, 1, 15, 10, 30, 5, 123456), 42)
+
+    assert decode_cursor(encode_cursor(key)) == key
+
+def test_decode_invalid_cursor():
+    with pytest.raises(ValueError):
+        decode_cursor("nao-e-um-cursor")
+
+def test_search_cursor_round_trip():
+    # O rank (float8) precisa voltar exatamente igual para a comparação de tupla
+    key = (0.4166666567325592, date(2023, 1, 15), datetime(2023, 1, 15, 10, 30, 5, 123456), 42)
+
+    assert decode_search_cursor(encode_search_cursor(key)) == key
+
+def test_search_cursor_rejects_period_cursor():
+    period_cursor = encode_cursor((date(2023, 1, 15), datetime(2023, 1, 15, 10, 30), 42))
+
+    with pytest.raises(ValueError):
+        decode_search_cursor(period_cursor)
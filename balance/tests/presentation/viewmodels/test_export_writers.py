@@ -0,0 +1,63 @@
+import csv
+import io
+import json
+import pytest
+from datetime import date, datetime
+from decimal import Decimal
+
+from src.presentation.viewmodels.export_writers import ndjson_chunks, csv_chunks, EXPORT_COLUMNS
+
+def _row(i):
+    return {
+        "id": i,
+        "item": f"Item {i}",
+        "valor": Decimal("10.50"),
+        "data": date(2023, 1, 1),
+        "categoria": "Alimentação",
+        "descricao": "gastei 10,50, no mercado",
+        "transaction_type": "expense",
+        "created_at": datetime(2023, 1, 1, 9, 0),
+        "parcela": None,
+    }
+
+async def _rows(n):
+    for i in range(n):
+        yield _row(i)
+
+async def _collect(chunks):
+    return [chunk async for chunk in chunks]
+
+@pytest.mark.asyncio
+async def test_ndjson_chunks_fixed_size():
+    # Act
+    chunks = await _collect(ndjson_chunks(_rows(50), chunk_bytes=1024))
+
+    # Assert
+    assert len(chunks) > 1
+    assert all(len(chunk) < 1024 + 512 for chunk in chunks)
+    lines = b"".join(chunks).decode("utf-8").splitlines()
+    assert len(lines) == 50
+    assert json.loads(lines[0])["valor"] == "10.50"
+    assert json.loads(lines[-1])["id"] == 49
+
+@pytest.mark.asyncio
+async def test_csv_chunks_header_and_quoting():
+    # Act
+    chunks = await _collect(csv_chunks(_rows(50), chunk_bytes=1024))
+
+    # Assert
+    assert len(chunks) > 1
+    reader = list(csv.reader(io.StringIO(b"".join(chunks).decode("utf-8"))))
+    assert reader[0] == list(EXPORT_COLUMNS)
+    assert len(reader) == 51
+    assert reader[1][5] == "gastei 10,50, no mercado"
+    assert reader[1][2] == "10.50"
+
+@pytest.mark.asyncio
+async def test_empty_export_still_has_csv_header():
+    # Act
+    chunks = await _collect(csv_chunks(_rows(0)))
+    
+    # Assert
+    assert b"".join(chunks).decode("utf-8").strip() == ",".join(EXPORT_COLUMNS)
+    assert await _collect(ndjson_chunks(_rows(0))) == []
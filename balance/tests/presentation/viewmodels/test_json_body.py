@@ -0,0 +1,21 @@
+from datetime import date, datetime
+from decimal import Decimal
+
+from src.presentation.viewmodels.json_body import dumps
+from src.presentation.viewmodels.schemas import ExpenseListResponse
+
+def test_dumps_matches_pydantic_output():
+    row = {
+        "id": 7,
+        "item": "Mercado",
+        "valor": Decimal("150.90"),
+        "data": date(2023, 1, 15),
+        "categoria": "Alimentação",
+        "descricao": "gastei 150,90 no mercado",
+        "transaction_type": "expense",
+        "created_at": datetime(2023, 1, 15, 10, 30, 5, 123456),
+        "parcela": 2,
+    }
+    body = {"total": 1, "balance": Decimal("-150.90"), "transactions": [row], "next_cursor": None}
+
+    assert dumps(body) == ExpenseListResponse(**body).model_dump_json().encode("utf-8")
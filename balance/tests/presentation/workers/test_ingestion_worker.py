@@ -0,0 +1,139 @@
+import json
+import pytest
+from unittest.mock import AsyncMock
+
+from src.application.usecases.process_telegram_message import ProcessOutcome
+from src.presentation.workers.ingestion_worker import IngestionWorker
+
+
+def make_fields(update):
+    return {"update": json.dumps(update)}
+
+
+@pytest.fixture
+def queue():
+    return AsyncMock()
+
+
+@pytest.fixture
+def use_case():
+    return AsyncMock()
+
+
+@pytest.mark.asyncio
+async def test_handle_success_acks(queue, use_case):
+    # Arrange
+    use_case.execute.return_value = ProcessOutcome.RECORDED
+    worker = IngestionWorker(queue, use_case, name="test")
+
+    # Act
+    await worker.handle("1-0", make_fields({
+        "message": {"message_id": 7, "chat": {"id": 42}, "text": "uber 23,50"}
+    }))
+
+    # Assert
+    use_case.execute.assert_awaited_once_with("uber 23,50", chat_id=42, message_id=7)
+    queue.ack.assert_awaited_once_with("1-0")
+    queue.dead_letter.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_handle_failure_keeps_pending(queue, use_case):
+    # Arrange
+    use_case.execute.return_value = ProcessOutcome.FAILED
+    queue.delivery_count.return_value = 1
+    worker = IngestionWorker(queue, use_case, max_deliveries=3, name="test")
+
+    # Act
+    await worker.handle("1-0", make_fields({"message": {"text": "???"}}))
+
+    # Assert
+    queue.ack.assert_not_called()
+    queue.dead_letter.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_handle_message_without_entry_acks_immediately(queue, use_case):
+    # Arrange (conversa sem lançamento: nada a gravar, sem nova entrega)
+    use_case.execute.return_value = ProcessOutcome.NOTHING_TO_RECORD
+    queue.delivery_count.return_value = 1
+    worker = IngestionWorker(queue, use_case, max_deliveries=3, name="test")
+
+    # Act
+    await worker.handle("1-0", make_fields({
+        "message": {"message_id": 8, "chat": {"id": 42}, "text": "bom dia, tudo bem?"}
+    }))
+
+    # Assert
+    queue.ack.assert_awaited_once_with("1-0")
+    queue.dead_letter.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_handle_failure_on_last_delivery_dead_letters(queue, use_case):
+    # Arrange
+    use_case.execute.side_effect = Exception("OpenAI fora do ar")
+    queue.delivery_count.return_value = 3
+    worker = IngestionWorker(queue, use_case, max_deliveries=3, name="test")
+    fields = make_fields({"message": {"text": "uber 23,50"}})
+
+    # Act
+    await worker.handle("1-0", fields)
+
+    # Assert
+    queue.dead_letter.assert_awaited_once_with("1-0", fields, "processamento falhou")
+
+
+@pytest.mark.asyncio
+async def test_handle_reclaimed_over_limit_skips_processing(queue, use_case):
+    # Arrange
+    queue.delivery_count.return_value = 4
+    worker = IngestionWorker(queue, use_case, max_deliveries=3, name="test")
+
+    # Act
+    await worker.handle("1-0", make_fields({"message": {"text": "uber"}}), reclaimed=True)
+
+    # Assert
+    use_case.execute.assert_not_called()
+    queue.dead_letter.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_handle_invalid_payload_dead_letters(queue, use_case):
+    # Arrange
+    worker = IngestionWorker(queue, use_case, name="test")
+
+    # Act
+    await worker.handle("1-0", {"update": "not-json"})
+
+    # Assert
+    use_case.execute.assert_not_called()
+    queue.dead_letter.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_handle_without_text_acks(queue, use_case):
+    # Arrange
+    worker = IngestionWorker(queue, use_case, name="test")
+
+    # Act
+    await worker.handle("1-0", make_fields({"message": {"photo": []}}))
+
+    # Assert
+    use_case.execute.assert_not_called()
+    queue.ack.assert_awaited_once_with("1-0")
+
+
+@pytest.mark.asyncio
+async def test_handle_edited_message_uses_same_source(queue, use_case):
+    # Arrange
+    use_case.execute.return_value = ProcessOutcome.RECORDED
+    worker = IngestionWorker(queue, use_case, name="test")
+
+    # Act
+    await worker.handle("2-0", make_fields({
+        "edited_message": {"message_id": 7, "chat": {"id": 42}, "text": "uber 25,00"}
+    }))
+
+    # Assert
+    use_case.execute.assert_awaited_once_with("uber 25,00", chat_id=42, message_id=7)
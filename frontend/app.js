@@ -7,6 +7,7 @@ class SessionManager {
     constructor() {
         this.sessionId = this.getOrCreateSessionId();
         this.clientId = this.getOrCreateClientId();
+        this.ownerId = this.getOwnerId();
     }
 
     getOrCreateSessionId() {
@@ -27,6 +28,16 @@ class SessionManager {
         return clientId;
     }
 
+    // Dono do ledger (id do chat do Telegram): vem no link (?owner_id=) e fica salvo.
+    // Só escolhe qual ledger consultar; não é credencial
+    getOwnerId() {
+        const fromUrl = new URLSearchParams(window.location.search).get('owner_id');
+        if (fromUrl && /^-?\d+$/.test(fromUrl)) {
+            localStorage.setItem('chat_owner_id', fromUrl);
+        }
+        return localStorage.getItem('chat_owner_id');
+    }
+
     generateId() {
         return `${Date.now()}-${Math.random().toString(36).substr(2, 9)}`;
     }
@@ -113,7 +124,8 @@ class ChatApp {
                 body: JSON.stringify({
                     message: message,
                     session_id: this.sessionManager.sessionId,
-                    client_id: this.sessionManager.clientId
+                    client_id: this.sessionManager.clientId,
+                    owner_id: this.sessionManager.ownerId ? Number(this.sessionManager.ownerId) : null
                 })
             });
 
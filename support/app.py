@@ -8,7 +8,7 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from src.schemas import ChatRequest
 from src.agents import compiled_app
-from src.utils import extrair_resposta_final
+from src.utils import extrair_resposta_final, resolver_owner_id
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -54,7 +54,16 @@ async def chat_endpoint(payload: ChatRequest):
             logger.error("compiled_app não foi carregado!")
             return JSONResponse(status_code=500, content={"error": "Agente não disponível"})
             
-        config = {"configurable": {"thread_id": payload.session_id}}
+        # O dono chega às ferramentas pelo config, nunca por argumento do modelo. É só o escopo
+        # da consulta, não autenticação: quem envia um owner_id lê o ledger daquele chat
+        owner_id = resolver_owner_id(payload.owner_id, payload.client_id)
+        if owner_id is None:
+            logger.warning(f"⚠️ Nenhum dono de ledger para o client_id {payload.client_id}: consultas serão recusadas")
+        config = {"configurable": {
+            "thread_id": payload.session_id,
+            "client_id": payload.client_id,
+            "owner_id": owner_id,
+        }}
         
         result = compiled_app.invoke(
             {"messages": [{"role": "user", "content": payload.message}]},
@@ -1,6 +1,8 @@
+from typing import Optional
 from pydantic import BaseModel
 
 class ChatRequest(BaseModel):
     message: str
     session_id: str
     client_id: str
+    owner_id: Optional[int] = None  # Id do chat do Telegram dono do ledger consultado
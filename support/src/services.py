@@ -1,3 +1,4 @@
+from langchain_core.runnables import RunnableConfig
 from langchain_core.tools import tool
 import requests
 import logging
@@ -6,8 +7,41 @@ from typing import Optional
 
 logger = logging.getLogger(__name__)
 
+# Sem dono resolvido a consulta não sai: sem o filtro ela leria o ledger de todos os chats
+NO_OWNER_MESSAGE = (
+    "Não foi possível identificar de quem é este ledger. "
+    "Abra o chat pelo link com o seu owner_id para consultar saldo e transações."
+)
+
+def _owner_params(config: Optional[RunnableConfig]) -> Optional[dict]:
+    """
+    Filtra a consulta pelo ledger do owner_id (id do chat do Telegram). O owner_id vem da
+    requisição (resolvido em /chat e passado no config do grafo), nunca de argumento
+    escolhido pelo modelo; não é verificado contra nenhuma identidade. None quando a
+    requisição não tem dono
+    """
+    owner_id = ((config or {}).get("configurable") or {}).get("owner_id")
+    if owner_id is None:
+        logger.warning("⚠️ Consulta recusada: requisição sem owner_id")
+        return None
+    return {"owner_id": owner_id}
+
+def _fetch_period_pages(url: str, params: dict):
+    """Percorre as páginas de /transactions/period seguindo o next_cursor"""
+    params = dict(params)
+    while True:
+        response = requests.get(url, params=params)
+        response.raise_for_status()
+        page = response.json()
+        yield page
+
+        next_cursor = page.get("next_cursor")
+        if not next_cursor:
+            return
+        params["cursor"] = next_cursor
+
 @tool
-def get_balance(start_date: str, end_date: str, message: Optional[str] = None) -> str:
+def get_balance(start_date: str, end_date: str, message: Optional[str] = None, config: RunnableConfig = None) -> str:
     """
     CONSULTA DE SALDO BANCÁRIO POR PERÍODO
     
@@ -23,15 +57,21 @@ def get_balance(start_date: str, end_date: str, message: Optional[str] = None) -
     RETORNO:
     String com o saldo do período.
     """
+    owner = _owner_params(config)
+    if owner is None:
+        return NO_OWNER_MESSAGE
+
     # Monta os query parameters
     params = {
         "start_date": start_date,
-        "end_date": end_date
+        "end_date": end_date,
+        **owner,
     }
     
     base_url = os.getenv('TRANSACTIONS_URL')
 
-    url = f"{base_url}/api/v1/transactions/period"
+    # Só os totais, calculados no banco: nenhuma transação trafega
+    url = f"{base_url}/api/v1/transactions/summary"
     
     try:
         logger.info(f"➡️ Enviando requisição GET SALDO para {url}")
@@ -42,7 +82,6 @@ def get_balance(start_date: str, end_date: str, message: Optional[str] = None) -
         data = response.json()
         logger.info(f"✅ Resposta SALDO recebida: {data}")
         
-        # 🔥 ÚNICA MUDANÇA: Extrai o saldo e retorna uma string simples
         saldo = data.get("balance", "0.00")
         total = data.get("total", 0)
         
@@ -53,7 +92,7 @@ def get_balance(start_date: str, end_date: str, message: Optional[str] = None) -
         return f"Erro ao consultar saldo remoto: {str(e)}"
 
 @tool
-def get_income(start_date: str, end_date: str) -> dict:
+def get_income(start_date: str, end_date: str, config: RunnableConfig = None) -> dict:
     """
     CONSULTA DE RECEITAS (ENTRADAS) POR PERÍODO
     
@@ -67,9 +106,15 @@ def get_income(start_date: str, end_date: str) -> dict:
     RETORNO:
     Dicionário contendo a lista de transações e o total.
     """
+    owner = _owner_params(config)
+    if owner is None:
+        return {"error": NO_OWNER_MESSAGE}
+
     params = {
         "start_date": start_date,
-        "end_date": end_date
+        "end_date": end_date,
+        "transaction_type": "income",
+        **owner,
     }
     
     base_url = os.getenv('TRANSACTIONS_URL')
@@ -78,13 +123,8 @@ def get_income(start_date: str, end_date: str) -> dict:
     try:
         logger.info(f"➡️ Buscando transações de RECEITA para {start_date} a {end_date}")
         
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        data = response.json()
-        
-        # Filtrar apenas transações de income
-        all_transactions = data.get("transactions", [])
-        income_transactions = [t for t in all_transactions if t.get("transaction_type") == "income"]
+        # O filtro por tipo é aplicado no servidor: só as receitas trafegam
+        income_transactions = [t for page in _fetch_period_pages(url, params) for t in page.get("transactions", [])]
         
         total_income = sum(float(t.get("valor", 0)) for t in income_transactions)
         
@@ -100,7 +140,7 @@ def get_income(start_date: str, end_date: str) -> dict:
         return {"error": str(e)}
 
 @tool
-def get_expenses(start_date: str, end_date: str) -> dict:
+def get_expenses(start_date: str, end_date: str, config: RunnableConfig = None) -> dict:
     """
     CONSULTA DE DESPESAS (GASTOS) POR PERÍODO
     
@@ -114,9 +154,15 @@ def get_expenses(start_date: str, end_date: str) -> dict:
     RETORNO:
     Dicionário contendo a lista de transações e o total.
     """
+    owner = _owner_params(config)
+    if owner is None:
+        return {"error": NO_OWNER_MESSAGE}
+
     params = {
         "start_date": start_date,
-        "end_date": end_date
+        "end_date": end_date,
+        "transaction_type": "expense",
+        **owner,
     }
     
     base_url = os.getenv('TRANSACTIONS_URL')
@@ -125,13 +171,8 @@ def get_expenses(start_date: str, end_date: str) -> dict:
     try:
         logger.info(f"➡️ Buscando transações de DESPESA para {start_date} a {end_date}")
         
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        data = response.json()
-        
-        # Filtrar apenas transações de expense
-        all_transactions = data.get("transactions", [])
-        expense_transactions = [t for t in all_transactions if t.get("transaction_type") == "expense"]
+        # O filtro por tipo é aplicado no servidor: só as despesas trafegam
+        expense_transactions = [t for page in _fetch_period_pages(url, params) for t in page.get("transactions", [])]
         
         total_expenses = sum(float(t.get("valor", 0)) for t in expense_transactions)
         
@@ -1,5 +1,19 @@
+import os
+from typing import Optional
 from langchain_core.messages import AIMessage
 
+def _id_de_chat(valor) -> Optional[str]:
+    valor = str(valor or "").strip()
+    return valor if valor.lstrip("-").isdigit() else None
+
+def resolver_owner_id(owner_id: Optional[int], client_id: Optional[str]) -> Optional[str]:
+    """
+    Dono do ledger (id do chat do Telegram) consultado na conversa: o owner_id
+    enviado pelo frontend, um client_id que já seja id de chat ou, em instalações de um
+    único dono, DEFAULT_OWNER_ID. None quando nenhum se aplica
+    """
+    return _id_de_chat(owner_id) or _id_de_chat(client_id) or _id_de_chat(os.getenv("DEFAULT_OWNER_ID"))
+
 def extrair_resposta_final(result):
     mensagens = result.get("messages", [])
     respostas = [
@@ -11,6 +11,7 @@ def test_chat_request_valid():
     assert request.message == "Hello"
     assert request.session_id == "123"
     assert request.client_id == "456"
+    assert request.owner_id is None
 
 def test_chat_request_invalid_missing_field():
     with pytest.raises(ValidationError):
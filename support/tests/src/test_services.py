@@ -1,6 +1,8 @@
 import pytest
 from unittest.mock import Mock, patch
-from src.services import get_balance, get_income, get_expenses
+from src.services import get_balance, get_income, get_expenses, NO_OWNER_MESSAGE
+
+OWNER_CONFIG = {"configurable": {"owner_id": "123456"}}
 
 @patch("src.services.requests.get")
 @patch("src.services.os.getenv")
@@ -14,12 +16,13 @@ def test_get_balance_success(mock_getenv, mock_get):
     mock_get.return_value = mock_response
     
     # Act
-    result = get_balance.invoke({"start_date": "2023-01-01", "end_date": "2023-01-31"})
+    result = get_balance.invoke({"start_date": "2023-01-01", "end_date": "2023-01-31"}, config=OWNER_CONFIG)
     
     # Assert
     assert "R$ 100.00" in result
     assert "Total de 5 transações" in result
     mock_get.assert_called_once()
+    assert mock_get.call_args.args[0] == "http://mock-url/api/v1/transactions/summary"
 
 @patch("src.services.requests.get")
 @patch("src.services.os.getenv")
@@ -29,7 +32,7 @@ def test_get_balance_error(mock_getenv, mock_get):
     mock_get.side_effect = Exception("Connection error")
     
     # Act
-    result = get_balance.invoke({"start_date": "2023-01-01", "end_date": "2023-01-31"})
+    result = get_balance.invoke({"start_date": "2023-01-01", "end_date": "2023-01-31"}, config=OWNER_CONFIG)
     
     # Assert
     assert "Erro ao consultar saldo remoto" in result
@@ -42,17 +45,17 @@ def test_get_income_success(mock_getenv, mock_get):
     mock_response = Mock()
     mock_response.json.return_value = {
         "transactions": [
-            {"valor": "100.00", "transaction_type": "income", "categoria": "Salário", "item": "Job"},
-            {"valor": "50.00", "transaction_type": "expense", "categoria": "Lanche", "item": "Burger"}
+            {"valor": "100.00", "transaction_type": "income", "categoria": "Salário", "item": "Job"}
         ]
     }
     mock_response.raise_for_status.return_value = None
     mock_get.return_value = mock_response
     
     # Act
-    result = get_income.invoke({"start_date": "2023-01-01", "end_date": "2023-01-31"})
+    result = get_income.invoke({"start_date": "2023-01-01", "end_date": "2023-01-31"}, config=OWNER_CONFIG)
     
     # Assert
+    assert mock_get.call_args.kwargs["params"]["transaction_type"] == "income"
     assert result["total_value"] == 100.00
     assert result["count"] == 1
     assert len(result["transactions"]) == 1
@@ -66,7 +69,6 @@ def test_get_expenses_success(mock_getenv, mock_get):
     mock_response = Mock()
     mock_response.json.return_value = {
         "transactions": [
-            {"valor": "100.00", "transaction_type": "income", "categoria": "Salário", "item": "Job"},
             {"valor": "50.00", "transaction_type": "expense", "categoria": "Lanche", "item": "Burger"}
         ]
     }
@@ -74,10 +76,68 @@ def test_get_expenses_success(mock_getenv, mock_get):
     mock_get.return_value = mock_response
     
     # Act
-    result = get_expenses.invoke({"start_date": "2023-01-01", "end_date": "2023-01-31"})
+    result = get_expenses.invoke({"start_date": "2023-01-01", "end_date": "2023-01-31"}, config=OWNER_CONFIG)
     
     # Assert
+    assert mock_get.call_args.kwargs["params"]["transaction_type"] == "expense"
     assert result["total_value"] == 50.00
     assert result["count"] == 1
     assert len(result["transactions"]) == 1
     assert result["transactions"][0]["transaction_type"] == "expense"
+
+@patch("src.services.requests.get")
+@patch("src.services.os.getenv")
+def test_get_expenses_follows_next_cursor(mock_getenv, mock_get):
+    # Arrange
+    mock_getenv.return_value = "http://mock-url"
+    first_page = Mock()
+    first_page.json.return_value = {
+        "transactions": [{"valor": "50.00", "transaction_type": "expense", "categoria": "Lanche", "item": "Burger"}],
+        "next_cursor": "abc"
+    }
+    last_page = Mock()
+    last_page.json.return_value = {
+        "transactions": [{"valor": "20.00", "transaction_type": "expense", "categoria": "Transporte", "item": "Uber"}],
+        "next_cursor": None
+    }
+    mock_get.side_effect = [first_page, last_page]
+    
+    # Act
+    result = get_expenses.invoke({"start_date": "2023-01-01", "end_date": "2023-01-31"}, config=OWNER_CONFIG)
+    
+    # Assert
+    assert result["total_value"] == 70.00
+    assert result["count"] == 2
+    assert mock_get.call_args_list[1].kwargs["params"]["cursor"] == "abc"
+
+@patch("src.services.requests.get")
+@patch("src.services.os.getenv")
+def test_tools_scope_queries_to_client_ledger(mock_getenv, mock_get):
+    # Arrange
+    mock_getenv.return_value = "http://mock-url"
+    mock_response = Mock()
+    mock_response.json.return_value = {"transactions": []}
+    mock_response.raise_for_status.return_value = None
+    mock_get.return_value = mock_response
+    
+    # Act
+    get_expenses.invoke({"start_date": "2023-01-01", "end_date": "2023-01-31"}, config=OWNER_CONFIG)
+    
+    # Assert
+    assert mock_get.call_args.kwargs["params"]["owner_id"] == "123456"
+
+@patch("src.services.requests.get")
+def test_tools_refuse_without_owner(mock_get):
+    # Act
+    balance = get_balance.invoke(
+        {"start_date": "2023-01-01", "end_date": "2023-01-31"},
+        config={"configurable": {"client_id": "a1b2-frontend", "owner_id": None}},
+    )
+    expenses = get_expenses.invoke({"start_date": "2023-01-01", "end_date": "2023-01-31"})
+    income = get_income.invoke({"start_date": "2023-01-01", "end_date": "2023-01-31"})
+    
+    # Assert (nenhuma consulta sem filtro de dono chega à API)
+    assert balance == NO_OWNER_MESSAGE
+    assert expenses == {"error": NO_OWNER_MESSAGE}
+    assert income == {"error": NO_OWNER_MESSAGE}
+    mock_get.assert_not_called()
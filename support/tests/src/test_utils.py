@@ -1,4 +1,5 @@
-from src.utils import extrair_resposta_final
+from unittest.mock import patch
+from src.utils import extrair_resposta_final, resolver_owner_id
 from langchain_core.messages import AIMessage, HumanMessage
 
 def test_extrair_resposta_final_basic():
@@ -21,3 +22,13 @@ def test_extrair_resposta_final_ignore_transfer():
     ]
     result = {"messages": messages}
     assert extrair_resposta_final(result) == "Real answer"
+
+def test_resolver_owner_id_prefers_request_owner():
+    assert resolver_owner_id(42, "1712345678-abc") == "42"
+    assert resolver_owner_id(None, "-100123") == "-100123"
+
+def test_resolver_owner_id_falls_back_to_default_owner():
+    with patch.dict("os.environ", {"DEFAULT_OWNER_ID": "777"}):
+        assert resolver_owner_id(None, "1712345678-abc") == "777"
+    with patch.dict("os.environ", {}, clear=True):
+        assert resolver_owner_id(None, "1712345678-abc") is None